@@ -0,0 +1,93 @@
+# benchmarks/bench_busca.py
+"""
+Benchmark: busca de produtos (FTS5)
+===================================
+Cria um banco temporário com N produtos sintéticos e mede a latência de
+buscar_produtos() para termos comuns, raros, com acento e por prefixo.
+
+A primeira página ordena TODOS os resultados por bm25, então o custo cresce
+com a quantidade de produtos que casam com o termo (~1 µs por produto).
+Medido com 100.000 produtos (mediana): "pelucia" (8.279 resultados) ~15 ms,
+"lego star", "vader" e "capitao america" ~10 ms, "stitch 4" ~4 ms. Termos só
+com tokens curtos ("mi") casam com palavras inteiras (PREFIXO_MINIMO no
+database.py) e ficam abaixo de 0,1 ms.
+
+Uso (a partir da pasta nerd_hub.kv):
+    python benchmarks/bench_busca.py [--produtos 100000] [--repeticoes 50]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+PASTA_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PASTA_APP)
+
+import database  # noqa: E402
+
+TIPOS = ["Pelúcia", "LEGO", "Funko Pop!", "Camiseta", "Action Figure", "Caneca",
+         "Controle", "Headset", "Chaveiro", "Pôster", "Moletom", "Boné"]
+TEMAS = ["Mickey", "Chewbacca", "Darth Vader", "Homem de Ferro", "Capitão América",
+         "Millennium Falcon", "Minecraft", "Forza", "Kratos", "Master Chief",
+         "Yoda", "Thor", "Pato Donald", "Stitch", "Spider-Man", "Halo"]
+CATEGORIAS = ["disney", "marvel", "starwars", "playstation", "xbox", "lego"]
+
+TERMOS = ["pelucia", "lego star", "vader", "capitao america", "mi", "stitch 4", "inexistente"]
+
+
+def popular(total):
+    """Insere produtos sintéticos (determinísticos) no banco atual"""
+    aleatorio = random.Random(42)
+    with database.conectar() as conn:
+        conn.executemany(
+            "INSERT INTO produtos (title, price, price_cents, image, categoria) VALUES (?, ?, ?, ?, ?)",
+            (
+                (f"{aleatorio.choice(TIPOS)} {aleatorio.choice(TEMAS)} {i}",
+                 "R$ 0,00", aleatorio.randint(1000, 500000),
+                 "imagens/imagem_produtos_home/forza.jpg",
+                 aleatorio.choice(CATEGORIAS))
+                for i in range(total)
+            ),
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--produtos", type=int, default=100000)
+    parser.add_argument("--repeticoes", type=int, default=50)
+    args = parser.parse_args()
+
+    pasta_tmp = tempfile.mkdtemp(prefix="nerdhub_bench_")
+    try:
+        database.DB_PATH = os.path.join(pasta_tmp, "usuarios.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            database.criar_tabelas()
+            inicio = time.perf_counter()
+            popular(args.produtos)
+        print(f"{args.produtos:,} produtos inseridos e indexados em {time.perf_counter() - inicio:.1f}s")
+
+        print(f"{'termo':<20}{'resultados':>12}{'mediana (ms)':>15}{'p95 (ms)':>11}")
+        for termo in TERMOS:
+            tempos = []
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(args.repeticoes):
+                    inicio = time.perf_counter()
+                    resultados = database.buscar_produtos(termo, limit=20)
+                    tempos.append((time.perf_counter() - inicio) * 1000)
+            tempos.sort()
+            p95 = tempos[int(len(tempos) * 0.95) - 1]
+            print(f"{termo:<20}{len(resultados):>12}{statistics.median(tempos):>15.2f}{p95:>11.2f}")
+    finally:
+        database.obter_pool().fechar()
+        shutil.rmtree(pasta_tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
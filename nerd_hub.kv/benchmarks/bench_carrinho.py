@@ -0,0 +1,154 @@
+# benchmarks/bench_carrinho.py
+"""
+Benchmark: lista do carrinho reconstruída x atualizada por diferença
+====================================================================
+Monta a CarrinhoScreen com N linhas (padrão: 500) e mede, para cada
+operação, o tempo até o próximo frame desenhado, os CarrinhoCard criados
+e quantas vezes o total foi recalculado:
+- carga:       carrinho vazio -> N linhas
+- quantidade:  recarga com uma linha de quantidade alterada
+- remover:     uma linha removida
+- adicionar:   uma linha nova no fim
+
+Abordagens:
+- reconstrucao: clear_widgets() e um card novo por linha a cada mudança
+                (o que a tela fazia antes)
+- diff:         CarrinhoScreen.atualizar_lista atual, pela chave 'id'
+
+Precisa de uma janela Kivy (desktop ou servidor com display virtual).
+
+Uso (a partir da pasta nerd_hub.kv):
+    python benchmarks/bench_carrinho.py [--linhas 500]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+import types
+
+PASTA_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PASTA_APP)
+os.chdir(PASTA_APP)
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+
+from kivy.config import Config  # noqa: E402
+Config.set("graphics", "maxfps", "0")  # frames sem espera, para medir o custo real
+
+from kivy.base import EventLoop  # noqa: E402
+from kivy.core.window import Window  # noqa: E402
+from kivy.factory import Factory  # noqa: E402
+from kivy.lang import Builder  # noqa: E402
+
+from paginas.carrinho import CarrinhoScreen  # noqa: E402
+from paginas.imagem_produto import ImagemProduto  # noqa: E402,F401 (regra do .kv)
+from precos import formatar_brl  # noqa: E402
+
+ABORDAGENS = ("reconstrucao", "diff")
+
+IMAGENS = sorted(
+    os.path.join("imagens/imagem_produtos_home", nome)
+    for nome in os.listdir(os.path.join(PASTA_APP, "imagens/imagem_produtos_home"))
+)
+
+
+def item(produto_id, quantidade=1):
+    """Linha no formato de CarrinhoScreen.itens"""
+    cents = 1000 + produto_id
+    return {'id': produto_id, 'title': f"Produto {produto_id}", 'price': formatar_brl(cents),
+            'price_cents': cents, 'image': IMAGENS[produto_id % len(IMAGENS)], 'quantidade': quantidade}
+
+
+def reconstruir(tela):
+    """Abordagem anterior: apaga a lista e cria um card por linha"""
+    layout = tela.ids.carrinho_lista
+    layout.clear_widgets()
+    for produto in tela.itens:
+        card = Factory.CarrinhoCard()
+        card.produto = type('Produto', (), {
+            'id': produto.get("id", 0),
+            'title': produto.get("title", ""),
+            'price': produto.get("price", ""),
+            'image': produto.get("image", "imagens/imagem_produtos_home/forza.jpg"),
+            'quantidade': produto.get("quantidade", 1)
+        })()
+        card.remover_callback = tela.remover_item
+        layout.add_widget(card)
+
+
+def operacoes(linhas):
+    """(nome, função que altera tela.itens) na ordem em que são medidas"""
+    def carga(tela):
+        tela.itens = [item(i) for i in range(1, linhas + 1)]
+
+    def quantidade(tela):
+        tela.itens = [item(i, 2 if i == linhas // 2 else 1) for i in range(1, linhas + 1)]
+
+    def remover(tela):
+        tela.itens.remove(tela.itens[linhas // 3])
+
+    def adicionar(tela):
+        tela.itens.append(item(linhas + 1))
+
+    return [("carga", carga), ("quantidade", quantidade),
+            ("remover", remover), ("adicionar", adicionar)]
+
+
+def cards(tela, vistos):
+    """Cards na tela que ainda não tinham aparecido (vistos guarda todos)"""
+    novos = [w for w in tela.ids.carrinho_lista.children if w not in vistos]
+    vistos.update(novos)
+    return len(novos)
+
+
+def medir(abordagem, linhas):
+    tela = CarrinhoScreen(name="carrinho")
+    totais = []
+    tela.atualizar_total = lambda: totais.append(1)
+    if abordagem == "reconstrucao":
+        tela.atualizar_lista = types.MethodType(reconstruir, tela)
+    Window.add_widget(tela)
+    EventLoop.idle()
+
+    resultados, vistos = [], set()
+    for nome, alterar in operacoes(linhas):
+        totais[:] = []
+        inicio = time.perf_counter()
+        alterar(tela)
+        EventLoop.idle()
+        tempo = (time.perf_counter() - inicio) * 1000
+        resultados.append((nome, tempo, cards(tela, vistos), len(totais)))
+
+    ids = [w.produto.id for w in reversed(tela.ids.carrinho_lista.children)]
+    if ids != [i['id'] for i in tela.itens]:
+        raise RuntimeError(f"{abordagem}: ordem dos cards diferente de itens")
+    Window.remove_widget(tela)
+    EventLoop.idle()
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=500)
+    parser.add_argument("--abordagem", choices=ABORDAGENS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if not args.abordagem:
+        # Um processo por abordagem: a segunda carga no mesmo processo sai mais lenta
+        print(f"{args.linhas} linhas no carrinho\n")
+        print(f"{'operação':<12}{'abordagem':<14}{'frame (ms)':>12}{'cards criados':>15}{'totais':>8}")
+        for abordagem in ABORDAGENS:
+            subprocess.run([sys.executable, __file__, "--linhas", str(args.linhas),
+                            "--abordagem", abordagem], check=True)
+        return
+
+    Window.size = (420, 900)
+    EventLoop.ensure_window()
+    Builder.load_file("telas/carrinho.kv")
+    for nome, tempo, criados, totais in medir(args.abordagem, args.linhas):
+        print(f"{nome:<12}{args.abordagem:<14}{tempo:>12.1f}{criados:>15}{totais:>8}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
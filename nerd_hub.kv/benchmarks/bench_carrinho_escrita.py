@@ -0,0 +1,144 @@
+# benchmarks/bench_carrinho_escrita.py
+"""
+Benchmark: escritas do "adicionar ao carrinho"
+==============================================
+Simula N toques em "adicionar" (padrão: 300, espalhados por 30 produtos)
+contra um banco temporário e mede, para cada modo:
+- tempo total e por toque
+- transações (COMMIT) executadas
+- linhas recriadas (id novo no carrinho) e adicionado_em reiniciado
+
+Modos:
+- insert_or_replace: SQL anterior, uma conexão e um commit por toque;
+                     cada toque apaga e reinsere a linha
+- upsert:            adicionar_ao_carrinho_db (ON CONFLICT DO UPDATE),
+                     ainda um commit por toque
+- fila:              fila_carrinho (toques somados em memória e gravados
+                     numa transação a cada --lote toques, como o timer
+                     de ATRASO faria)
+
+Ao final confere que as quantidades gravadas batem com os toques.
+
+Uso (a partir da pasta nerd_hub.kv):
+    python benchmarks/bench_carrinho_escrita.py [--toques 300] [--produtos 30] [--lote 10]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+
+PASTA_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PASTA_APP)
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+
+import database  # noqa: E402
+from fila_carrinho import FilaCarrinho  # noqa: E402
+
+USUARIO = 1
+
+
+def insert_or_replace(produto_id):
+    """O que adicionar_ao_carrinho_db fazia antes"""
+    with database.conectar() as conn:
+        conn.execute("""
+            INSERT OR REPLACE INTO carrinho (usuario_id, produto_id, quantidade)
+            VALUES (?, ?, COALESCE((SELECT quantidade FROM carrinho WHERE usuario_id = ? AND produto_id = ?) + 1, 1))
+        """, (USUARIO, produto_id, USUARIO, produto_id))
+        conn.commit()
+
+
+def linhas():
+    with database.conectar() as conn:
+        return {linha[0]: tuple(linha[1:]) for linha in conn.execute(
+            "SELECT produto_id, id, quantidade, adicionado_em FROM carrinho WHERE usuario_id = ?", (USUARIO,))}
+
+
+def rodar(modo, toques, lote):
+    """Executa os toques; devolve (segundos, commits, linhas recriadas, datas reiniciadas, quantidades)"""
+    with database.conectar() as conn:
+        conn.execute("DELETE FROM carrinho")
+        conn.execute("INSERT INTO carrinho (usuario_id, produto_id, quantidade, adicionado_em) "
+                     "SELECT ?, id, 1, '2000-01-01 00:00:00' FROM produtos", (USUARIO,))
+    antes = linhas()
+
+    comandos = []
+    database.obter_pool().definir_rastreio(comandos.append)
+    fila = FilaCarrinho()
+    produtos = list(antes)
+    inicio = time.perf_counter()
+    for i in range(toques):
+        produto_id = produtos[i % len(produtos)]
+        if modo == "insert_or_replace":
+            insert_or_replace(produto_id)
+        elif modo == "upsert":
+            database.adicionar_ao_carrinho_db(USUARIO, produto_id)
+        else:
+            fila.adicionar(USUARIO, produto_id)
+            if (i + 1) % lote == 0:
+                fila.gravar()
+    if modo == "fila":
+        fila.gravar()
+    tempo = time.perf_counter() - inicio
+    database.obter_pool().definir_rastreio(None)
+
+    depois = linhas()
+    commits = sum(1 for sql in comandos if sql.strip().upper() == "COMMIT")
+    recriadas = sum(1 for p in antes if depois[p][0] != antes[p][0])
+    datas = sum(1 for p in antes if depois[p][2] != antes[p][2])
+    quantidades = {p: depois[p][1] - antes[p][1] for p in antes}
+    return tempo, commits, recriadas, datas, quantidades
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--toques", type=int, default=300)
+    parser.add_argument("--produtos", type=int, default=30)
+    parser.add_argument("--lote", type=int, default=10, help="toques por gravação no modo fila")
+    args = parser.parse_args()
+
+    pasta = tempfile.mkdtemp(prefix="nerdhub_carrinho_")
+    try:
+        database.DB_PATH = os.path.join(pasta, "usuarios.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            database.inicializar_banco()
+        with database.conectar() as conn:
+            conn.execute("DELETE FROM produtos WHERE id NOT IN (SELECT id FROM produtos ORDER BY id LIMIT ?)",
+                         (args.produtos,))
+            existentes = conn.execute("SELECT COUNT(*) FROM produtos").fetchone()[0]
+            for i in range(existentes, args.produtos):
+                conn.execute("INSERT INTO produtos (title, price, price_cents, image, categoria) "
+                             "VALUES (?, 'R$ 10,00', 1000, '', 'xbox')", (f"Produto {i}",))
+
+        esperado = Counter()
+        with database.conectar() as conn:
+            ids = [linha[0] for linha in conn.execute("SELECT id FROM produtos ORDER BY id")]
+        for i in range(args.toques):
+            esperado[ids[i % len(ids)]] += 1
+
+        print(f"{args.toques} toques em {len(ids)} produtos\n")
+        print(f"{'modo':<19}{'total (ms)':>12}{'por toque (ms)':>16}{'commits':>9}"
+              f"{'linhas recriadas':>18}{'datas reiniciadas':>19}")
+        falhas = 0
+        for modo in ("insert_or_replace", "upsert", "fila"):
+            tempo, commits, recriadas, datas, quantidades = rodar(modo, args.toques, args.lote)
+            print(f"{modo:<19}{tempo * 1000:>12.1f}{tempo * 1000 / args.toques:>16.3f}{commits:>9}"
+                  f"{recriadas:>18}{datas:>19}")
+            if quantidades != dict(esperado):
+                print(f"❌ {modo}: quantidades gravadas não batem com os toques")
+                falhas += 1
+        if falhas:
+            sys.exit(1)
+        print("\n✅ Quantidades gravadas iguais aos toques em todos os modos")
+    finally:
+        database.obter_pool().fechar()
+        shutil.rmtree(pasta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# benchmarks/bench_conexao.py
+"""
+Benchmark: conexão por chamada x pool de conexões
+==================================================
+Compara operações por segundo das consultas de catálogo e carrinho
+usando o modelo antigo (sqlite3.connect + close a cada chamada) e o
+pool de conexões do conexao.py. As consultas de catálogo são chamadas
+sem o cache_catalogo (funções _consultar_* do database.py): o que se mede
+é o custo de ir ao banco, não um acerto de cache.
+
+Roda sobre uma CÓPIA do banco, nunca sobre o usuarios.db original.
+
+Uso (a partir da pasta nerd_hub.kv):
+    python benchmarks/bench_conexao.py [--segundos 2]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+PASTA_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PASTA_APP)
+
+import database  # noqa: E402
+
+
+# -----------------------------------------------------------------------------
+# Modelo antigo: uma conexão nova por chamada
+# -----------------------------------------------------------------------------
+def _conectar_antigo():
+    conn = sqlite3.connect(database.DB_PATH)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def _consulta_antiga(sql, params=()):
+    conn = _conectar_antigo()
+    cur = conn.cursor()
+    cur.execute(sql, params)
+    linhas = cur.fetchall()
+    conn.close()
+    return linhas
+
+CONSULTAS_ANTIGAS = {
+    "listar_produtos": lambda: _consulta_antiga(
+        "SELECT id, title, price, image FROM produtos"),
+    "listar_produtos_por_categoria": lambda: _consulta_antiga(
+        "SELECT id, title, price, image FROM produtos WHERE categoria = ?", ("starwars",)),
+    "buscar_produto_por_id": lambda: _consulta_antiga(
+        "SELECT id, title, price, image, categoria, descricao FROM produtos WHERE id = ?", (5,)),
+    "obter_carrinho_usuario": lambda: _consulta_antiga("""
+        SELECT p.id, p.title, p.price, p.image, c.quantidade
+        FROM carrinho c
+        JOIN produtos p ON c.produto_id = p.id
+        WHERE c.usuario_id = ?
+        ORDER BY c.adicionado_em DESC
+    """, (1,)),
+}
+
+CONSULTAS_POOL = {
+    "listar_produtos": lambda: database._consultar_produtos(),
+    "listar_produtos_por_categoria": lambda: database._consultar_produtos_por_categoria("starwars"),
+    "buscar_produto_por_id": lambda: database._consultar_produto(5),
+    "obter_carrinho_usuario": lambda: database.obter_carrinho_usuario(1),
+}
+
+
+def medir(funcao, segundos):
+    """Executa a função repetidamente e retorna operações por segundo"""
+    ops = 0
+    inicio = time.perf_counter()
+    fim = inicio + segundos
+    # Os prints do database.py não entram na conta
+    with contextlib.redirect_stdout(io.StringIO()):
+        while time.perf_counter() < fim:
+            funcao()
+            ops += 1
+    return ops / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--segundos", type=float, default=2.0,
+                        help="duração de cada medição (padrão: 2s)")
+    args = parser.parse_args()
+
+    pasta_tmp = tempfile.mkdtemp(prefix="nerdhub_bench_")
+    try:
+        destino = os.path.join(pasta_tmp, "usuarios.db")
+        shutil.copy(os.path.join(PASTA_APP, "usuarios.db"), destino)
+        database.DB_PATH = destino
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            database.criar_tabelas()
+            database.carregar_usuario_teste()
+            for produto_id in range(1, 6):
+                database.adicionar_ao_carrinho_db(1, produto_id)
+
+        print(f"{'consulta':<32}{'antes (ops/s)':>16}{'depois (ops/s)':>18}{'ganho':>9}")
+        for nome in CONSULTAS_ANTIGAS:
+            antes = medir(CONSULTAS_ANTIGAS[nome], args.segundos)
+            depois = medir(CONSULTAS_POOL[nome], args.segundos)
+            print(f"{nome:<32}{antes:>16,.0f}{depois:>18,.0f}{depois / antes:>8.1f}x")
+    finally:
+        database.obter_pool().fechar()
+        shutil.rmtree(pasta_tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
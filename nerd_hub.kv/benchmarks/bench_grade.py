@@ -0,0 +1,135 @@
+# benchmarks/bench_grade.py
+"""
+Benchmark: GridLayout com todos os cards x GradeProdutos (RecycleView)
+======================================================================
+Para cada tamanho de catálogo mede, nas duas abordagens:
+- tempo para montar a grade e desenhar o primeiro frame
+- quantidade de widgets criados
+- memória Python alocada (tracemalloc)
+- tempo médio e pior tempo de frame durante a rolagem
+
+Precisa de uma janela Kivy (desktop ou servidor com display virtual).
+
+Uso (a partir da pasta nerd_hub.kv):
+    python benchmarks/bench_grade.py [--tamanhos 20 1000 10000] [--frames 60]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+PASTA_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PASTA_APP)
+os.chdir(PASTA_APP)
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+
+from kivy.config import Config  # noqa: E402
+Config.set("graphics", "maxfps", "0")  # frames sem espera, para medir o custo real
+
+from kivy.base import EventLoop  # noqa: E402
+from kivy.core.window import Window  # noqa: E402
+from kivy.factory import Factory  # noqa: E402
+from kivy.lang import Builder  # noqa: E402
+from kivy.metrics import dp  # noqa: E402
+from kivy.uix.gridlayout import GridLayout  # noqa: E402
+from kivy.uix.scrollview import ScrollView  # noqa: E402
+
+from paginas.grade_produtos import GradeProdutos  # noqa: E402
+from paginas.imagem_produto import ImagemProduto  # noqa: E402,F401 (usada pelo home.kv)
+from precarga import precarregador  # noqa: E402
+
+precarregador.ativo = False  # mede só a grade, sem consultas ao banco
+
+IMAGENS = sorted(
+    os.path.join("imagens/imagem_produtos_home", nome)
+    for nome in os.listdir(os.path.join(PASTA_APP, "imagens/imagem_produtos_home"))
+)
+
+
+def produtos_sinteticos(total):
+    """Linhas no formato do banco: (id, title, price_cents, image)"""
+    return [(i, f"Produto {i}", 1000 + i, IMAGENS[i % len(IMAGENS)]) for i in range(1, total + 1)]
+
+
+def montar_antigo(produtos):
+    """Abordagem anterior: um ProductCard por produto dentro de um GridLayout"""
+    scroll = ScrollView(do_scroll_x=False)
+    grid = GridLayout(cols=2, spacing=dp(12), size_hint_y=None,
+                      row_default_height=dp(250), padding=(dp(15), dp(5), dp(15), dp(15)))
+    grid.bind(minimum_height=grid.setter("height"))
+    scroll.add_widget(grid)
+    for produto in produtos:
+        card = Factory.ProductCard()
+        card.produto_id = produto[0]
+        card.title = produto[1]
+        card.price = str(produto[2])
+        card.image = produto[3]
+        grid.add_widget(card)
+    return scroll
+
+
+def montar_recycle(produtos):
+    """Abordagem nova: GradeProdutos virtualizada"""
+    grade = GradeProdutos()
+    grade.definir_produtos(produtos)
+    return grade
+
+
+def contar_widgets(widget):
+    return 1 + sum(contar_widgets(filho) for filho in widget.children)
+
+
+def medir(montar, produtos, frames):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    raiz = montar(produtos)
+    Window.add_widget(raiz)
+    EventLoop.idle()
+    primeiro_frame = time.perf_counter() - inicio
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    widgets = contar_widgets(raiz)
+
+    tempos = []
+    for i in range(frames):
+        raiz.scroll_y = 1 - (i + 1) / frames
+        inicio = time.perf_counter()
+        EventLoop.idle()
+        tempos.append(time.perf_counter() - inicio)
+
+    Window.remove_widget(raiz)
+    EventLoop.idle()
+    return {
+        "primeiro_frame_ms": primeiro_frame * 1000,
+        "widgets": widgets,
+        "memoria_mb": memoria / (1024 * 1024),
+        "frame_medio_ms": sum(tempos) / len(tempos) * 1000,
+        "frame_max_ms": max(tempos) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[20, 1000, 10000])
+    parser.add_argument("--frames", type=int, default=60)
+    args = parser.parse_args()
+
+    Window.size = (420, 900)
+    EventLoop.ensure_window()
+    Builder.load_file("telas/grade_produtos.kv")
+    Builder.load_file("telas/home.kv")
+
+    print(f"{'produtos':>9} {'abordagem':<11}{'1º frame (ms)':>15}{'widgets':>9}"
+          f"{'memória (MB)':>14}{'frame médio (ms)':>18}{'frame máx (ms)':>16}")
+    for total in args.tamanhos:
+        produtos = produtos_sinteticos(total)
+        for nome, montar in (("gridlayout", montar_antigo), ("recycleview", montar_recycle)):
+            r = medir(montar, produtos, args.frames)
+            print(f"{total:>9} {nome:<11}{r['primeiro_frame_ms']:>15.1f}{r['widgets']:>9}"
+                  f"{r['memoria_mb']:>14.1f}{r['frame_medio_ms']:>18.2f}{r['frame_max_ms']:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
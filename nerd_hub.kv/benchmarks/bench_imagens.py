@@ -0,0 +1,160 @@
+# benchmarks/bench_imagens.py
+"""
+Benchmark: imagens originais x miniaturas da grade da Home
+==========================================================
+Para cada imagem usada na Home (cards de produto e banner principal) mede:
+- tempo de decodificação (arquivo -> textura), média de N repetições
+- memória de GPU da textura (largura x altura x 4 bytes)
+
+comparando o arquivo original com a miniatura que o app realmente usa
+(variante 'card' ou 'banner' na densidade atual). Gera as miniaturas que
+faltarem antes de medir.
+
+Também mede o tempo até o primeiro frame de uma GradeProdutos com N
+imagens distintas (cópias dos originais, sem miniatura nem cache), com
+decodificação síncrona (comportamento anterior) e assíncrona.
+
+A pré-carga fica desligada (só a grade é medida) e o banco é um
+temporário - o usuarios.db do repositório nunca é aberto.
+
+Precisa de uma janela Kivy (desktop ou servidor com display virtual).
+
+Uso (a partir da pasta nerd_hub.kv):
+    python benchmarks/bench_imagens.py [--repeticoes 5] [--distintas 20 200]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+PASTA_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PASTA_APP)
+os.chdir(PASTA_APP)
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+
+from kivy.base import EventLoop  # noqa: E402
+from kivy.core.image import Image as CoreImage  # noqa: E402
+from kivy.core.window import Window  # noqa: E402
+from kivy.lang import Builder  # noqa: E402
+
+import database  # noqa: E402
+import miniaturas  # noqa: E402
+from miniaturas import gerar_miniaturas, resolver  # noqa: E402
+from paginas.grade_produtos import GradeProdutos  # noqa: E402
+from paginas.imagem_produto import ImagemProduto  # noqa: E402,F401 (regra do .kv)
+from precarga import precarregador  # noqa: E402
+
+precarregador.ativo = False  # mede só as imagens, sem consultas ao banco
+
+PASTA_PRODUTOS = os.path.join("imagens", "imagem_produtos_home")
+BANNER = os.path.join("imagens", "imagens_home", "banner_principal.png")
+
+
+def imagens_da_home():
+    """(caminho original, tipo da variante) de tudo que a Home desenha"""
+    produtos = [(os.path.join(PASTA_PRODUTOS, nome), "card") for nome in sorted(os.listdir(PASTA_PRODUTOS))]
+    return produtos + [(BANNER, "banner")]
+
+
+def medir(caminho, repeticoes):
+    """Tempo médio de decodificação (ms) e bytes da textura"""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        textura = CoreImage(caminho, nocache=True).texture
+    decodificacao = (time.perf_counter() - inicio) / repeticoes * 1000
+    return decodificacao, textura.width * textura.height * 4
+
+
+def imagens_distintas(pasta, total):
+    """Copia os originais até ter 'total' arquivos diferentes (nada em cache)"""
+    originais = [os.path.join(PASTA_PRODUTOS, nome) for nome in sorted(os.listdir(PASTA_PRODUTOS))]
+    caminhos = []
+    for i in range(total):
+        origem = originais[i % len(originais)]
+        destino = os.path.join(pasta, f"{i}_{os.path.basename(origem)}")
+        shutil.copyfile(origem, destino)
+        caminhos.append(destino)
+    return caminhos
+
+
+def primeiro_frame(caminhos, assincrono):
+    """Tempo (ms) para montar a grade e desenhar o primeiro frame"""
+    cache = miniaturas.cache_texturas
+    cache.limpar()
+    if assincrono:
+        cache.__dict__.pop("carregar", None)
+    else:
+        # Comportamento anterior: decodifica na thread da interface
+        cache.carregar = lambda caminho, ao_concluir: ao_concluir(cache.obter(caminho))
+
+    produtos = [(i, f"Produto {i}", 1000 + i, caminho) for i, caminho in enumerate(caminhos, 1)]
+    inicio = time.perf_counter()
+    grade = GradeProdutos()
+    grade.definir_produtos(produtos)
+    Window.add_widget(grade)
+    EventLoop.idle()
+    tempo = (time.perf_counter() - inicio) * 1000
+
+    Window.remove_widget(grade)
+    # Deixa as decodificações pendentes terminarem antes da próxima medida
+    for _ in range(100):
+        if not cache.estatisticas()["pendentes"]:
+            break
+        time.sleep(0.01)
+        EventLoop.idle()
+    cache.__dict__.pop("carregar", None)
+    return tempo
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--distintas", type=int, nargs="+", default=[20, 200])
+    args = parser.parse_args()
+
+    pasta = tempfile.mkdtemp(prefix="nerdhub_imagens_")
+    try:
+        database.DB_PATH = os.path.join(pasta, "usuarios.db")
+        database.inicializar_banco()
+        medir_tudo(args, pasta)
+    finally:
+        database.obter_pool().fechar()
+        shutil.rmtree(pasta, ignore_errors=True)
+
+
+def medir_tudo(args, pasta):
+    Window.size = (420, 900)
+    EventLoop.ensure_window()
+    Builder.load_file("telas/grade_produtos.kv")
+    Builder.load_file("telas/home.kv")
+    gerar_miniaturas()
+
+    print(f"{'imagem':<24}{'decod. orig (ms)':>17}{'decod. mini (ms)':>17}"
+          f"{'GPU orig (KB)':>15}{'GPU mini (KB)':>15}")
+    totais = [0.0, 0.0, 0, 0]
+    for origem, tipo in imagens_da_home():
+        ms_orig, bytes_orig = medir(origem, args.repeticoes)
+        ms_mini, bytes_mini = medir(resolver(origem, tipo), args.repeticoes)
+        for i, valor in enumerate((ms_orig, ms_mini, bytes_orig, bytes_mini)):
+            totais[i] += valor
+        print(f"{os.path.basename(origem):<24}{ms_orig:>17.2f}{ms_mini:>17.2f}"
+              f"{bytes_orig / 1024:>15.0f}{bytes_mini / 1024:>15.0f}")
+
+    print(f"{'TOTAL':<24}{totais[0]:>17.2f}{totais[1]:>17.2f}"
+          f"{totais[2] / 1024:>15.0f}{totais[3] / 1024:>15.0f}")
+    print(f"\nDecodificação: {totais[0] / totais[1]:.1f}x mais rápida | "
+          f"Memória de GPU: {totais[2] / totais[3]:.1f}x menor")
+
+    print(f"\n{'imagens distintas':>18}{'1º frame síncrono (ms)':>25}{'1º frame assíncrono (ms)':>27}")
+    for total in args.distintas:
+        caminhos = imagens_distintas(pasta, total)
+        sincrono = primeiro_frame(caminhos, assincrono=False)
+        assincrono = primeiro_frame(caminhos, assincrono=True)
+        print(f"{total:>18}{sincrono:>25.1f}{assincrono:>27.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# benchmarks/bench_importacao.py
+"""
+Benchmark: importação de catálogo em massa
+==========================================
+Gera um catálogo sintético (padrão: 200 mil produtos) em CSV e em JSONL
+e mede, num banco temporário com o catálogo inicial:
+- importar_produtos() de cada arquivo: linhas/s e memória de pico
+  (a memória numa segunda importação, com tracemalloc ligado)
+- adicionar_produto() em laço (um commit por produto), numa amostra,
+  extrapolado para o catálogo inteiro
+
+Depois de cada importação confere que o índice do catálogo e o trigger
+da busca voltaram e que a busca encontra um produto importado.
+
+Uso (a partir da pasta nerd_hub.kv):
+    python benchmarks/bench_importacao.py [--produtos 200000] [--amostra 2000] [--lote 10000]
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+PASTA_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PASTA_APP)
+
+import database  # noqa: E402
+from importacao import importar_produtos  # noqa: E402
+
+CATEGORIAS = ["disney", "marvel", "starwars", "playstation", "xbox", "lego"]
+CAMPOS = ["title", "price", "image", "categoria", "descricao"]
+
+
+def registros(total):
+    for i in range(total):
+        yield {
+            "title": f"Produto Importado {i} Zeta{i}",
+            "price": f"R$ {10 + i % 5000},{i % 100:02d}",
+            "image": "imagens/imagem_produtos_home/forza.jpg",
+            "categoria": CATEGORIAS[i % len(CATEGORIAS)],
+            "descricao": f"Descrição do produto {i}",
+        }
+
+
+def gerar_arquivos(pasta, total):
+    caminho_csv = os.path.join(pasta, "catalogo.csv")
+    with open(caminho_csv, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.DictWriter(arquivo, CAMPOS)
+        escritor.writeheader()
+        escritor.writerows(registros(total))
+    caminho_jsonl = os.path.join(pasta, "catalogo.jsonl")
+    with open(caminho_jsonl, "w", encoding="utf-8") as arquivo:
+        for registro in registros(total):
+            arquivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+    return caminho_csv, caminho_jsonl
+
+
+def banco_novo(pasta, nome):
+    database.DB_PATH = os.path.join(pasta, nome)
+    with contextlib.redirect_stdout(io.StringIO()):
+        database.criar_tabelas()
+
+
+def conferir(total):
+    """Problemas depois da importação (lista vazia = ok)"""
+    problemas = []
+    with database.conectar() as conn:
+        nomes = {linha[0] for linha in conn.execute(
+            "SELECT name FROM sqlite_master WHERE name IN ('idx_produtos_categoria', 'produtos_fts_ai')")}
+        importados = conn.execute("SELECT COUNT(*) FROM produtos WHERE title LIKE 'Produto Importado %'"
+                                  ).fetchone()[0]
+    if nomes != {"idx_produtos_categoria", "produtos_fts_ai"}:
+        problemas.append(f"índice/trigger faltando (encontrados: {sorted(nomes)})")
+    if importados != total:
+        problemas.append(f"{importados} produtos importados, esperado {total}")
+    alvo = f"Zeta{total - 1}"
+    if not any(alvo in produto[1] for produto in database.buscar_produtos(alvo.lower())):
+        problemas.append(f"busca não encontra {alvo}")
+    return problemas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--produtos", type=int, default=200_000)
+    parser.add_argument("--amostra", type=int, default=2000,
+                        help="produtos inseridos com adicionar_produto() para comparação")
+    parser.add_argument("--lote", type=int, default=10000)
+    args = parser.parse_args()
+
+    pasta = tempfile.mkdtemp(prefix="nerdhub_importacao_")
+    try:
+        caminho_csv, caminho_jsonl = gerar_arquivos(pasta, args.produtos)
+        print(f"{args.produtos:,} produtos: CSV {os.path.getsize(caminho_csv) / 1e6:.1f} MB, "
+              f"JSONL {os.path.getsize(caminho_jsonl) / 1e6:.1f} MB\n")
+        print(f"{'modo':<20}{'linhas/s':>12}{'tempo (s)':>12}{'memória pico (MB)':>19}")
+
+        falhas = 0
+        for nome, caminho in (("importar csv", caminho_csv), ("importar jsonl", caminho_jsonl)):
+            banco_novo(pasta, nome.replace(" ", "_") + ".db")
+            resumo = importar_produtos(caminho, lote=args.lote)
+            problemas = conferir(args.produtos)
+            for problema in problemas:
+                print(f"❌ {nome}: {problema}")
+            falhas += len(problemas)
+            database.obter_pool().fechar()
+
+            banco_novo(pasta, nome.replace(" ", "_") + "_memoria.db")
+            tracemalloc.start()
+            importar_produtos(caminho, lote=args.lote)
+            _, pico = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            database.obter_pool().fechar()
+            print(f"{nome:<20}{resumo['por_segundo']:>12,.0f}{resumo['segundos']:>12.1f}{pico / 1e6:>19.1f}")
+
+        banco_novo(pasta, "adicionar_produto.db")
+        amostra = list(registros(args.amostra))
+        inicio = time.perf_counter()
+        for registro in amostra:
+            database.adicionar_produto(registro["title"], registro["price"], registro["image"],
+                                       registro["categoria"])
+        tempo = time.perf_counter() - inicio
+        por_segundo = args.amostra / tempo
+        print(f"{'adicionar_produto':<20}{por_segundo:>12,.0f}{args.produtos / por_segundo:>12.1f}"
+              f"{'-':>19}   (estimado a partir de {args.amostra:,})")
+
+        if falhas:
+            sys.exit(1)
+        print("\n✅ Índice e busca íntegros depois das importações")
+    finally:
+        database.obter_pool().fechar()
+        shutil.rmtree(pasta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
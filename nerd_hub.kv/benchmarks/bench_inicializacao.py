@@ -0,0 +1,98 @@
+# benchmarks/bench_inicializacao.py
+"""
+Benchmark: inicialização a frio até o primeiro frame da Home
+============================================================
+Abre o app em um processo novo (sem nada em memória) e mede o tempo do
+início do processo até o primeiro frame desenhado, em dois modos:
+- todas:       comportamento anterior, todos os .kv e telas no build()
+- sob_demanda: só a Home no build(), demais telas quando forem abertas
+
+Cada modo roda N vezes; o resultado é a mediana. Usa uma cópia
+temporária do banco.
+
+Precisa de uma janela Kivy (desktop ou servidor com display virtual).
+
+Uso (a partir da pasta nerd_hub.kv):
+    python benchmarks/bench_inicializacao.py [--repeticoes 5]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PASTA_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Executado em cada processo filho
+FILHO = r"""
+import time
+inicio = time.perf_counter()
+import contextlib, io, os, sys
+sys.path.insert(0, os.getcwd())
+modo = sys.argv[1]
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import main
+    from kivy.core.window import Window
+
+app = main.NerdHubApp()
+build_original = app.build
+
+def build():
+    with contextlib.redirect_stdout(io.StringIO()):
+        sm = build_original()
+        if modo == "todas":
+            sm.construir_todas()
+    return sm
+
+def primeiro_frame(*args):
+    Window.unbind(on_flip=primeiro_frame)
+    print(f"PRIMEIRO_FRAME {(time.perf_counter() - inicio) * 1000:.1f}", file=sys.__stdout__, flush=True)
+    app.stop()
+
+app.build = build
+app.on_start = lambda: None  # sem pré-aquecimento: mede só o caminho até o 1º frame
+Window.bind(on_flip=primeiro_frame)
+with contextlib.redirect_stdout(io.StringIO()):
+    app.run()
+"""
+
+
+def medir(modo, banco):
+    ambiente = dict(os.environ, KIVY_NO_ARGS="1", KIVY_NO_CONSOLELOG="1", NERDHUB_DB_PATH=banco)
+    saida = subprocess.run(
+        [sys.executable, "-c", FILHO, modo],
+        cwd=PASTA_APP, env=ambiente, capture_output=True, text=True, timeout=120,
+    ).stdout
+    for linha in saida.splitlines():
+        if linha.startswith("PRIMEIRO_FRAME"):
+            return float(linha.split()[1])
+    raise RuntimeError(f"o app não desenhou o primeiro frame no modo '{modo}'")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    pasta = tempfile.mkdtemp(prefix="nerdhub_inicio_")
+    banco = os.path.join(pasta, "usuarios.db")
+    shutil.copyfile(os.path.join(PASTA_APP, "usuarios.db"), banco)
+    try:
+        medir("sob_demanda", banco)  # aquece o cache de disco e cria miniaturas/migrações
+        print(f"{'modo':<13}{'mediana (ms)':>14}{'mín (ms)':>11}{'máx (ms)':>11}")
+        resultados = {}
+        for modo in ("todas", "sob_demanda"):
+            tempos = [medir(modo, banco) for _ in range(args.repeticoes)]
+            resultados[modo] = statistics.median(tempos)
+            print(f"{modo:<13}{resultados[modo]:>14.1f}{min(tempos):>11.1f}{max(tempos):>11.1f}")
+        print(f"\nPrimeiro frame da Home {resultados['todas'] / resultados['sob_demanda']:.2f}x mais rápido")
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# benchmarks/bench_inicio_banco.py
+"""
+Benchmark: trabalho no banco ao iniciar o app com tabelas grandes
+=================================================================
+Popula um banco temporário com 1 milhão de usuários e 1 milhão de
+produtos e mede o tempo de banco do início do app:
+- inicializar_banco() (user_version + usuário de teste)
+- categorias do carrossel e primeira página da Home
+
+com conexão e cache frios (pool recriado) a cada repetição. Falha (saída
+1) se o pior tempo passar do orçamento ou se algum SQL executado no
+início for um COUNT ou uma leitura sem LIMIT/WHERE.
+
+Para comparação, mede também o que o início fazia antes (COUNT(*) de
+usuários e produtos e a listagem de todos os usuários).
+
+Uso (a partir da pasta nerd_hub.kv):
+    python benchmarks/bench_inicio_banco.py [--usuarios 1000000] [--produtos 1000000] [--orcamento-ms 50]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+PASTA_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PASTA_APP)
+
+import database  # noqa: E402
+
+CATEGORIAS = ["disney", "marvel", "starwars", "playstation", "xbox", "lego"]
+
+
+def popular(caminho, usuarios, produtos):
+    """Insere usuários e produtos sintéticos numa única transação"""
+    conn = sqlite3.connect(caminho)
+    conn.executemany(
+        "INSERT INTO usuarios (nome, email, senha) VALUES (?, ?, ?)",
+        ((f"Usuário {i}", f"usuario{i}@email.com", "x") for i in range(usuarios)),
+    )
+    conn.executemany(
+        "INSERT INTO produtos (title, price, price_cents, image, categoria) VALUES (?, ?, ?, ?, ?)",
+        ((f"Produto {i}", "R$ 10,00", 1000, "imagens/imagem_produtos_home/forza.jpg",
+          CATEGORIAS[i % len(CATEGORIAS)]) for i in range(produtos)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def inicio_do_app():
+    """O que o app executa no banco até a Home aparecer"""
+    database.inicializar_banco()
+    database.listar_categorias()
+    database.listar_produtos_pagina()
+
+
+def inicio_antigo():
+    """O que o início fazia antes: contagens e listagem completa de usuários"""
+    with database.conectar() as conn:
+        conn.execute("SELECT COUNT(*) FROM usuarios").fetchone()
+        conn.execute("SELECT COUNT(*) FROM produtos").fetchone()
+    database.listar_usuarios()
+
+
+def medir(funcao, repeticoes):
+    """Tempos (ms) com pool e cache frios; também devolve o SQL executado"""
+    tempos, comandos = [], []
+    for _ in range(repeticoes):
+        database.obter_pool().fechar()
+        database._pool = None
+        database.cache_catalogo.invalidar()
+        database.obter_pool().definir_rastreio(comandos.append)
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            funcao()
+            tempos.append((time.perf_counter() - inicio) * 1000)
+    database.obter_pool().definir_rastreio(None)
+    return tempos, comandos
+
+
+def sem_limite(sql):
+    """COUNT ou SELECT que pode ler a tabela inteira"""
+    maiusculo = " ".join(sql.upper().split())
+    if "COUNT(" in maiusculo:
+        return True
+    return maiusculo.startswith("SELECT") and " FROM " in maiusculo and not (
+        " LIMIT " in maiusculo or " WHERE " in maiusculo or "FROM CATEGORIAS" in maiusculo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--usuarios", type=int, default=1_000_000)
+    parser.add_argument("--produtos", type=int, default=1_000_000)
+    parser.add_argument("--repeticoes", type=int, default=10)
+    parser.add_argument("--orcamento-ms", type=float, default=50.0,
+                        help="pior tempo aceitável para o início (padrão: 50 ms)")
+    args = parser.parse_args()
+
+    pasta = tempfile.mkdtemp(prefix="nerdhub_inicio_banco_")
+    try:
+        database.DB_PATH = os.path.join(pasta, "usuarios.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            database.criar_tabelas()
+        database.obter_pool().fechar()
+
+        inicio = time.perf_counter()
+        popular(database.DB_PATH, args.usuarios, args.produtos)
+        print(f"{args.usuarios:,} usuários e {args.produtos:,} produtos inseridos em "
+              f"{time.perf_counter() - inicio:.1f}s")
+
+        antigo, _ = medir(inicio_antigo, 3)
+        novo, comandos = medir(inicio_do_app, args.repeticoes)
+
+        print(f"\n{'início':<10}{'mediana (ms)':>14}{'pior (ms)':>12}")
+        print(f"{'antes':<10}{sorted(antigo)[len(antigo) // 2]:>14.1f}{max(antigo):>12.1f}")
+        print(f"{'agora':<10}{sorted(novo)[len(novo) // 2]:>14.1f}{max(novo):>12.1f}")
+
+        proibidos = sorted({" ".join(sql.split()) for sql in comandos if sem_limite(sql)})
+        for sql in proibidos:
+            print(f"❌ SQL O(N) no início: {sql}")
+        if max(novo) > args.orcamento_ms:
+            print(f"❌ Início levou {max(novo):.1f} ms (orçamento: {args.orcamento_ms:.0f} ms)")
+        if proibidos or max(novo) > args.orcamento_ms:
+            sys.exit(1)
+        print(f"\n✅ Início dentro do orçamento de {args.orcamento_ms:.0f} ms, só com consultas de tempo constante")
+    finally:
+        database.obter_pool().fechar()
+        shutil.rmtree(pasta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
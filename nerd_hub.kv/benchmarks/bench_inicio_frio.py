@@ -0,0 +1,108 @@
+# benchmarks/bench_inicio_frio.py
+"""
+Benchmark: início a frio até a Home com produtos
+================================================
+Abre o app N vezes, cada uma num processo novo (SDL_VIDEODRIVER=offscreen,
+cópia do usuarios.db), com a linha do tempo do início ligada
+(NERDHUB_TRACE, ver linha_do_tempo.py), e mostra a mediana de cada trecho
+da thread principal e de cada marca (on_start, primeiro frame, Home com
+produtos). Trechos repetidos (ex.: Builder.load_file) são somados.
+
+A linha do tempo da última execução é copiada para --saida, para abrir
+no Perfetto (ui.perfetto.dev).
+
+Uso (a partir da pasta nerd_hub.kv):
+    python benchmarks/bench_inicio_frio.py [--execucoes 5] [--saida resultados/linha_do_tempo.json]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PASTA_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAIDA = os.path.join(PASTA_APP, "benchmarks", "resultados", "linha_do_tempo.json")
+
+
+def rodar_app():
+    """Processo filho: abre o app e fecha assim que a linha do tempo é gravada"""
+    os.chdir(PASTA_APP)
+    sys.path.insert(0, PASTA_APP)
+    import main
+
+    exportar = main.NerdHubApp.exportar_linha_do_tempo
+
+    def exportar_e_sair(app):
+        if main.linha_do_tempo.ativa:  # on_stop chama de novo
+            exportar(app)
+            app.stop()
+
+    main.NerdHubApp.exportar_linha_do_tempo = exportar_e_sair
+    main.NerdHubApp().run()
+
+
+def resumir(caminho):
+    """Trechos da thread principal (somados por nome) e marcas, em ms"""
+    with open(caminho, encoding="utf-8") as arquivo:
+        eventos = json.load(arquivo)["traceEvents"]
+    principal = next(evento["tid"] for evento in eventos
+                     if evento["ph"] == "M" and evento["args"]["name"] == "MainThread")
+    trechos, marcas = {}, {}
+    for evento in eventos:
+        if evento["ph"] == "X" and evento["tid"] == principal:
+            trechos[evento["name"]] = trechos.get(evento["name"], 0) + evento["dur"] / 1000
+        elif evento["ph"] == "i":
+            marcas.setdefault(evento["name"], evento["ts"] / 1000)
+    return trechos, marcas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--execucoes", type=int, default=5)
+    parser.add_argument("--saida", default=SAIDA)
+    parser.add_argument("--filho", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.filho:
+        rodar_app()
+        return
+
+    pasta = tempfile.mkdtemp(prefix="nerdhub_inicio_frio_")
+    try:
+        resumos = []
+        for execucao in range(args.execucoes):
+            banco = os.path.join(pasta, f"usuarios{execucao}.db")
+            shutil.copyfile(os.path.join(PASTA_APP, "usuarios.db"), banco)
+            caminho = os.path.join(pasta, f"linha_do_tempo{execucao}.json")
+            ambiente = dict(os.environ, NERDHUB_TRACE=caminho, NERDHUB_DB_PATH=banco,
+                            NERDHUB_LOG="WARNING", KIVY_NO_ARGS="1")
+            ambiente.setdefault("SDL_VIDEODRIVER", "offscreen")
+            subprocess.run([sys.executable, os.path.abspath(__file__), "--filho"], env=ambiente,
+                           check=True, timeout=120, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            resumos.append(resumir(caminho))
+            print(f"   execução {execucao + 1}/{args.execucoes} concluída", flush=True)
+
+        os.makedirs(os.path.dirname(os.path.abspath(args.saida)), exist_ok=True)
+        shutil.copyfile(caminho, args.saida)
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    print(f"\n{'trecho (thread principal)':<44}{'mediana ms':>12}{'máx ms':>10}")
+    for nome in resumos[-1][0]:
+        valores = [trechos.get(nome, 0) for trechos, _ in resumos]
+        print(f"{nome:<44}{statistics.median(valores):>12.1f}{max(valores):>10.1f}")
+
+    print(f"\n{'marca':<44}{'mediana ms':>12}{'máx ms':>10}")
+    for nome in resumos[-1][1]:
+        valores = [marcas[nome] for _, marcas in resumos if nome in marcas]
+        print(f"{nome:<44}{statistics.median(valores):>12.1f}{max(valores):>10.1f}")
+
+    print(f"\n💾 Linha do tempo da última execução em {args.saida} (abrir em ui.perfetto.dev)")
+
+
+if __name__ == "__main__":
+    main()
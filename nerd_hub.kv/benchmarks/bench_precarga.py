@@ -0,0 +1,181 @@
+# benchmarks/bench_precarga.py
+"""
+Benchmark: abrir detalhes e categorias com e sem pré-carga
+==========================================================
+Abre o app sem janela visível (SDL_VIDEODRIVER=offscreen) contra um banco
+sintético (dados_sinteticos.py), uma vez com a pré-carga ligada e outra
+com NERDHUB_PRECARGA=0 (ver precarga.py), e faz o que um usuário faria:
+
+- toca em cada card visível da Home (ir_para_detalhes) e volta
+- abre a tela de cada categoria do carrossel
+
+Entre uma abertura e outra o app fica PAUSA segundos parado (o usuário
+olhando a tela) - é quando a pré-carga trabalha. Para cada abertura:
+- chamada_ms: a chamada em si (construção da tela, on_pre_enter e o que
+              mais rodar na thread da interface)
+- dados_ms:   até o produto (ou a primeira página) estar na tela
+- imagem_ms:  até a imagem grande do produto estar na tela (detalhes)
+- imediatas:  aberturas que já estavam completas ao fim da chamada, sem
+              esperar nenhum frame
+
+Uso (a partir da pasta nerd_hub.kv):
+    python benchmarks/bench_precarga.py [--escala 200:2000] [--produtos 6]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PASTA_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODOS = (("com_precarga", "1"), ("sem_precarga", "0"))
+
+# Tempo parado (s) antes de cada abertura e espera máxima (s) por uma tela
+PAUSA = 1.0
+LIMITE_S = 10
+
+
+# =============================================================================
+# PROCESSO FILHO: abre o app, toca nos cards e nas categorias
+# =============================================================================
+
+def rodar_app(caminho_db, caminho_json, quantidade):
+    os.environ["NERDHUB_DB_PATH"] = caminho_db
+    os.environ.setdefault("SDL_VIDEODRIVER", "offscreen")
+    os.environ.setdefault("KIVY_NO_ARGS", "1")
+    os.environ.setdefault("NERDHUB_LOG", "WARNING")
+    os.chdir(PASTA_APP)
+    sys.path.insert(0, PASTA_APP)
+
+    from kivy.clock import Clock
+
+    import database
+    import main
+    from executor_banco import executor
+    from paginas.imagem_produto import ImagemProduto
+
+    app = main.NerdHubApp()
+    relatorio = {"detalhes": [], "categorias": []}
+
+    def esperar(segundos):
+        """Gerador: deixa o app parado por 'segundos' e até o executor esvaziar"""
+        fim = time.perf_counter() + segundos
+        while time.perf_counter() < fim or not executor.ocioso():
+            if time.perf_counter() > fim + LIMITE_S:
+                return
+            yield
+
+    def medir(abrir, condicoes):
+        """Gerador: chama abrir() e avança frames até cada condição ser verdadeira"""
+        inicio = time.perf_counter()
+        abrir()
+        resultado = {"chamada_ms": round((time.perf_counter() - inicio) * 1000, 2), "imediata": True}
+        faltando = dict(condicoes)
+        while faltando and time.perf_counter() - inicio < LIMITE_S:
+            for nome, condicao in list(faltando.items()):
+                if condicao():
+                    resultado[f"{nome}_ms"] = round((time.perf_counter() - inicio) * 1000, 2)
+                    del faltando[nome]
+            if faltando:
+                resultado["imediata"] = False
+                yield
+        return resultado
+
+    def roteiro():
+        sm = app.root
+        yield from esperar(PAUSA)
+
+        home = sm.get_screen("home")
+        detalhes = sm.get_screen("detalhes_produto")
+        imagem = next(widget for widget in detalhes.walk() if isinstance(widget, ImagemProduto))
+        for item in home.ids.products_grid.produtos_visiveis()[:quantidade]:
+            relatorio["detalhes"].append((yield from medir(
+                lambda: home.ir_para_detalhes(item["produto_id"]),
+                {"dados": lambda: detalhes.titulo == item["title"],
+                 "imagem": lambda: imagem.caminho == item["image"] and imagem._carregada})))
+            sm.voltar()
+            yield from esperar(PAUSA)
+
+        for slug, titulo, banner in database.listar_categorias():
+            relatorio["categorias"].append((yield from medir(
+                lambda: sm.mudar_tela(slug),
+                {"dados": lambda: not sm.get_screen(slug).ids.products_grid.carregando})))
+            yield from esperar(PAUSA)
+
+    passos = roteiro()
+
+    def passo(dt):
+        try:
+            next(passos)
+        except StopIteration:
+            with open(caminho_json, "w", encoding="utf-8") as arquivo:
+                json.dump(relatorio, arquivo)
+            app.stop()
+            return False
+
+    Clock.schedule_once(lambda dt: Clock.schedule_interval(passo, 0), 0.5)
+    app.run()
+
+
+# =============================================================================
+# PROCESSO PRINCIPAL
+# =============================================================================
+
+def mediana(aberturas, chave):
+    valores = [abertura[chave] for abertura in aberturas if chave in abertura]
+    return f"{statistics.median(valores):.1f}" if valores else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--escala", default="200:2000", help="usuarios:produtos do banco sintético")
+    parser.add_argument("--produtos", type=int, default=6, help="cards da Home abertos")
+    parser.add_argument("--filho", nargs=3, metavar=("BANCO", "JSON", "PRODUTOS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.filho:
+        banco, caminho_json, quantidade = args.filho
+        rodar_app(banco, caminho_json, int(quantidade))
+        return
+
+    sys.path.insert(0, PASTA_APP)
+    import database
+    from dados_sinteticos import gerar
+
+    usuarios, produtos = (int(parte) for parte in args.escala.split(":"))
+    pasta = tempfile.mkdtemp(prefix="nerdhub_precarga_")
+    resultados = {}
+    try:
+        caminho_db = os.path.join(pasta, "precarga.db")
+        gerar(caminho_db, usuarios, produtos)
+        database.obter_pool().fechar()
+
+        for modo, valor in MODOS:
+            copia = os.path.join(pasta, f"{modo}.db")
+            shutil.copyfile(caminho_db, copia)
+            caminho_json = os.path.join(pasta, f"{modo}.json")
+            subprocess.run([sys.executable, os.path.abspath(__file__), "--filho", copia, caminho_json,
+                            str(args.produtos)],
+                           env={**os.environ, "NERDHUB_PRECARGA": valor},
+                           check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            with open(caminho_json, encoding="utf-8") as arquivo:
+                resultados[modo] = json.load(arquivo)
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    print(f"{'modo':<14}{'tela':<12}{'chamada ms':>12}{'dados ms':>10}{'imagem ms':>11}{'imediatas':>11}")
+    for modo, relatorio in resultados.items():
+        for tela, aberturas in relatorio.items():
+            imediatas = f"{sum(abertura['imediata'] for abertura in aberturas)}/{len(aberturas)}"
+            print(f"{modo:<14}{tela:<12}{mediana(aberturas, 'chamada_ms'):>12}{mediana(aberturas, 'dados_ms'):>10}"
+                  f"{mediana(aberturas, 'imagem_ms'):>11}{imediatas:>11}")
+
+
+if __name__ == "__main__":
+    main()
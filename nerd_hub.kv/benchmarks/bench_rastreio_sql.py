@@ -0,0 +1,105 @@
+# benchmarks/bench_rastreio_sql.py
+"""
+Benchmark: custo do rastreio de SQL
+===================================
+Roda os casos da suíte do banco (suite_banco.casos, sem os de scrypt)
+contra um banco sintético, com o rastreio de SQL desligado e ligado
+(database.ativar_rastreio_sql), e mostra:
+- tempo por chamada nos dois modos e o acréscimo do rastreio
+- o resumo do rastreador da última rodada (formas mais caras, p50/p99, linhas)
+- quantos comandos foram para o log de SQL lento
+
+Falha (saída 1) se alguma chamada medida pelo cursor não aparecer no
+resumo ou se o log de SQL lento ficar vazio com limite 0.
+
+Uso (a partir da pasta nerd_hub.kv):
+    python benchmarks/bench_rastreio_sql.py [--escala 1000:10000] [--repeticoes 20]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+PASTA_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PASTA_APP)
+
+import database  # noqa: E402
+from dados_sinteticos import gerar  # noqa: E402
+from suite_banco import COM_SCRYPT, casos  # noqa: E402
+
+RODADAS = 3
+
+
+def rodar(chamadas, repeticoes):
+    """Tempo total (s) de repeticoes voltas por todos os casos"""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for chamada in chamadas:
+            chamada()
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--escala", default="1000:10000", help="usuarios:produtos do banco sintético")
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+    usuarios, produtos = (int(parte) for parte in args.escala.split(":"))
+
+    pasta = tempfile.mkdtemp(prefix="nerdhub_rastreio_sql_")
+    try:
+        database.DB_PATH = os.path.join(pasta, "usuarios.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            gerar(database.DB_PATH, usuarios, produtos)
+        categorias = [slug for slug, _, _ in database.listar_categorias()]
+        chamadas = [chamada for nome, chamada in casos(usuarios, produtos, categorias, []).items()
+                    if nome not in COM_SCRYPT and not nome.startswith(("remover", "limpar"))]
+        total = len(chamadas) * args.repeticoes
+
+        # Modos alternados, RODADAS vezes: vale o menor tempo de cada um
+        # (as escritas dos casos fazem o banco crescer entre as voltas)
+        sem = com = float("inf")
+        with contextlib.redirect_stdout(io.StringIO()):
+            rodar(chamadas, 1)  # aquece conexões e statements
+            for _ in range(RODADAS):
+                sem = min(sem, rodar(chamadas, args.repeticoes))
+                rastreador = database.ativar_rastreio_sql(limite_ms=0, arquivo=os.path.join(pasta, "sql_lento.log"))
+                com = min(com, rodar(chamadas, args.repeticoes))
+                database.desativar_rastreio_sql()
+
+        print(f"{'modo':<12}{'µs por chamada':>16}")
+        print(f"{'sem rastreio':<12}{sem / total * 1e6:>16.1f}")
+        print(f"{'com rastreio':<12}{com / total * 1e6:>16.1f}")
+        print(f"acréscimo: {(com - sem) / total * 1e6:.1f} µs por chamada ({(com / sem - 1):.0%})\n")
+        print(rastreador.resumo())
+
+        estatisticas = rastreador.estatisticas()
+        with open(os.path.join(pasta, "sql_lento.log"), encoding="utf-8") as arquivo:
+            lentos = sum(1 for _ in arquivo)
+        print(f"\n{len(estatisticas)} formas de comando, {lentos:,} linhas no log de SQL lento (limite 0 ms)")
+
+        problemas = []
+        if not any(item["medicoes"] for item in estatisticas):
+            problemas.append("nenhum execute() medido")
+        if any(item["medicoes"] and not item["execucoes"] for item in estatisticas):
+            problemas.append("formas medidas sem execução no trace callback: "
+                             + "; ".join(item["forma"] for item in estatisticas
+                                         if item["medicoes"] and not item["execucoes"]))
+        if not lentos:
+            problemas.append("log de SQL lento vazio")
+        for problema in problemas:
+            print(f"❌ {problema}")
+        if problemas:
+            sys.exit(1)
+    finally:
+        database.obter_pool().fechar()
+        shutil.rmtree(pasta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# benchmarks/bench_registro.py
+"""
+Benchmark: custo do registro (logging) no catálogo e no login
+=============================================================
+Mede, contra um banco temporário, a latência de:
+- catálogo: primeira página da Home, produtos de uma categoria e
+  detalhes de um produto, com o cache do catálogo frio
+- login: verificar_login (scrypt com custo baixo, para o tempo do
+  registro não sumir atrás do KDF)
+
+em cada nível de registro:
+- DEBUG:   todas as mensagens escritas, uma linha por vez (o que os
+           antigos print() faziam)
+- INFO:    padrão do app
+- WARNING: registro desligado para o fluxo normal
+
+Mostra também o custo de uma chamada log.debug() com o nível desligado.
+A saída vai para os.devnull, então o DEBUG aqui é o melhor caso dos
+prints: num terminal ou no logcat cada linha custa bem mais.
+
+Uso (a partir da pasta nerd_hub.kv):
+    python benchmarks/bench_registro.py [--repeticoes 300] [--n 256]
+"""
+
+import argparse
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+import timeit
+
+PASTA_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PASTA_APP)
+
+import database  # noqa: E402
+import registro  # noqa: E402
+import senhas  # noqa: E402
+
+NIVEIS = ["DEBUG", "INFO", "WARNING"]
+
+
+def catalogo():
+    database.cache_catalogo.invalidar()
+    database.listar_produtos_pagina()
+    database.listar_produtos_por_categoria("lego")
+    database.buscar_produto_por_id(1)
+
+
+def login():
+    if not database.verificar_login("teste@email.com", "123456"):
+        raise RuntimeError("login falhou")
+
+
+def medir(funcao, repeticoes):
+    """Mediana e p95 em ms"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    tempos.sort()
+    return tempos[len(tempos) // 2], tempos[int(len(tempos) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeticoes", type=int, default=300)
+    parser.add_argument("--n", type=int, default=2 ** 8, help="custo n do scrypt no login")
+    args = parser.parse_args()
+    senhas.configurar(n=args.n)
+
+    pasta = tempfile.mkdtemp(prefix="nerdhub_registro_")
+    try:
+        with open(os.devnull, "w", buffering=1) as nulo, contextlib.redirect_stdout(nulo):
+            registro.configurar("WARNING")
+            database.DB_PATH = os.path.join(pasta, "usuarios.db")
+            database.inicializar_banco()
+            login()  # troca o hash do usuário de teste pelo custo atual
+
+            resultados = []
+            for nivel in NIVEIS:
+                registro.configurar(nivel)
+                medir(catalogo, 10)  # aquece
+                resultados.append((nivel, medir(catalogo, args.repeticoes),
+                                   medir(login, args.repeticoes)))
+
+            registro.configurar("WARNING")
+            log = registro.obter_logger("bench")
+            chamadas = 1_000_000
+            desligado = timeit.timeit(lambda: log.debug("📦 %s produtos da categoria '%s'", 20, "lego"),
+                                      number=chamadas)
+            vazio = timeit.timeit(lambda: None, number=chamadas)
+    finally:
+        database.obter_pool().fechar()
+        shutil.rmtree(pasta, ignore_errors=True)
+        registro.configurar()
+
+    print(f"{'nível':<10}{'catálogo med (ms)':>19}{'p95':>8}{'login med (ms)':>16}{'p95':>8}")
+    for nivel, (cat_med, cat_p95), (log_med, log_p95) in resultados:
+        print(f"{nivel:<10}{cat_med:>19.3f}{cat_p95:>8.3f}{log_med:>16.3f}{log_p95:>8.3f}")
+    print(f"\nlog.debug() desligado: {(desligado - vazio) / chamadas * 1e9:.0f} ns por chamada")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# benchmarks/bench_senhas.py
+"""
+Benchmark: login com scrypt x bloqueio da thread da interface
+=============================================================
+Faz N logins (verificar_login) contra um banco temporário e mede, para
+cada modo:
+- logins por segundo
+- pior frame do loop do Kivy (Clock a 60 fps) durante os logins
+- tempo total gasto na thread da interface
+
+Com o executor, logins/s cresce com as threads até o número de núcleos
+(o hashlib libera o GIL durante o scrypt).
+
+Modos:
+- scrypt_interface:  scrypt calculado na thread da interface (o que
+                     aconteceria sem o executor de senhas)
+- scrypt_executor_N: scrypt no executor de senhas com N threads (o app)
+
+Uso (a partir da pasta nerd_hub.kv):
+    python benchmarks/bench_senhas.py [--logins 40] [--n 16384] [--r 8] [--threads 1 2 4]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+PASTA_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PASTA_APP)
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+
+from kivy.clock import Clock  # noqa: E402
+
+import database  # noqa: E402
+import senhas  # noqa: E402
+from executor_banco import ExecutorBanco  # noqa: E402
+
+USUARIOS = 8
+
+
+def preparar():
+    """Cadastra USUARIOS usuários com hash scrypt"""
+    with database.conectar() as conn:
+        conn.execute("DELETE FROM usuarios")
+        for i in range(USUARIOS):
+            senha = senhas.gerar_hash("senha")
+            conn.execute("INSERT INTO usuarios (nome, email, senha) VALUES (?, ?, ?)",
+                         (f"Usuário {i}", f"usuario{i}@email.com", senha))
+        conn.commit()
+
+
+def rodar(logins, threads):
+    """Executa os logins; threads=0 faz tudo na thread da interface, um por frame"""
+    frames, concluidos = [], []
+    executor = ExecutorBanco(nome="bench-senhas", threads=threads) if threads else None
+    fila = [f"usuario{i % USUARIOS}@email.com" for i in range(logins)]
+    tempo_interface = 0.0
+
+    def login_na_interface(dt):
+        nonlocal tempo_interface
+        if fila:
+            inicio = time.perf_counter()
+            concluidos.append(database.verificar_login(fila.pop(), "senha"))
+            tempo_interface += time.perf_counter() - inicio
+
+    def concluido(usuario):
+        nonlocal tempo_interface
+        inicio = time.perf_counter()
+        concluidos.append(usuario)
+        tempo_interface += time.perf_counter() - inicio
+
+    evento = Clock.schedule_interval(login_na_interface, 0) if not executor else None
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if executor:
+            for email in fila:
+                executor.enviar(database.verificar_login, email, "senha", ao_concluir=concluido)
+        anterior = time.perf_counter()
+        while len(concluidos) < logins:
+            Clock.tick()
+            agora = time.perf_counter()
+            frames.append(agora - anterior)
+            anterior = agora
+    total = time.perf_counter() - inicio
+
+    if evento:
+        evento.cancel()
+    if executor:
+        executor.parar()
+    if not all(concluidos):
+        raise RuntimeError("algum login falhou")
+    return logins / total, max(frames) * 1000, tempo_interface * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--n", type=int, default=senhas.CUSTO["n"])
+    parser.add_argument("--r", type=int, default=senhas.CUSTO["r"])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+    senhas.configurar(n=args.n, r=args.r)
+
+    pasta = tempfile.mkdtemp(prefix="nerdhub_senhas_")
+    try:
+        database.DB_PATH = os.path.join(pasta, "usuarios.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            database.criar_tabelas()
+
+        inicio = time.perf_counter()
+        senhas.gerar_hash("senha")
+        print(f"scrypt n={args.n} r={args.r}: {(time.perf_counter() - inicio) * 1000:.1f} ms por hash\n")
+
+        print(f"{'modo':<22}{'logins/s':>10}{'pior frame (ms)':>17}{'thread da interface (ms)':>26}")
+        with contextlib.redirect_stdout(io.StringIO()):
+            preparar()
+        modos = [("scrypt_interface", 0)] + [(f"scrypt_executor_{n}", n) for n in args.threads]
+        for nome, threads in modos:
+            por_segundo, pior_frame, interface = rodar(args.logins, threads)
+            print(f"{nome:<22}{por_segundo:>10.1f}{pior_frame:>17.1f}{interface:>26.1f}")
+    finally:
+        database.obter_pool().fechar()
+        shutil.rmtree(pasta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
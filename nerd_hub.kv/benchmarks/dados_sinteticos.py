@@ -0,0 +1,164 @@
+# benchmarks/dados_sinteticos.py
+"""
+Gerador de dados sintéticos
+===========================
+Cria um banco com N usuários, M produtos espalhados pelas categorias
+existentes e carrinhos com cara de uso real:
+- títulos, preços (terminados em ,90) e imagens variados por categoria
+- popularidade dos produtos em cauda longa (poucos muito adicionados)
+- ~40% dos usuários com carrinho vazio, os demais com 1 a 8 itens
+
+É determinístico: mesma semente, mesmos parâmetros -> mesmos dados (só o
+salt do hash de senha muda). Todos os usuários têm a senha SENHA, com um
+único hash scrypt calculado uma vez; o usuário 1 é o de teste
+(teste@email.com).
+
+Uso (a partir da pasta nerd_hub.kv):
+    python benchmarks/dados_sinteticos.py --saida /tmp/grande.db [--usuarios 10000] [--produtos 100000] [--semente 42]
+
+    from dados_sinteticos import gerar
+    resumo = gerar("/tmp/grande.db", usuarios=1000, produtos=10000)
+"""
+
+import argparse
+import bisect
+import contextlib
+import io
+import itertools
+import os
+import random
+import sys
+import time
+
+PASTA_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PASTA_APP)
+
+import database  # noqa: E402
+from importacao import carga_em_massa  # noqa: E402
+from precos import formatar_brl  # noqa: E402
+
+SENHA = "123456"
+SEMENTE = 42
+LOTE = 10000
+
+NOMES = ["Ana", "Bruno", "Carla", "Diego", "Elisa", "Felipe", "Gabriela", "Hugo", "Isabela", "João",
+         "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael", "Sofia", "Thiago", "Vitória", "Yuri"]
+SOBRENOMES = ["Silva", "Souza", "Oliveira", "Santos", "Lima", "Pereira", "Costa", "Rodrigues",
+              "Almeida", "Nascimento", "Carvalho", "Ribeiro", "Gomes", "Martins", "Rocha"]
+
+TIPOS = ["Funko Pop!", "LEGO", "Camiseta", "Action Figure", "Pelúcia", "Caneca", "Chaveiro",
+         "Pôster", "Moletom", "Boné", "Quebra-cabeça", "Miniatura"]
+
+# Personagens/produtos por categoria (categorias novas usam os nomes genéricos)
+TEMAS = {
+    "disney": ["Mickey Mouse", "Minnie", "Stitch", "Elsa", "Buzz Lightyear", "Woody", "Simba"],
+    "marvel": ["Homem de Ferro", "Homem-Aranha", "Thor", "Hulk", "Capitão América", "Thanos", "Loki"],
+    "starwars": ["Darth Vader", "Yoda", "Chewbacca", "Boba Fett", "Stormtrooper", "R2-D2", "Grogu"],
+    "playstation": ["God of War", "Spider-Man 2", "Horizon", "The Last of Us", "Gran Turismo", "Ratchet"],
+    "xbox": ["Halo", "Forza", "Gears of War", "Starfield", "Fable", "Sea of Thieves"],
+}
+TEMAS_GENERICOS = ["Edição Colecionador", "Clássico", "Retrô", "Deluxe", "Edição Limitada"]
+
+# Itens no carrinho: 0 para ~40% dos usuários
+PESOS_ITENS_CARRINHO = [40, 15, 12, 10, 8, 6, 4, 3, 2]
+
+
+def _imagens():
+    pasta = os.path.join(PASTA_APP, "imagens", "imagem_produtos_home")
+    return sorted(f"imagens/imagem_produtos_home/{nome}" for nome in os.listdir(pasta))
+
+
+def _usuarios(rng, total, senha_hash):
+    for i in range(2, total + 1):  # o 1 é o usuário de teste
+        nome = f"{rng.choice(NOMES)} {rng.choice(SOBRENOMES)}"
+        yield (nome, f"usuario{i}@email.com", senha_hash, f"119{rng.randrange(10**7, 10**8)}",
+               f"{rng.randint(1960, 2008)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}")
+
+
+def _produtos(rng, total, categorias, imagens):
+    for i in range(1, total + 1):
+        categoria = rng.choice(categorias)
+        tema = rng.choice(TEMAS.get(categoria, TEMAS_GENERICOS))
+        # Preço em cauda longa: a maioria barata, alguns consoles/LEGOs caros
+        centavos = int(rng.lognormvariate(5.0, 1.0)) * 100 + 90
+        yield (f"{rng.choice(TIPOS)} {tema} #{i}", formatar_brl(centavos), centavos,
+               rng.choice(imagens), categoria)
+
+
+def _carrinhos(rng, usuarios, produtos):
+    # Popularidade tipo Zipf: o produto de posição k tem peso 1/k
+    acumulado = list(itertools.accumulate(1 / k for k in range(1, produtos + 1)))
+    ordem = list(range(1, produtos + 1))
+    rng.shuffle(ordem)
+    inicio = 1_700_000_000  # segundos desde 1970 (nov/2023)
+    for usuario_id in range(1, usuarios + 1):
+        quantos = rng.choices(range(len(PESOS_ITENS_CARRINHO)), PESOS_ITENS_CARRINHO)[0]
+        escolhidos = set()
+        while len(escolhidos) < min(quantos, produtos):
+            escolhidos.add(ordem[bisect.bisect(acumulado, rng.random() * acumulado[-1])])
+        for produto_id in sorted(escolhidos):
+            momento = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(inicio + rng.randrange(30_000_000)))
+            yield usuario_id, produto_id, rng.choices((1, 2, 3), (80, 15, 5))[0], momento
+
+
+def _inserir(conn, sql, linhas):
+    total = 0
+    while True:
+        lote = list(itertools.islice(linhas, LOTE))
+        if not lote:
+            return total
+        conn.executemany(sql, lote)
+        conn.commit()
+        total += len(lote)
+
+
+def gerar(caminho, usuarios=1000, produtos=10000, semente=SEMENTE):
+    """Cria o banco em caminho (que não deve existir) e devolve as contagens geradas"""
+    if os.path.exists(caminho):
+        raise FileExistsError(f"{caminho} já existe")
+    rng = random.Random(semente)
+    database.DB_PATH = caminho
+    with contextlib.redirect_stdout(io.StringIO()):
+        database.criar_tabelas()
+
+    senha_hash = database.hash_senha(SENHA)
+    with database.conectar() as conn:
+        conn.execute("DELETE FROM produtos")  # catálogo inicial sai: ids 1..M são os gerados
+        conn.execute("DELETE FROM sqlite_sequence WHERE name = 'produtos'")
+        conn.execute("INSERT INTO usuarios (nome, email, senha) VALUES (?, ?, ?)",
+                     ("Usuário Teste", "teste@email.com", senha_hash))
+        categorias = [linha[0] for linha in conn.execute("SELECT slug FROM categorias ORDER BY ordem")]
+        conn.commit()
+
+        resumo = {"usuarios": 1 + _inserir(conn, """
+            INSERT INTO usuarios (nome, email, senha, telefone, data_nascimento) VALUES (?, ?, ?, ?, ?)
+        """, _usuarios(rng, usuarios, senha_hash))}
+        with carga_em_massa(conn):
+            resumo["produtos"] = _inserir(conn, """
+                INSERT INTO produtos (title, price, price_cents, image, categoria) VALUES (?, ?, ?, ?, ?)
+            """, _produtos(rng, produtos, categorias, _imagens()))
+        resumo["itens_carrinho"] = _inserir(conn, """
+            INSERT INTO carrinho (usuario_id, produto_id, quantidade, adicionado_em) VALUES (?, ?, ?, ?)
+        """, _carrinhos(rng, usuarios, produtos))
+    database.cache_catalogo.invalidar()
+    return resumo
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--saida", required=True, help="arquivo .db a criar")
+    parser.add_argument("--usuarios", type=int, default=1000)
+    parser.add_argument("--produtos", type=int, default=10000)
+    parser.add_argument("--semente", type=int, default=SEMENTE)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    resumo = gerar(args.saida, args.usuarios, args.produtos, args.semente)
+    database.obter_pool().fechar()
+    print(f"✅ {resumo['usuarios']:,} usuários, {resumo['produtos']:,} produtos e "
+          f"{resumo['itens_carrinho']:,} itens de carrinho em {args.saida} "
+          f"({time.perf_counter() - inicio:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
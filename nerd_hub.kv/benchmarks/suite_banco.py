@@ -0,0 +1,234 @@
+# benchmarks/suite_banco.py
+"""
+Suíte de benchmarks do banco (database.py)
+==========================================
+Para cada escala (usuários x produtos) gera um banco sintético
+determinístico (dados_sinteticos.py) e mede cada função pública do
+database.py: mediana (a menor de RODADAS rodadas), p95 e pior tempo em ms. As consultas do catálogo
+rodam com o cache frio (cache_catalogo invalidado a cada chamada), para
+medir o banco e não o dicionário.
+
+Os resultados vão para um JSON. Se existir um baseline (outro JSON da
+suíte, da mesma máquina), cada função é comparada com ele e a saída é 1
+quando alguma mediana passar da tolerância e também do p95 do baseline.
+
+A suíte falha também se alguma função pública do database.py não tiver
+um caso aqui (CASOS): função nova, benchmark novo.
+
+Uso (a partir da pasta nerd_hub.kv):
+    python benchmarks/suite_banco.py [--escalas 100:1000 1000:10000 10000:100000]
+                                     [--repeticoes 50] [--saida resultados/suite_banco.json]
+                                     [--baseline resultados/baseline_banco.json] [--tolerancia 0.25]
+                                     [--salvar-baseline]
+"""
+
+import argparse
+import datetime
+import inspect
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+PASTA_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASTA_BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, PASTA_APP)
+
+import database  # noqa: E402
+from dados_sinteticos import SEMENTE, SENHA, gerar  # noqa: E402
+
+ESCALAS = ["100:1000", "1000:10000", "10000:100000"]
+SAIDA = os.path.join(PASTA_BENCHMARKS, "resultados", "suite_banco.json")
+BASELINE = os.path.join(PASTA_BENCHMARKS, "resultados", "baseline_banco.json")
+
+# Infraestrutura, exercitada por todas as outras (o rastreio de SQL tem
+# o próprio benchmark, bench_rastreio_sql.py)
+IGNORADAS = {"obter_pool", "conectar", "ativar_rastreio_sql", "desativar_rastreio_sql",
+             "produto_em_cache", "pagina_home_em_cache", "pagina_categoria_em_cache",
+             "geracao_catalogo"}
+
+# Funções com scrypt (dezenas de ms por chamada): menos repetições
+COM_SCRYPT = {"hash_senha", "cadastrar_usuario", "verificar_login", "update_password"}
+REPETICOES_SCRYPT = 10
+
+# Cada função é medida em RODADAS rodadas; a mediana publicada é a menor delas
+# (uma rodada atrapalhada por outro processo da máquina não vira "regressão")
+RODADAS = 3
+
+# Diferenças abaixo disso (ms) são ruído, mesmo que a proporção seja grande
+PISO_MS = 0.05
+
+
+def frio(funcao, *args):
+    """Chamada de catálogo com o cache vazio"""
+    database.cache_catalogo.invalidar()
+    return funcao(*args)
+
+
+def casos(usuarios, produtos, categorias, itens_carrinho):
+    """Nome da função do database.py -> chamada de uma repetição.
+    Leituras primeiro; escritas que apagam dados (remover, limpar) por último."""
+    rng = random.Random(SEMENTE)
+    usuario = lambda: rng.randint(1, usuarios)  # noqa: E731
+    produto = lambda: rng.randint(1, produtos)  # noqa: E731
+    categoria = lambda: rng.choice(categorias)  # noqa: E731
+    novos = itertools.count()
+    rng.shuffle(itens_carrinho)
+
+    return {
+        "criar_tabelas": database.criar_tabelas,
+        "inicializar_banco": database.inicializar_banco,
+        "carregar_usuario_teste": database.carregar_usuario_teste,
+        "hash_senha": lambda: database.hash_senha(SENHA),
+        "verificar_login": lambda: database.verificar_login(f"usuario{rng.randint(2, usuarios)}@email.com", SENHA),
+        "listar_usuarios": database.listar_usuarios,
+        "get_user_by_id": lambda: database.get_user_by_id(usuario()),
+        "get_user_by_email": lambda: database.get_user_by_email(f"usuario{rng.randint(2, usuarios)}@email.com"),
+        "listar_produtos": lambda: frio(database.listar_produtos),
+        "listar_produtos_por_categoria": lambda: frio(database.listar_produtos_por_categoria, categoria()),
+        "listar_produtos_pagina": lambda: frio(database.listar_produtos_pagina, rng.choice((None, produto()))),
+        "listar_produtos_por_categoria_pagina": lambda: frio(database.listar_produtos_por_categoria_pagina,
+                                                             categoria(), rng.choice((None, produto()))),
+        "listar_categorias": lambda: frio(database.listar_categorias),
+        "buscar_produtos": lambda: frio(database.buscar_produtos, rng.choice(("lego", "funko vader", "caneca", "mick"))),
+        "buscar_produto_por_id": lambda: frio(database.buscar_produto_por_id, produto()),
+        "buscar_produtos_por_ids": lambda: frio(database.buscar_produtos_por_ids, [produto() for _ in range(8)]),
+        "obter_carrinho_usuario": lambda: database.obter_carrinho_usuario(usuario()),
+        "obter_total_carrinho": lambda: database.obter_total_carrinho(usuario()),
+        "cadastrar_usuario": lambda: database.cadastrar_usuario("Novo Usuário", f"novo{next(novos)}@email.com", SENHA),
+        "update_user_profile": lambda: database.update_user_profile(usuario(), nome="Nome Atualizado",
+                                                                    telefone="11999999999"),
+        "update_password": lambda: database.update_password(usuario(), SENHA),
+        "adicionar_ao_carrinho_db": lambda: database.adicionar_ao_carrinho_db(usuario(), produto()),
+        "adicionar_lote_ao_carrinho_db": lambda: database.adicionar_lote_ao_carrinho_db(
+            [(usuario(), produto(), 1) for _ in range(10)]),
+        "adicionar_categoria": lambda: database.adicionar_categoria("bench", "Bench", None, 99),
+        "adicionar_produto": lambda: database.adicionar_produto(f"Produto Bench {next(novos)}", "R$ 99,90",
+                                                                "imagens/imagem_produtos_home/forza.jpg",
+                                                                categoria()),
+        "remover_do_carrinho_db": lambda: database.remover_do_carrinho_db(
+            *(itens_carrinho.pop() if itens_carrinho else (usuario(), produto()))),
+        "limpar_carrinho_usuario": lambda: database.limpar_carrinho_usuario(usuario()),
+    }
+
+
+def funcoes_publicas():
+    return sorted(nome for nome, funcao in inspect.getmembers(database, inspect.isfunction)
+                  if not nome.startswith("_") and funcao.__module__ == database.__name__)
+
+
+def medir(chamada, repeticoes):
+    chamada()  # aquece conexões e statements
+    tempos, medianas = [], []
+    for _ in range(RODADAS):
+        rodada = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            chamada()
+            rodada.append((time.perf_counter() - inicio) * 1000)
+        medianas.append(sorted(rodada)[len(rodada) // 2])
+        tempos.extend(rodada)
+    tempos.sort()
+    return {"mediana_ms": round(min(medianas), 4),
+            "p95_ms": round(tempos[min(len(tempos) - 1, int(len(tempos) * 0.95))], 4),
+            "max_ms": round(tempos[-1], 4), "n": len(tempos)}
+
+
+def rodar_escala(usuarios, produtos, repeticoes, pasta):
+    inicio = time.perf_counter()
+    dados = gerar(os.path.join(pasta, f"suite_{usuarios}_{produtos}.db"), usuarios, produtos)
+    dados["geracao_s"] = round(time.perf_counter() - inicio, 2)
+    with database.conectar() as conn:
+        categorias = [linha[0] for linha in conn.execute("SELECT slug FROM categorias")]
+        itens = [tuple(linha) for linha in conn.execute("SELECT usuario_id, produto_id FROM carrinho")]
+
+    resultados = {}
+    for nome, chamada in casos(usuarios, produtos, categorias, itens).items():
+        resultados[nome] = medir(chamada, min(repeticoes, REPETICOES_SCRYPT) if nome in COM_SCRYPT else repeticoes)
+        print(f"   {nome:<38}{resultados[nome]['mediana_ms']:>10.3f}{resultados[nome]['p95_ms']:>10.3f}",
+              flush=True)
+    database.obter_pool().fechar()
+    return {**dados, "funcoes": resultados}
+
+
+def comparar(atual, baseline, tolerancia):
+    """Lista de (escala, função, ms baseline, ms atual) mais lentas que a tolerância"""
+    regressoes = []
+    for escala, dados in atual["escalas"].items():
+        anteriores = baseline.get("escalas", {}).get(escala, {}).get("funcoes", {})
+        for nome, medida in dados["funcoes"].items():
+            if nome not in anteriores:
+                continue
+            antes, agora = anteriores[nome]["mediana_ms"], medida["mediana_ms"]
+            # A mediana nova também tem que passar do p95 do baseline (ruído da máquina)
+            limite = max(antes * (1 + tolerancia), antes + PISO_MS, anteriores[nome]["p95_ms"])
+            if agora > limite:
+                regressoes.append((escala, nome, antes, agora))
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--escalas", nargs="+", default=ESCALAS, help="usuarios:produtos")
+    parser.add_argument("--repeticoes", type=int, default=50)
+    parser.add_argument("--saida", default=SAIDA)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="aumento da mediana aceito antes de acusar regressão (0.25 = 25%%)")
+    parser.add_argument("--salvar-baseline", action="store_true",
+                        help="grava os resultados também como o novo baseline")
+    args = parser.parse_args()
+
+    faltando = sorted(set(funcoes_publicas()) - IGNORADAS - set(casos(1, 1, ["x"], [])))
+    if faltando:
+        print(f"❌ Funções públicas do database.py sem caso na suíte: {', '.join(faltando)}")
+        sys.exit(1)
+
+    resultado = {
+        "gerado_em": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "plataforma": platform.platform(),
+        "semente": SEMENTE,
+        "escalas": {},
+    }
+    pasta = tempfile.mkdtemp(prefix="nerdhub_suite_")
+    try:
+        for escala in args.escalas:
+            usuarios, produtos = (int(parte) for parte in escala.split(":"))
+            print(f"\n📊 {usuarios:,} usuários x {produtos:,} produtos{'mediana':>17}{'p95':>10}")
+            resultado["escalas"][escala] = rodar_escala(usuarios, produtos, args.repeticoes, pasta)
+    finally:
+        database.obter_pool().fechar()
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.saida)), exist_ok=True)
+    with open(args.saida, "w", encoding="utf-8") as arquivo:
+        json.dump(resultado, arquivo, indent=2, ensure_ascii=False)
+    print(f"\n💾 Resultados em {args.saida}")
+
+    if not os.path.exists(args.baseline):
+        print(f"ℹ️ Sem baseline em {args.baseline} (use --salvar-baseline)")
+    else:
+        with open(args.baseline, encoding="utf-8") as arquivo:
+            regressoes = comparar(resultado, json.load(arquivo), args.tolerancia)
+        for escala, nome, antes, agora in regressoes:
+            print(f"❌ {escala} {nome}: {antes:.3f} ms -> {agora:.3f} ms (+{(agora / antes - 1) * 100:.0f}%)")
+        if regressoes and not args.salvar_baseline:
+            sys.exit(1)
+        if not regressoes:
+            print(f"✅ Nenhuma regressão acima de {args.tolerancia:.0%} em relação a {args.baseline}")
+
+    if args.salvar_baseline:
+        shutil.copyfile(args.saida, args.baseline)
+        print(f"💾 Baseline atualizado: {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+# benchmarks/suite_telas.py
+"""
+Suíte de benchmarks das telas (transições da interface)
+=======================================================
+Abre o app sem janela visível (SDL_VIDEODRIVER=offscreen) contra um banco
+sintético (dados_sinteticos.py), com o usuário de teste logado, e passa
+por todas as telas do Gerenciador com mudar_tela() - duas vezes: a
+primeira visita constrói a tela (.kv, import, widgets), o retorno não.
+
+Para cada transição registra:
+- chamada_ms:        mudar_tela() em si (construção + on_pre_enter)
+- primeiro_frame_ms: até o primeiro frame desenhado depois da chamada
+- transicao_ms:      até o fim da animação da transição
+- pronta_ms:         até o executor do banco esvaziar e o resultado ser
+                     entregue à tela (dados carregados)
+- frame_max_ms / frame_mediana_ms / frames: frames desenhados até o fim da
+                     transição e da carga
+- widgets_criados:   widgets que não existiam antes da transição
+- widgets_na_tela:   widgets na árvore da tela
+
+Cada rodada é um processo novo; os tempos publicados são os menores entre
+as rodadas. O pré-aquecimento de telas do on_start fica desligado para a
+primeira visita medir a construção. A Home é construída no início, então
+as duas passagens por ela são retornos.
+
+Como na suíte do banco, o JSON é comparado com um baseline da mesma
+máquina e a saída é 1 quando algum tempo passa da tolerância e do piso
+(PISO_MS), ou quando uma tela passa a criar mais widgets. A animação e o
+pior frame só são informados: sem placa de vídeo (offscreen com OpenGL por
+software) variam demais para servir de critério.
+
+Uso (a partir da pasta nerd_hub.kv):
+    python benchmarks/suite_telas.py [--escala 1000:10000] [--rodadas 3]
+                                     [--saida resultados/suite_telas.json]
+                                     [--baseline resultados/baseline_telas.json] [--tolerancia 0.5]
+                                     [--salvar-baseline]
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PASTA_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASTA_BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+
+SAIDA = os.path.join(PASTA_BENCHMARKS, "resultados", "suite_telas.json")
+BASELINE = os.path.join(PASTA_BENCHMARKS, "resultados", "baseline_telas.json")
+
+# Propriedades definidas antes de entrar na tela (como a Home/o header fariam)
+PROPRIEDADES = {
+    "detalhes_produto": {"produto_id": 1},
+    "busca": {"termo": "lego"},
+}
+
+TEMPOS = ("chamada_ms", "primeiro_frame_ms", "transicao_ms", "pronta_ms", "frame_max_ms", "frame_mediana_ms")
+# Só os tempos que dependem do app: a animação da transição e o pior frame
+# dependem sobretudo da placa de vídeo (no offscreen, do OpenGL por software)
+COMPARADOS = ("chamada_ms", "primeiro_frame_ms", "pronta_ms")
+
+# Espera máxima por uma tela (s) e diferença mínima (ms) para acusar regressão
+LIMITE_S = 10
+PISO_MS = 5.0
+
+
+# =============================================================================
+# PROCESSO FILHO: abre o app e percorre as telas
+# =============================================================================
+
+def rodar_app(caminho_db, caminho_json):
+    os.environ["NERDHUB_DB_PATH"] = caminho_db
+    os.environ.setdefault("SDL_VIDEODRIVER", "offscreen")
+    os.environ.setdefault("KIVY_NO_ARGS", "1")
+    os.environ.setdefault("NERDHUB_LOG", "WARNING")
+    os.chdir(PASTA_APP)
+    sys.path.insert(0, PASTA_APP)
+
+    from kivy.config import Config
+    Config.set("graphics", "maxfps", "0")  # frames sem espera, para medir o custo real
+    from kivy.clock import Clock
+    from kivy.core.window import Window
+    from kivy.uix.widget import Widget
+
+    import database
+    import main
+    from dados_sinteticos import SENHA
+    from executor_banco import executor
+
+    main.TELAS_PREAQUECIDAS = ()
+    app = main.NerdHubApp()
+    flips = []
+    Window.bind(on_flip=lambda *args: flips.append(time.perf_counter()))
+    relatorio = {}
+
+    def widgets_vivos():
+        # type() em vez de isinstance(): gc.get_objects() inclui weakproxies mortos
+        return [objeto for objeto in gc.get_objects() if issubclass(type(objeto), Widget)]
+
+    def medir(sm, nome):
+        """Gerador: avança um frame a cada next(); termina com as medidas da transição"""
+        if nome in PROPRIEDADES:
+            if sm.tela_construida(nome):
+                for propriedade, valor in PROPRIEDADES[nome].items():
+                    setattr(sm.get_screen(nome), propriedade, valor)
+            else:
+                kv, modulo, classe, *_ = sm.fabricas[nome]
+                sm.fabricas[nome] = (kv, modulo, classe, PROPRIEDADES[nome])
+        antes = widgets_vivos()
+        vistos = {id(widget) for widget in antes}
+
+        flips.clear()
+        inicio = time.perf_counter()
+        sm.mudar_tela(nome)
+        chamada = time.perf_counter() - inicio
+
+        transicao = pronta = ocioso = None
+        while time.perf_counter() - inicio < LIMITE_S and (transicao is None or pronta is None):
+            yield
+            agora = time.perf_counter() - inicio
+            if transicao is None and not sm.transition.is_active:
+                transicao = agora
+            if pronta is None and ocioso:
+                pronta = agora  # resultado do executor entregue no frame seguinte
+            ocioso = ocioso or executor.ocioso()
+        fim = time.perf_counter() - inicio
+        transicao, pronta = transicao or fim, pronta or fim
+
+        marcas = [inicio] + [flip for flip in flips if flip >= inicio]
+        frames = [(b - a) * 1000 for a, b in zip(marcas, marcas[1:])]
+        criados = sum(1 for widget in widgets_vivos() if id(widget) not in vistos)
+        del antes
+        return {
+            "chamada_ms": round(chamada * 1000, 2),
+            "primeiro_frame_ms": round(frames[0], 2) if frames else None,
+            "transicao_ms": round(transicao * 1000, 2),
+            "pronta_ms": round(pronta * 1000, 2),
+            "frame_max_ms": round(max(frames), 2) if frames else None,
+            "frame_mediana_ms": round(statistics.median(frames), 2) if frames else None,
+            "frames": len(frames),
+            "widgets_criados": criados,
+            "widgets_na_tela": sum(1 for _ in sm.get_screen(nome).walk()) - 1,
+        }
+
+    def roteiro():
+        sm = app.root
+        usuario = database.verificar_login("teste@email.com", SENHA)
+        app.usuario_logado = {'id': usuario[0], 'nome': usuario[1], 'email': usuario[2]}
+
+        while not executor.ocioso():  # Home carregando a primeira página
+            yield
+        telas = [nome for nome in sm.fabricas] + ["home"]
+        for passagem in ("primeira", "retorno"):
+            for nome in telas:
+                relatorio.setdefault(nome, {})[passagem] = yield from medir(sm, nome)
+
+    passos = roteiro()
+
+    def passo(dt):
+        try:
+            next(passos)
+        except StopIteration:
+            with open(caminho_json, "w", encoding="utf-8") as arquivo:
+                json.dump(relatorio, arquivo)
+            app.stop()
+            return False
+
+    Clock.schedule_once(lambda dt: Clock.schedule_interval(passo, 0), 0.5)
+    app.run()
+
+
+# =============================================================================
+# PROCESSO PRINCIPAL: banco, rodadas, relatório e comparação
+# =============================================================================
+
+def combinar(rodadas):
+    """Menor tempo de cada medida entre as rodadas; contagens da primeira"""
+    combinado = {}
+    for nome, passagens in rodadas[0].items():
+        for passagem, medidas in passagens.items():
+            resultado = dict(medidas)
+            for chave in TEMPOS:
+                valores = [r[nome][passagem][chave] for r in rodadas if r[nome][passagem][chave] is not None]
+                resultado[chave] = min(valores) if valores else None
+            combinado.setdefault(nome, {})[passagem] = resultado
+    return combinado
+
+
+def comparar(atual, baseline, tolerancia):
+    """Lista de (tela, passagem, medida, antes, agora) que pioraram"""
+    regressoes = []
+    for nome, passagens in atual["telas"].items():
+        for passagem, medidas in passagens.items():
+            anteriores = baseline.get("telas", {}).get(nome, {}).get(passagem)
+            if not anteriores:
+                continue
+            for chave in COMPARADOS:
+                antes, agora = anteriores.get(chave), medidas.get(chave)
+                if antes is None or agora is None:
+                    continue
+                if agora > max(antes * (1 + tolerancia), antes + PISO_MS):
+                    regressoes.append((nome, passagem, chave, antes, agora))
+            antes, agora = anteriores["widgets_criados"], medidas["widgets_criados"]
+            if agora > antes * (1 + tolerancia) and agora - antes > 5:
+                regressoes.append((nome, passagem, "widgets_criados", antes, agora))
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--escala", default="1000:10000", help="usuarios:produtos do banco sintético")
+    parser.add_argument("--rodadas", type=int, default=3)
+    parser.add_argument("--saida", default=SAIDA)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--tolerancia", type=float, default=0.5)
+    parser.add_argument("--salvar-baseline", action="store_true")
+    parser.add_argument("--filho", nargs=2, metavar=("BANCO", "JSON"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.filho:
+        rodar_app(*args.filho)
+        return
+
+    sys.path.insert(0, PASTA_APP)
+    import database
+    from dados_sinteticos import gerar
+
+    usuarios, produtos = (int(parte) for parte in args.escala.split(":"))
+    pasta = tempfile.mkdtemp(prefix="nerdhub_telas_")
+    try:
+        caminho_db = os.path.join(pasta, "telas.db")
+        gerar(caminho_db, usuarios, produtos)
+        database.obter_pool().fechar()
+
+        rodadas = []
+        for rodada in range(args.rodadas):
+            # Cada rodada numa cópia: a anterior pode ter escrito no banco
+            copia = os.path.join(pasta, f"rodada{rodada}.db")
+            shutil.copyfile(caminho_db, copia)
+            caminho_json = os.path.join(pasta, f"rodada{rodada}.json")
+            subprocess.run([sys.executable, os.path.abspath(__file__), "--filho", copia, caminho_json],
+                           check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            with open(caminho_json, encoding="utf-8") as arquivo:
+                rodadas.append(json.load(arquivo))
+            print(f"   rodada {rodada + 1}/{args.rodadas} concluída", flush=True)
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    resultado = {
+        "gerado_em": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "escala": args.escala,
+        "rodadas": args.rodadas,
+        "telas": combinar(rodadas),
+    }
+
+    print(f"\n{'tela':<18}{'passagem':<10}{'chamada':>9}{'1º frame':>10}{'transição':>11}{'pronta':>9}"
+          f"{'frame máx':>11}{'widgets':>9}")
+    for nome, passagens in resultado["telas"].items():
+        for passagem, m in passagens.items():
+            print(f"{nome:<18}{passagem:<10}{m['chamada_ms']:>9.1f}{m['primeiro_frame_ms'] or 0:>10.1f}"
+                  f"{m['transicao_ms']:>11.1f}{m['pronta_ms']:>9.1f}{m['frame_max_ms'] or 0:>11.1f}"
+                  f"{m['widgets_criados']:>9}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.saida)), exist_ok=True)
+    with open(args.saida, "w", encoding="utf-8") as arquivo:
+        json.dump(resultado, arquivo, indent=2, ensure_ascii=False)
+    print(f"\n💾 Resultados em {args.saida}")
+
+    if not os.path.exists(args.baseline):
+        print(f"ℹ️ Sem baseline em {args.baseline} (use --salvar-baseline)")
+    else:
+        with open(args.baseline, encoding="utf-8") as arquivo:
+            regressoes = comparar(resultado, json.load(arquivo), args.tolerancia)
+        for nome, passagem, chave, antes, agora in regressoes:
+            print(f"❌ {nome} ({passagem}) {chave}: {antes} -> {agora}")
+        if regressoes and not args.salvar_baseline:
+            sys.exit(1)
+        if not regressoes:
+            print(f"✅ Nenhuma regressão acima de {args.tolerancia:.0%} em relação a {args.baseline}")
+
+    if args.salvar_baseline:
+        shutil.copyfile(args.saida, args.baseline)
+        print(f"💾 Baseline atualizado: {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
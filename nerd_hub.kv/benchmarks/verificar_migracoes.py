@@ -0,0 +1,217 @@
+# benchmarks/verificar_migracoes.py
+"""
+Verificação: migrações a partir de cada esquema histórico
+=========================================================
+Monta bancos temporários em cada formato que já existiu e roda
+criar_tabelas() em cada um, conferindo que:
+- o banco termina na versão atual (PRAGMA user_version)
+- tabelas, colunas, índices e triggers são os de um banco novo
+- dados existentes são preservados (produtos não são recarregados,
+  price_cents é preenchido, caminhos de imagem corrigidos)
+- a segunda inicialização executa só a leitura do user_version
+- uma migração que falha não deixa nada pela metade
+
+Formatos:
+- vazio:              arquivo novo
+- original:           usuarios sem perfil, produtos sem descricao/price_cents
+                      e imagens com o prefixo 'nerd_hub.kv/'
+- distribuido:        cópia do usuarios.db do repositório
+- pre_versionamento:  esquema completo mas user_version = 0 (bancos
+                      criados antes do registro de migrações)
+
+Uso (a partir da pasta nerd_hub.kv):
+    python benchmarks/verificar_migracoes.py
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+
+PASTA_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PASTA_APP)
+
+import database  # noqa: E402
+from migracoes import MIGRACOES, VERSAO_ATUAL, migrar, versao  # noqa: E402
+
+
+def esquema_original(caminho):
+    conn = sqlite3.connect(caminho)
+    conn.executescript("""
+        CREATE TABLE usuarios (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nome TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            senha TEXT NOT NULL
+        );
+        CREATE TABLE produtos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            price TEXT NOT NULL,
+            image TEXT,
+            categoria TEXT
+        );
+        CREATE TABLE carrinho (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            usuario_id INTEGER NOT NULL,
+            produto_id INTEGER NOT NULL,
+            quantidade INTEGER DEFAULT 1,
+            adicionado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(usuario_id, produto_id)
+        );
+        INSERT INTO usuarios (nome, email, senha) VALUES ('Antigo', 'antigo@email.com', 'x');
+        INSERT INTO produtos (title, price, image, categoria) VALUES
+            ('LEGO Antigo', 'R$ 1.349,90', 'nerd_hub.kv/imagens/imagem_produtos_home/lego_minecraft.jpg', 'lego'),
+            ('Funko Antigo', 'R$ 79,90', 'nerd_hub.kv/imagens/imagem_produtos_home/funko.jpg', 'starwars');
+    """)
+    conn.commit()
+    conn.close()
+
+
+def esquema_distribuido(caminho):
+    shutil.copyfile(os.path.join(PASTA_APP, "usuarios.db"), caminho)
+
+
+def esquema_pre_versionamento(caminho):
+    # O código anterior criava o mesmo esquema, sem gravar a versão
+    conn = sqlite3.connect(caminho)
+    with contextlib.redirect_stdout(io.StringIO()):
+        migrar(conn)
+    conn.execute("PRAGMA user_version = 0")
+    conn.close()
+
+
+FORMATOS = {
+    "vazio": lambda caminho: None,
+    "original": esquema_original,
+    "distribuido": esquema_distribuido,
+    "pre_versionamento": esquema_pre_versionamento,
+}
+
+
+def estrutura(caminho):
+    """Colunas de cada tabela e nomes de índices/triggers do banco"""
+    conn = sqlite3.connect(caminho)
+    objetos = conn.execute(
+        "SELECT type, name FROM sqlite_master WHERE name NOT LIKE 'sqlite_%' ORDER BY type, name").fetchall()
+    colunas = {
+        nome: sorted(linha[1] for linha in conn.execute(f"PRAGMA table_info({nome})"))
+        for tipo, nome in objetos if tipo == "table" and not nome.startswith("produtos_fts")
+    }
+    conn.close()
+    return colunas, sorted(nome for tipo, nome in objetos if tipo in ("index", "trigger"))
+
+
+def inicializar(caminho):
+    database.DB_PATH = caminho
+    with contextlib.redirect_stdout(io.StringIO()):
+        database.criar_tabelas()
+
+
+def verificar(nome, preparar, referencia):
+    pasta = tempfile.mkdtemp(prefix="nerdhub_migracao_")
+    caminho = os.path.join(pasta, "usuarios.db")
+    problemas = []
+    try:
+        preparar(caminho)
+        antes = 0
+        if os.path.exists(caminho):
+            conn = sqlite3.connect(caminho)
+            if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'produtos'").fetchone():
+                antes = conn.execute("SELECT COUNT(*) FROM produtos").fetchone()[0]
+            conn.close()
+
+        inicializar(caminho)
+
+        conn = sqlite3.connect(caminho)
+        if versao(conn) != VERSAO_ATUAL:
+            problemas.append(f"versão {versao(conn)} != {VERSAO_ATUAL}")
+        if referencia is not None and estrutura(caminho) != referencia:
+            problemas.append("esquema diferente do de um banco novo")
+        depois = conn.execute("SELECT COUNT(*) FROM produtos").fetchone()[0]
+        if antes and depois != antes:
+            problemas.append(f"produtos existentes alterados ({antes} -> {depois})")
+        if conn.execute("SELECT COUNT(*) FROM produtos WHERE price_cents = 0").fetchone()[0]:
+            problemas.append("price_cents não preenchido")
+        if conn.execute("SELECT COUNT(*) FROM produtos WHERE image LIKE 'nerd_hub.kv/%'").fetchone()[0]:
+            problemas.append("caminhos de imagem não corrigidos")
+        conn.close()
+        with contextlib.redirect_stdout(io.StringIO()):
+            encontrados = database.buscar_produtos("lego")
+        if not encontrados:
+            problemas.append("busca não encontra 'lego'")
+
+        # Segunda inicialização: só a leitura do user_version
+        comandos = []
+        database.obter_pool().definir_rastreio(comandos.append)
+        inicializar(caminho)
+        database.obter_pool().definir_rastreio(None)
+        if [" ".join(sql.split()) for sql in comandos] != ["PRAGMA user_version"]:
+            problemas.append(f"reinício executou {comandos}")
+        return problemas
+    finally:
+        database.obter_pool().fechar()
+        shutil.rmtree(pasta, ignore_errors=True)
+
+
+def verificar_falha():
+    """Uma migração que falha no meio é desfeita por inteiro"""
+    pasta = tempfile.mkdtemp(prefix="nerdhub_migracao_")
+    try:
+        conn = sqlite3.connect(os.path.join(pasta, "usuarios.db"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            migrar(conn)
+
+        def quebrada(cur):
+            cur.execute("CREATE TABLE pela_metade (id INTEGER)")
+            cur.execute("UPDATE produtos SET title = 'alterado'")
+            raise RuntimeError("falha simulada")
+
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                migrar(conn, MIGRACOES + [(VERSAO_ATUAL + 1, "quebrada", quebrada)])
+        except RuntimeError:
+            pass
+        problemas = []
+        if versao(conn) != VERSAO_ATUAL:
+            problemas.append(f"versão mudou para {versao(conn)}")
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'pela_metade'").fetchone():
+            problemas.append("tabela da migração falha ficou no banco")
+        if conn.execute("SELECT 1 FROM produtos WHERE title = 'alterado'").fetchone():
+            problemas.append("UPDATE da migração falha ficou no banco")
+        conn.close()
+        return problemas
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+
+def main():
+    # Referência: o esquema de um banco criado do zero
+    pasta = tempfile.mkdtemp(prefix="nerdhub_migracao_")
+    try:
+        inicializar(os.path.join(pasta, "usuarios.db"))
+        database.obter_pool().fechar()
+        referencia = estrutura(os.path.join(pasta, "usuarios.db"))
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    falhas = 0
+    for nome, preparar in FORMATOS.items():
+        problemas = verificar(nome, preparar, referencia)
+        falhas += bool(problemas)
+        print(f"{'✅' if not problemas else '❌'} {nome:<20}{'; '.join(problemas)}")
+
+    problemas = verificar_falha()
+    falhas += bool(problemas)
+    print(f"{'✅' if not problemas else '❌'} {'migração com falha':<20}{'; '.join(problemas)}")
+
+    if falhas:
+        sys.exit(1)
+    print(f"\nTodos os formatos chegam à versão {VERSAO_ATUAL}")
+
+
+if __name__ == "__main__":
+    main()
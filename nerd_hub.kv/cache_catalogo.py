@@ -0,0 +1,132 @@
+# cache_catalogo.py
+"""
+Cache do Catálogo em Memória
+============================
+Guarda o resultado das consultas de catálogo (páginas por categoria,
+listas completas e detalhes por id) para que navegar entre Home,
+categorias e detalhes não volte ao SQLite a cada tela.
+
+O cache é preenchido sob demanda e inteiro invalidado por qualquer
+escrita no catálogo feita pelo database.py (adicionar_produto, carga
+inicial, migrações) ou pela troca de banco (DB_PATH).
+Cada espaço ("pagina", "produto"...) guarda no máximo `limite` entradas e
+descarta as menos usadas recentemente: o scroll infinito por um catálogo
+de 100 mil produtos não faz a memória crescer sem parar.
+
+Uso:
+    produto = cache.obter("produto", produto_id, lambda: consultar(produto_id))
+    produtos = cache.obter_varios("produto", ids, consultar_varios)  # {id: linha}
+    pagina = cache.consultar("pagina", chave)  # só o que já está em memória (ou None)
+    cache.invalidar()
+    cache.geracao  # muda a cada invalidar(): a tela sabe se o que mostra ficou velho
+    cache.estatisticas()  # {'acertos': ..., 'falhas': ..., 'entradas': ...}
+"""
+
+import threading
+from collections import OrderedDict
+
+# Entradas guardadas por espaço (páginas de 20 produtos, linhas de detalhe...)
+LIMITE_ENTRADAS = 512
+
+_AUSENTE = object()
+
+
+class CacheCatalogo:
+    """Cache LRU de consultas do catálogo, seguro para múltiplas threads"""
+
+    def __init__(self, limite=LIMITE_ENTRADAS):
+        self.limite = limite
+        self._dados = {}  # espaço -> OrderedDict (chave -> valor), do mais antigo ao mais recente
+        self._lock = threading.Lock()
+        self._geracao = 0
+        self.acertos = 0
+        self.falhas = 0
+
+    def _buscar(self, espaco, chave):
+        """Valor guardado (marcado como o mais recente) ou _AUSENTE; chamar com o lock"""
+        tabela = self._dados.get(espaco)
+        if tabela is None or chave not in tabela:
+            return _AUSENTE
+        tabela.move_to_end(chave)
+        return tabela[chave]
+
+    def _guardar(self, espaco, valores, geracao):
+        """Guarda {chave: valor} se não houve invalidação; chamar com o lock"""
+        # Se houve invalidação durante a consulta, o valor pode estar velho
+        if geracao != self._geracao:
+            return
+        tabela = self._dados.setdefault(espaco, OrderedDict())
+        for chave, valor in valores.items():
+            tabela[chave] = valor
+            tabela.move_to_end(chave)
+        while len(tabela) > self.limite:
+            tabela.popitem(last=False)
+
+    def obter(self, espaco, chave, carregar):
+        """Retorna o valor em cache ou chama carregar() e guarda o resultado"""
+        with self._lock:
+            valor = self._buscar(espaco, chave)
+            if valor is not _AUSENTE:
+                self.acertos += 1
+                return valor
+            self.falhas += 1
+            geracao = self._geracao
+
+        # A consulta roda fora do lock para não bloquear outras leituras
+        valor = carregar()
+
+        with self._lock:
+            self._guardar(espaco, {chave: valor}, geracao)
+        return valor
+
+    def obter_varios(self, espaco, chaves, carregar):
+        """Como obter() para várias chaves: carregar(faltantes) devolve {chave: valor}
+        só das que faltam (as ausentes do resultado ficam guardadas como None)"""
+        with self._lock:
+            valores, faltantes = {}, []
+            for chave in chaves:
+                valor = self._buscar(espaco, chave)
+                if valor is _AUSENTE:
+                    faltantes.append(chave)
+                else:
+                    valores[chave] = valor
+            self.acertos += len(valores)
+            self.falhas += len(faltantes)
+            geracao = self._geracao
+
+        if faltantes:
+            carregados = carregar(faltantes)
+            novos = {chave: carregados.get(chave) for chave in faltantes}
+            with self._lock:
+                self._guardar(espaco, novos, geracao)
+            valores.update(novos)
+        return valores
+
+    def consultar(self, espaco, chave, padrao=None):
+        """Valor já guardado, sem nunca carregar (para a interface decidir se espera)"""
+        with self._lock:
+            valor = self._buscar(espaco, chave)
+            if valor is _AUSENTE:
+                return padrao
+            self.acertos += 1
+            return valor
+
+    @property
+    def geracao(self):
+        """Contador de invalidações (igual = nada mudou no catálogo desde então)"""
+        return self._geracao
+
+    def invalidar(self):
+        """Descarta tudo (chamado após qualquer escrita no catálogo)"""
+        with self._lock:
+            self._dados.clear()
+            self._geracao += 1
+
+    def estatisticas(self):
+        """Contadores de acertos/falhas e quantidade de entradas guardadas"""
+        with self._lock:
+            return {
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "entradas": sum(len(tabela) for tabela in self._dados.values()),
+            }
@@ -0,0 +1,173 @@
+# conexao.py
+"""
+Gerenciador de conexões SQLite
+==============================
+Mantém um pool de conexões "quentes" com o banco, em vez de abrir e fechar
+uma conexão nova a cada chamada do database.py.
+
+Cada conexão é aberta uma única vez com:
+- journal_mode WAL (leituras não bloqueiam escritas)
+- PRAGMAs ajustados (synchronous, cache_size, mmap_size, temp_store)
+- cache de prepared statements do módulo sqlite3 (cached_statements)
+
+Uso:
+    with pool.conexao() as conn:
+        conn.execute("SELECT ...")
+
+O bloco faz commit ao sair normalmente e rollback se uma exceção escapar.
+Chamadas aninhadas na mesma thread reutilizam a mesma conexão.
+
+definir_medicao(callback) mede cada bloco externo: ao sair, o callback
+recebe o tempo do bloco (s) e quantos comandos SQL ele executou (usado
+pelo painel de desempenho, ver desempenho.py).
+
+definir_rastreador(rastreador) abre as conexões como ConexaoRastreada,
+que mede o tempo e as linhas de cada comando (ver rastreio_sql.py).
+"""
+
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from rastreio_sql import ConexaoRastreada
+
+# Quantidade máxima de conexões ociosas guardadas no pool
+TAMANHO_POOL = 4
+
+# Tamanho do cache de prepared statements por conexão
+CACHE_STATEMENTS = 256
+
+PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -8000",       # ~8 MB de páginas em cache
+    "PRAGMA mmap_size = 67108864",     # 64 MB mapeados em memória
+    "PRAGMA temp_store = MEMORY",
+)
+
+
+class PoolConexoes:
+    """Pool de conexões SQLite seguro para múltiplas threads"""
+
+    def __init__(self, caminho, tamanho=TAMANHO_POOL):
+        self.caminho = caminho
+        self.tamanho = tamanho
+        self._livres = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._wal_configurado = False
+        self._rastreio = None
+        self._medicao = None
+        self._rastreador = None
+
+    def _abrir(self):
+        """Abre e configura uma nova conexão"""
+        conn = sqlite3.connect(
+            self.caminho,
+            check_same_thread=False,
+            cached_statements=CACHE_STATEMENTS,
+            factory=ConexaoRastreada if self._rastreador else sqlite3.Connection,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.set_trace_callback(self._callback_sqlite())
+        if self._rastreador:
+            conn.rastreador = self._rastreador
+
+        # journal_mode é persistente no arquivo: basta configurar uma vez
+        if not self._wal_configurado:
+            conn.execute("PRAGMA journal_mode = WAL")
+            self._wal_configurado = True
+
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _callback_sqlite(self):
+        """Trace callback das conexões (None quando ninguém observa o SQL)"""
+        return self._observar if self._medicao or self._rastreador else self._rastreio
+
+    def _observar(self, sql):
+        self._local.comandos += 1
+        if self._rastreador:
+            self._rastreador.comando(sql)
+        if self._rastreio:
+            self._rastreio(sql)
+
+    def _aplicar_rastreio(self):
+        callback = self._callback_sqlite()
+        with self._lock:
+            for conn in self._livres:
+                conn.set_trace_callback(callback)
+
+    def definir_rastreio(self, callback):
+        """Registra um callback que recebe cada SQL executado (None desliga)"""
+        self._rastreio = callback
+        self._aplicar_rastreio()
+
+    def definir_medicao(self, callback):
+        """Registra callback(segundos, comandos) chamado ao fim de cada bloco (None desliga)"""
+        self._medicao = callback
+        self._aplicar_rastreio()
+
+    def definir_rastreador(self, rastreador):
+        """Mede cada comando com um RastreadorSQL (None desliga)
+
+        As conexões ociosas são fechadas: as próximas já abrem com (ou sem)
+        a ConexaoRastreada; as emprestadas agora são fechadas ao voltar.
+        """
+        self._rastreador = rastreador
+        self.fechar()
+
+    def _obter(self):
+        with self._lock:
+            if self._livres:
+                return self._livres.pop()
+        return self._abrir()
+
+    def _devolver(self, conn):
+        with self._lock:
+            if len(self._livres) < self.tamanho and getattr(conn, "rastreador", None) is self._rastreador:
+                self._livres.append(conn)
+                return
+        conn.close()
+
+    @contextmanager
+    def conexao(self):
+        """Empresta uma conexão do pool durante o bloco 'with'"""
+        atual = getattr(self._local, "conn", None)
+        if atual is not None:
+            # Chamada aninhada: reutiliza a conexão da thread
+            self._local.profundidade += 1
+            try:
+                yield atual
+            finally:
+                self._local.profundidade -= 1
+            return
+
+        medicao = self._medicao
+        inicio = time.perf_counter() if medicao else 0
+        self._local.comandos = 0
+        conn = self._obter()
+        self._local.conn = conn
+        self._local.profundidade = 1
+        try:
+            yield conn
+            if conn.in_transaction:
+                conn.commit()
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            self._local.profundidade = 0
+            self._devolver(conn)
+            if medicao:
+                medicao(time.perf_counter() - inicio, self._local.comandos)
+
+    def fechar(self):
+        """Fecha todas as conexões ociosas do pool"""
+        with self._lock:
+            livres, self._livres = self._livres, []
+        for conn in livres:
+            conn.close()
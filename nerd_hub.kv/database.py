@@ -1,266 +1,195 @@
 import sqlite3
-import hashlib
 import os
+import re
+
+from conexao import PoolConexoes
+from linha_do_tempo import trecho
+from rastreio_sql import LIMITE_LENTO_MS, RastreadorSQL
+from cache_catalogo import CacheCatalogo
+from migracoes import migrar, VERSAO_ATUAL
+from senhas import gerar_hash, conferir, conferir_ficticio, precisa_atualizar
+from precos import formatar_brl, texto_para_centavos
+from registro import obter_logger
+
+log = obter_logger(__name__)
 
 # CORREÇÃO: Caminho absoluto para o banco na mesma pasta
-DB_PATH = os.path.join(os.path.dirname(__file__), "usuarios.db")
+# (NERDHUB_DB_PATH permite apontar para outro banco, ex.: benchmarks)
+DB_PATH = os.environ.get("NERDHUB_DB_PATH") or os.path.join(os.path.dirname(__file__), "usuarios.db")
+
+_pool = None
+
+# Rastreio de SQL (ver rastreio_sql.py): desligado, a não ser por
+# ativar_rastreio_sql() ou NERDHUB_SQL_RASTREIO=1
+rastreador_sql = None
+
+# Cache de consultas do catálogo (invalidado por escritas em produtos)
+cache_catalogo = CacheCatalogo()
+
+def obter_pool():
+    """Retorna o pool de conexões do banco atual (recriado se DB_PATH mudar)"""
+    global _pool
+    if _pool is None or _pool.caminho != DB_PATH:
+        if _pool is not None:
+            _pool.fechar()
+        _pool = PoolConexoes(DB_PATH)
+        cache_catalogo.invalidar()  # outro banco, outro catálogo
+        if rastreador_sql is None and os.environ.get("NERDHUB_SQL_RASTREIO", "").strip() in ("1", "true", "sim"):
+            ativar_rastreio_sql(float(os.environ.get("NERDHUB_SQL_LENTO_MS") or LIMITE_LENTO_MS))
+        elif rastreador_sql is not None:
+            _pool.definir_rastreador(rastreador_sql)
+    return _pool
+
+def ativar_rastreio_sql(limite_ms=LIMITE_LENTO_MS, arquivo=None):
+    """Passa a medir cada comando SQL; os acima de limite_ms vão para o log
+    de SQL lento (padrão: sql_lento.log ao lado do banco). Retorna o
+    RastreadorSQL, com resumo() e estatisticas()."""
+    global rastreador_sql
+    if rastreador_sql is not None:
+        rastreador_sql.fechar()
+    arquivo = arquivo or os.path.join(os.path.dirname(os.path.abspath(DB_PATH)), "sql_lento.log")
+    rastreador_sql = RastreadorSQL(limite_ms, arquivo)
+    obter_pool().definir_rastreador(rastreador_sql)
+    log.info("🔎 Rastreio de SQL ativado (lento: >= %.0f ms, log em %s)", limite_ms, arquivo)
+    return rastreador_sql
+
+def desativar_rastreio_sql():
+    """Volta às conexões sem medição; retorna o rastreador que estava ativo"""
+    global rastreador_sql
+    rastreador, rastreador_sql = rastreador_sql, None
+    if rastreador is not None:
+        rastreador.fechar()
+        obter_pool().definir_rastreador(None)
+    return rastreador
 
 def conectar():
-    """Conecta ao banco de usuários"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Empresta uma conexão do pool - usar com 'with conectar() as conn:'"""
+    return obter_pool().conexao()
 
 def criar_tabelas():
-    """Cria todas as tabelas necessárias - ATUALIZADA COM MIGRAÇÃO"""
-    conn = conectar()
-    cur = conn.cursor()
-    
-    # Tabela de usuários - ATUALIZADA COM CAMPOS ADICIONAIS
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS usuarios (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        nome TEXT NOT NULL,
-        email TEXT UNIQUE NOT NULL,
-        senha TEXT NOT NULL,
-        telefone TEXT,
-        data_nascimento TEXT,
-        data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-    
-    # Tabela de produtos
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS produtos (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        title TEXT NOT NULL,
-        price TEXT NOT NULL,
-        image TEXT,
-        categoria TEXT,
-        descricao TEXT DEFAULT 'Produto de alta qualidade para verdadeiros nerds! Este item é perfeito para colecionadores e fãs que buscam itens exclusivos e autênticos.'
-    )
-    """)
-
-    conn.commit()
-    
-    # MIGRAÇÃO: Adiciona coluna descricao se não existir (para bancos antigos)
-    try:
-        cur.execute("SELECT descricao FROM produtos LIMIT 1")
-    except sqlite3.OperationalError:
-        print("🔄 Migrando banco: adicionando coluna 'descricao'...")
-        cur.execute("""ALTER TABLE produtos ADD COLUMN descricao TEXT DEFAULT 
-                    'Produto de alta qualidade para verdadeiros nerds! Este item é perfeito para colecionadores e fãs que buscam itens exclusivos e autênticos.'""")
-        conn.commit()
-        print("✅ Coluna 'descricao' adicionada com sucesso!")
-    
-    # MIGRAÇÃO: Adiciona colunas de perfil se não existirem
-    try:
-        cur.execute("SELECT telefone FROM usuarios LIMIT 1")
-    except sqlite3.OperationalError:
-        print("🔄 Migrando banco: adicionando colunas de perfil...")
-        cur.execute("ALTER TABLE usuarios ADD COLUMN telefone TEXT")
-        cur.execute("ALTER TABLE usuarios ADD COLUMN data_nascimento TEXT")
-        cur.execute("ALTER TABLE usuarios ADD COLUMN data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
-        conn.commit()
-        print("✅ Colunas de perfil adicionadas com sucesso!")
-    
-    conn.close()
-    print(f"✅ Todas as tabelas criadas/verificadas em: {DB_PATH}")
-    
-    # Cria tabela carrinho separadamente
-    criar_tabela_carrinho()
-    
-    # Corrige caminhos de imagens (para migração de bancos antigos)
-    corrigir_caminhos_imagens()
-    
-    # Carrega produtos iniciais se a tabela estiver vazia
-    carregar_produtos_iniciais()
-
-def criar_tabela_carrinho():
-    """Cria tabela do carrinho se não existir"""
-    conn = conectar()
-    cur = conn.cursor()
-    
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS carrinho (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        usuario_id INTEGER NOT NULL,
-        produto_id INTEGER NOT NULL,
-        quantidade INTEGER DEFAULT 1,
-        adicionado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (usuario_id) REFERENCES usuarios (id),
-        FOREIGN KEY (produto_id) REFERENCES produtos (id),
-        UNIQUE(usuario_id, produto_id)
-    )
-    """)
-    
-    conn.commit()
-    conn.close()
-    print("✅ Tabela carrinho criada/verificada")
-
-def carregar_produtos_iniciais():
-    """Carrega produtos iniciais na tabela se estiver vazia"""
-    conn = conectar()
-    cur = conn.cursor()
-    
-    # Verifica se já existem produtos
-    cur.execute("SELECT COUNT(*) FROM produtos")
-    count = cur.fetchone()[0]
-    
-    if count == 0:
-        print("🔄 Carregando produtos iniciais no banco...")
-        
-        produtos_iniciais = [
-            # Produtos Gerais - CAMINHOS CORRIGIDOS PARA ANDROID
-            ("FORZA - Xbox Series X", "R$ 179,00", "imagens/imagem_produtos_home/forza.jpg", "xbox"),
-            ("LEGO Minecraft - Aventura", "R$ 1.349,90", "imagens/imagem_produtos_home/lego_minecraft.jpg", "lego"),
-            ("PlayStation 5 Pro", "R$ 6.509,00", "imagens/imagem_produtos_home/ps5.jpg", "playstation"),
-            ("PlayStation Portal", "R$ 1.349,90", "imagens/imagem_produtos_home/portal.jpg", "playstation"),
-            ("Funko Pop! Star Wars", "R$ 389,90", "imagens/imagem_produtos_home/funko.jpg", "starwars"),
-            ("Camiseta Marvel Avengers", "R$ 82,35", "imagens/imagem_produtos_home/camiseta_marvel.jpg", "marvel"),
-            ("Pelúcia Chewbacca", "R$ 141,50", "imagens/imagem_produtos_home/chewbacca.jpg", "starwars"),
-            ("LEGO Star Wars - 75257", "R$ 201,00", "imagens/imagem_produtos_home/lego_starwars.jpg", "starwars"),
-            
-            # Produtos Disney
-            ("Pelúcia Mickey Mouse - Disney", "R$ 89,90", "imagens/imagem_produtos_home/mickey.jpg", "disney"),
-            ("LEGO Disney Castle - 43222", "R$ 1.299,90", "imagens/imagem_produtos_home/lego_castle.jpg", "disney"),
-            ("Funko Pop! Mickey Mouse - Disney", "R$ 79,90", "imagens/imagem_produtos_home/funko_mickey.jpg", "disney"),
-            ("Camiseta Mickey Classic - Disney", "R$ 59,90", "imagens/imagem_produtos_home/camiseta_mickey.jpg", "disney"),
-            
-            # Produtos Marvel
-            ("Action Figure Homem de Ferro", "R$ 129,90", "imagens/imagem_produtos_home/camiseta_marvel.jpg", "marvel"),
-            ("Camiseta Avengers", "R$ 79,90", "imagens/imagem_produtos_home/camiseta_marvel.jpg", "marvel"),
-            
-            # Produtos Star Wars
-            ("Action Figure Darth Vader", "R$ 149,90", "imagens/imagem_produtos_home/darth_vader.jpg", "starwars"),
-            ("LEGO Millennium Falcon", "R$ 899,90", "imagens/imagem_produtos_home/millennium_falcon.jpg", "starwars"),
-            
-            # Produtos PlayStation
-            ("Controle DualSense PS5", "R$ 449,00", "imagens/imagem_produtos_home/ps5.jpg", "playstation"),
-            ("Headset PlayStation Pulse 3D", "R$ 599,00", "imagens/imagem_produtos_home/portal.jpg", "playstation"),
-            
-            # Produtos Xbox
-            ("Controle Xbox Series X", "R$ 499,00", "imagens/imagem_produtos_home/forza.jpg", "xbox"),
-            ("Headset Xbox Wireless", "R$ 699,00", "imagens/imagem_produtos_home/forza.jpg", "xbox"),
-        ]
-        
-        for produto in produtos_iniciais:
-            cur.execute("INSERT INTO produtos (title, price, image, categoria) VALUES (?, ?, ?, ?)", produto)
-            print(f"   ✅ {produto[0]}")
-        
-        conn.commit()
-        print(f"📦 {len(produtos_iniciais)} produtos carregados no banco")
-    else:
-        print(f"✅ {count} produtos já existem no banco")
-    
-    conn.close()
+    """Cria/atualiza o esquema do banco (ver migracoes.py)
+
+    Um banco já na versão atual só lê o PRAGMA user_version.
+    """
+    with conectar() as conn:
+        aplicadas = migrar(conn)
+    
+    if aplicadas:
+        # Migrações podem ter alterado produtos e categorias
+        cache_catalogo.invalidar()
+        log.info("✅ Banco atualizado para a versão %s em: %s", VERSAO_ATUAL, DB_PATH)
+    return aplicadas
+
+def inicializar_banco():
+    """Tudo que o app faz no banco ao iniciar - só verificações de tempo constante
+    (user_version e sondagens 'LIMIT 1'), nunca COUNT(*) ou listagens completas
+    """
+    with trecho("criar_tabelas"):
+        criar_tabelas()
+    with trecho("carregar_usuario_teste"):
+        carregar_usuario_teste()
 
 # =============================================================================
 # FUNÇÕES DE USUÁRIOS - CORRIGIDAS E ATUALIZADAS
 # =============================================================================
 
+# As funções abaixo que calculam hash de senha (scrypt, dezenas de ms) devem
+# rodar no executor de senhas (executor_banco.com_senha), não no executor do banco
+
 def hash_senha(senha_plain):
-    """Gera o hash SHA-256 da senha em texto puro."""
-    return hashlib.sha256(senha_plain.encode("utf-8")).hexdigest()
+    """Gera o hash scrypt (com salt) da senha em texto puro - ver senhas.py"""
+    return gerar_hash(senha_plain)
 
 def cadastrar_usuario(nome, email, senha_plain):
     """Cadastra um novo usuário - CORRIGIDA"""
-    conn = conectar()
-    cur = conn.cursor()
+    # Hash calculado antes de pegar a conexão
+    senha_hash = hash_senha(senha_plain)
+    with conectar() as conn:
+        cur = conn.cursor()
     
-    try:
-        # CORREÇÃO: Usando hash desde o início
-        senha_hash = hash_senha(senha_plain)
-        cur.execute("""
-            INSERT INTO usuarios (nome, email, senha)
-            VALUES (?, ?, ?)
-        """, (nome, email, senha_hash))
+        try:
+            cur.execute("""
+                INSERT INTO usuarios (nome, email, senha)
+                VALUES (?, ?, ?)
+            """, (nome, email, senha_hash))
             
-        conn.commit()
-        print(f"✅ Usuário cadastrado: {nome} - {email}")
-        return True
-    except sqlite3.IntegrityError:
-        print(f"❌ E-mail já cadastrado: {email}")
-        return False
-    except Exception as e:
-        print(f"💥 Erro inesperado no cadastro: {e}")
-        return False
-    finally:
-        conn.close()
+            conn.commit()
+            log.info("✅ Usuário cadastrado: %s - %s", nome, email)
+            return True
+        except sqlite3.IntegrityError:
+            log.debug("❌ E-mail já cadastrado: %s", email)
+            return False
+        except Exception as e:
+            log.error("💥 Erro inesperado no cadastro: %s", e)
+            return False
 
 def verificar_login(email, senha_plain):
-    """Verifica se o login é válido - CORRIGIDA E TESTADA"""
-    conn = conectar()
-    cur = conn.cursor()
-    
-    # Gera o hash da senha fornecida
-    senha_hash = hash_senha(senha_plain)
-    print(f"🔐 Verificando login: {email}")
-    print(f"🔐 Senha fornecida (texto): {senha_plain}")
-    print(f"🔐 Hash da senha fornecida: {senha_hash}")
-    
-    # PRIMEIRO: Busca o usuário apenas pelo email para debug
-    cur.execute("SELECT id, nome, email, senha FROM usuarios WHERE email = ?", (email,))
-    usuario = cur.fetchone()
-    
-    if usuario:
-        print(f"✅ Usuário encontrado: {usuario[1]} ({usuario[2]})")
-        print(f"🔐 Hash armazenado no banco: {usuario[3]}")
-        print(f"🔐 Hash da senha fornecida: {senha_hash}")
-        print(f"🔐 Senhas coincidem? {usuario[3] == senha_hash}")
-        
-        # Agora verifica se a senha está correta
-        if usuario[3] == senha_hash:
-            print(f"✅ Login bem-sucedido! Usuário: {usuario[1]}")
-            conn.close()
-            return (usuario[0], usuario[1], usuario[2])
-        else:
-            print("❌ Senha incorreta!")
-            conn.close()
-            return None
-    else:
-        print("❌ Usuário não encontrado!")
-        conn.close()
+    """Verifica se o login é válido; atualiza hashes antigos (SHA-256) para scrypt"""
+    log.debug("🔐 Verificando login: %s", email)
+    with conectar() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT id, nome, email, senha FROM usuarios WHERE email = ?", (email,))
+        usuario = cur.fetchone()
+    
+    if not usuario:
+        # Mesmo scrypt de uma senha errada: o tempo não revela se o e-mail existe
+        conferir_ficticio(senha_plain)
+        log.debug("❌ Usuário não encontrado!")
         return None
-
-def carregar_usuario_teste():
-    """Carrega um usuário de teste - CORRIGIDA"""
-    conn = conectar()
-    cur = conn.cursor()
     
-    cur.execute("SELECT COUNT(*) FROM usuarios")
-    count = cur.fetchone()[0]
+    # O scrypt roda fora do bloco acima: nenhuma conexão fica presa durante o cálculo
+    if not conferir(senha_plain, usuario[3]):
+        log.debug("❌ Senha incorreta!")
+        return None
     
-    if count == 0:
-        print("👤 Criando usuário de teste...")
-        usuario_teste = ("Usuário Teste", "teste@email.com", "123456")
-        try:
-            senha_hash = hash_senha(usuario_teste[2])
-            cur.execute("INSERT INTO usuarios (nome, email, senha) VALUES (?, ?, ?)", 
-                       (usuario_teste[0], usuario_teste[1], senha_hash))
+    if precisa_atualizar(usuario[3]):
+        # Senha acabou de ser confirmada: troca o hash antigo pelo atual
+        novo_hash = gerar_hash(senha_plain)
+        with conectar() as conn:
+            conn.execute("UPDATE usuarios SET senha = ? WHERE id = ? AND senha = ?",
+                         (novo_hash, usuario[0], usuario[3]))
             conn.commit()
-            print("✅ Usuário de teste criado com sucesso!")
-            print(f"👤 Email: teste@email.com")
-            print(f"🔐 Senha: 123456")
-        except Exception as e:
-            print(f"❌ Erro ao criar usuário de teste: {e}")
+        log.info("🔐 Hash de senha do usuário %s atualizado", usuario[0])
+    
+    log.info("✅ Login bem-sucedido! Usuário: %s", usuario[1])
+    return (usuario[0], usuario[1], usuario[2])
+
+def carregar_usuario_teste():
+    """Carrega um usuário de teste se o banco não tiver nenhum usuário"""
+    with conectar() as conn:
+        cur = conn.cursor()
+    
+        # Sondagem de existência: para no primeiro registro (COUNT(*) leria a tabela toda)
+        cur.execute("SELECT 1 FROM usuarios LIMIT 1")
+    
+        if cur.fetchone() is None:
+            log.info("👤 Criando usuário de teste...")
+            usuario_teste = ("Usuário Teste", "teste@email.com", "123456")
+            try:
+                senha_hash = hash_senha(usuario_teste[2])
+                cur.execute("INSERT INTO usuarios (nome, email, senha) VALUES (?, ?, ?)", 
+                           (usuario_teste[0], usuario_teste[1], senha_hash))
+                conn.commit()
+                log.info("✅ Usuário de teste criado com sucesso!")
+                log.info("👤 Email: teste@email.com")
+                log.info("🔐 Senha: 123456")
+            except Exception as e:
+                log.error("❌ Erro ao criar usuário de teste: %s", e)
     
-    conn.close()
 
 def listar_usuarios():
     """Lista todos os usuários"""
-    conn = conectar()
-    cur = conn.cursor()
-    cur.execute("SELECT id, nome, email, telefone, data_nascimento FROM usuarios")
-    usuarios = cur.fetchall()
-    conn.close()
+    with conectar() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT id, nome, email, telefone, data_nascimento FROM usuarios")
+        usuarios = cur.fetchall()
     
-    print("=== 👥 USUÁRIOS NO BANCO ===")
-    for usuario in usuarios:
-        print(f"   👤 {usuario[1]} - {usuario[2]} - Tel: {usuario[3]} - Nasc: {usuario[4]}")
-    print("=============================")
+        log.debug("=== 👥 USUÁRIOS NO BANCO ===")
+        for usuario in usuarios:
+            log.debug("   👤 %s - %s - Tel: %s - Nasc: %s", usuario[1], usuario[2], usuario[3], usuario[4])
+        log.debug("=============================")
     
-    return usuarios
+        return usuarios
 
 # =============================================================================
 # FUNÇÕES PARA PERFIL DO USUÁRIO (ATUALIZADAS E CORRIGIDAS)
@@ -268,291 +197,421 @@ def listar_usuarios():
 
 def get_user_by_id(user_id):
     """Busca usuário pelo ID com todas as informações"""
-    conn = conectar()
-    cur = conn.cursor()
-    cur.execute("SELECT id, nome, email, senha, telefone, data_nascimento FROM usuarios WHERE id = ?", (user_id,))
-    usuario = cur.fetchone()
-    conn.close()
+    with conectar() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT id, nome, email, senha, telefone, data_nascimento FROM usuarios WHERE id = ?", (user_id,))
+        usuario = cur.fetchone()
     
-    if usuario:
-        print(f"✅ Usuário encontrado: {usuario[1]} - Tel: {usuario[4]} - Nasc: {usuario[5]}")
-    else:
-        print(f"❌ Usuário {user_id} não encontrado")
+        if usuario:
+            log.debug("✅ Usuário encontrado: %s - Tel: %s - Nasc: %s", usuario[1], usuario[4], usuario[5])
+        else:
+            log.debug("❌ Usuário %s não encontrado", user_id)
     
-    return usuario
+        return usuario
 
 def update_user_profile(user_id, nome=None, email=None, telefone=None, data_nascimento=None):
     """Atualiza informações do perfil do usuário - CORRIGIDA"""
-    conn = conectar()
-    cur = conn.cursor()
-    
-    try:
-        # DEBUG: Mostra os valores que estão sendo recebidos
-        print(f"🔄 Atualizando perfil do usuário {user_id}:")
-        print(f"   Nome: {nome}")
-        print(f"   Email: {email}")
-        print(f"   Telefone: {telefone}")
-        print(f"   Data Nascimento: {data_nascimento}")
+    with conectar() as conn:
+        cur = conn.cursor()
+    
+        try:
+            # DEBUG: Mostra os valores que estão sendo recebidos
+            log.debug("🔄 Atualizando perfil do usuário %s:", user_id)
+            log.debug("   Nome: %s", nome)
+            log.debug("   Email: %s", email)
+            log.debug("   Telefone: %s", telefone)
+            log.debug("   Data Nascimento: %s", data_nascimento)
         
-        # Constrói a query dinamicamente baseada nos campos fornecidos
-        campos = []
-        valores = []
+            # Constrói a query dinamicamente baseada nos campos fornecidos
+            campos = []
+            valores = []
         
-        if nome is not None:
-            campos.append("nome = ?")
-            valores.append(nome)
+            if nome is not None:
+                campos.append("nome = ?")
+                valores.append(nome)
         
-        if email is not None:
-            campos.append("email = ?")
-            valores.append(email)
+            if email is not None:
+                campos.append("email = ?")
+                valores.append(email)
         
-        if telefone is not None:
-            campos.append("telefone = ?")
-            valores.append(telefone)
+            if telefone is not None:
+                campos.append("telefone = ?")
+                valores.append(telefone)
         
-        if data_nascimento is not None:
-            campos.append("data_nascimento = ?")
-            valores.append(data_nascimento)
+            if data_nascimento is not None:
+                campos.append("data_nascimento = ?")
+                valores.append(data_nascimento)
         
-        if not campos:
-            print("❌ Nenhum campo para atualizar")
-            return False
+            if not campos:
+                log.debug("❌ Nenhum campo para atualizar")
+                return False
         
-        valores.append(user_id)
-        query = f"UPDATE usuarios SET {', '.join(campos)} WHERE id = ?"
+            valores.append(user_id)
+            query = f"UPDATE usuarios SET {', '.join(campos)} WHERE id = ?"
         
-        print(f"🔧 Executando query: {query}")
-        print(f"🔧 Valores: {valores}")
+            log.debug("🔧 Executando query: %s", query)
+            log.debug("🔧 Valores: %s", valores)
         
-        cur.execute(query, valores)
-        conn.commit()
+            cur.execute(query, valores)
+            conn.commit()
         
-        print(f"✅ Perfil do usuário {user_id} atualizado com sucesso!")
-        print(f"   📝 Campos atualizados: {', '.join(campos)}")
-        return True
+            log.info("✅ Perfil do usuário %s atualizado com sucesso!", user_id)
+            log.debug("   📝 Campos atualizados: %s", ', '.join(campos))
+            return True
         
-    except sqlite3.IntegrityError:
-        print(f"❌ E-mail já está em uso por outro usuário")
-        return False
-    except Exception as e:
-        print(f"❌ Erro ao atualizar perfil: {e}")
-        return False
-    finally:
-        conn.close()
+        except sqlite3.IntegrityError:
+            log.debug("❌ E-mail já está em uso por outro usuário")
+            return False
+        except Exception as e:
+            log.error("❌ Erro ao atualizar perfil: %s", e)
+            return False
 
 def update_password(user_id, new_password):
     """Atualiza a senha do usuário - CORRIGIDA"""
-    conn = conectar()
-    cur = conn.cursor()
+    senha_hash = hash_senha(new_password)
+    with conectar() as conn:
+        cur = conn.cursor()
     
-    try:
-        senha_hash = hash_senha(new_password)
-        print(f"🔄 Atualizando senha do usuário {user_id}")
-        print(f"🔐 Nova senha (hash): {senha_hash}")
+        try:
+            log.debug("🔄 Atualizando senha do usuário %s", user_id)
         
-        cur.execute("UPDATE usuarios SET senha = ? WHERE id = ?", (senha_hash, user_id))
-        conn.commit()
+            cur.execute("UPDATE usuarios SET senha = ? WHERE id = ?", (senha_hash, user_id))
+            conn.commit()
         
-        print(f"✅ Senha atualizada para usuário {user_id}")
-        return True
-    except Exception as e:
-        print(f"❌ Erro ao atualizar senha: {e}")
-        return False
-    finally:
-        conn.close()
+            log.info("✅ Senha atualizada para usuário %s", user_id)
+            return True
+        except Exception as e:
+            log.error("❌ Erro ao atualizar senha: %s", e)
+            return False
 
 def get_user_by_email(email):
     """Busca usuário pelo email"""
-    conn = conectar()
-    cur = conn.cursor()
-    cur.execute("SELECT id, nome, email FROM usuarios WHERE email = ?", (email,))
-    usuario = cur.fetchone()
-    conn.close()
-    return usuario
+    with conectar() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT id, nome, email FROM usuarios WHERE email = ?", (email,))
+        usuario = cur.fetchone()
+        return usuario
 
 # =============================================================================
 # FUNÇÕES PARA CARRINHO
 # =============================================================================
 
+# Soma a quantidade na linha existente: mantém id e adicionado_em (ordem do carrinho)
+SQL_ADICIONAR_CARRINHO = """
+    INSERT INTO carrinho (usuario_id, produto_id, quantidade)
+    VALUES (?, ?, ?)
+    ON CONFLICT(usuario_id, produto_id)
+    DO UPDATE SET quantidade = quantidade + excluded.quantidade
+"""
+
 def adicionar_ao_carrinho_db(usuario_id, produto_id, quantidade=1):
-    """Adiciona produto ao carrinho do usuário"""
-    conn = conectar()
-    cur = conn.cursor()
-    
-    try:
-        # Usa INSERT OR REPLACE para atualizar quantidade se já existir
-        cur.execute("""
-            INSERT OR REPLACE INTO carrinho (usuario_id, produto_id, quantidade)
-            VALUES (?, ?, COALESCE((SELECT quantidade FROM carrinho WHERE usuario_id = ? AND produto_id = ?) + 1, 1))
-        """, (usuario_id, produto_id, usuario_id, produto_id))
-        
-        conn.commit()
-        print(f"✅ Produto {produto_id} adicionado ao carrinho do usuário {usuario_id}")
-        return True
-    except Exception as e:
-        print(f"❌ Erro ao adicionar ao carrinho: {e}")
-        return False
-    finally:
-        conn.close()
+    """Adiciona produto ao carrinho do usuário (ou soma à quantidade)"""
+    return adicionar_lote_ao_carrinho_db([(usuario_id, produto_id, quantidade)])
+
+def adicionar_lote_ao_carrinho_db(adicoes):
+    """Grava várias adições [(usuario_id, produto_id, quantidade), ...] numa única transação"""
+    adicoes = list(adicoes)
+    with conectar() as conn:
+        try:
+            conn.executemany(SQL_ADICIONAR_CARRINHO, adicoes)
+            conn.commit()
+            log.debug("✅ %s produto(s) adicionado(s) ao carrinho", len(adicoes))
+            return True
+        except Exception as e:
+            conn.rollback()
+            log.error("❌ Erro ao adicionar ao carrinho: %s", e)
+            return False
 
 def remover_do_carrinho_db(usuario_id, produto_id):
     """Remove produto do carrinho do usuário"""
-    conn = conectar()
-    cur = conn.cursor()
-    
-    try:
-        cur.execute("DELETE FROM carrinho WHERE usuario_id = ? AND produto_id = ?", 
-                   (usuario_id, produto_id))
-        conn.commit()
-        print(f"✅ Produto {produto_id} removido do carrinho do usuário {usuario_id}")
-        return True
-    except Exception as e:
-        print(f"❌ Erro ao remover do carrinho: {e}")
-        return False
-    finally:
-        conn.close()
+    with conectar() as conn:
+        cur = conn.cursor()
+    
+        try:
+            cur.execute("DELETE FROM carrinho WHERE usuario_id = ? AND produto_id = ?", 
+                       (usuario_id, produto_id))
+            conn.commit()
+            log.debug("✅ Produto %s removido do carrinho do usuário %s", produto_id, usuario_id)
+            return True
+        except Exception as e:
+            log.error("❌ Erro ao remover do carrinho: %s", e)
+            return False
 
 def obter_carrinho_usuario(usuario_id):
     """Retorna todos os itens do carrinho do usuário com informações completas"""
-    conn = conectar()
-    cur = conn.cursor()
+    with conectar() as conn:
+        cur = conn.cursor()
     
-    cur.execute("""
-        SELECT p.id, p.title, p.price, p.image, c.quantidade
-        FROM carrinho c
-        JOIN produtos p ON c.produto_id = p.id
-        WHERE c.usuario_id = ?
-        ORDER BY c.adicionado_em DESC
-    """, (usuario_id,))
-    
-    itens = cur.fetchall()
-    conn.close()
-    
-    print(f"🛒 Carrinho do usuário {usuario_id}: {len(itens)} itens")
-    return itens
+        cur.execute("""
+            SELECT p.id, p.title, p.price_cents, p.image, c.quantidade
+            FROM carrinho c
+            JOIN produtos p ON c.produto_id = p.id
+            WHERE c.usuario_id = ?
+            ORDER BY c.adicionado_em DESC
+        """, (usuario_id,))
+    
+        itens = cur.fetchall()
+    
+        log.debug("🛒 Carrinho do usuário %s: %s itens", usuario_id, len(itens))
+        return itens
+
+def obter_total_carrinho(usuario_id):
+    """Retorna o total do carrinho do usuário em centavos"""
+    with conectar() as conn:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT COALESCE(SUM(p.price_cents * c.quantidade), 0)
+            FROM carrinho c
+            JOIN produtos p ON c.produto_id = p.id
+            WHERE c.usuario_id = ?
+        """, (usuario_id,))
+        return cur.fetchone()[0]
 
 def limpar_carrinho_usuario(usuario_id):
     """Limpa todo o carrinho do usuário"""
-    conn = conectar()
-    cur = conn.cursor()
-    
-    try:
-        cur.execute("DELETE FROM carrinho WHERE usuario_id = ?", (usuario_id,))
-        conn.commit()
-        print(f"✅ Carrinho do usuário {usuario_id} limpo")
-        return True
-    except Exception as e:
-        print(f"❌ Erro ao limpar carrinho: {e}")
-        return False
-    finally:
-        conn.close()
+    with conectar() as conn:
+        cur = conn.cursor()
+    
+        try:
+            cur.execute("DELETE FROM carrinho WHERE usuario_id = ?", (usuario_id,))
+            conn.commit()
+            log.debug("✅ Carrinho do usuário %s limpo", usuario_id)
+            return True
+        except Exception as e:
+            log.error("❌ Erro ao limpar carrinho: %s", e)
+            return False
 
 # =============================================================================
 # FUNÇÕES PARA PRODUTOS
 # =============================================================================
 
 def listar_produtos():
-    """Retorna todos os produtos do banco"""
-    conn = conectar()
-    cur = conn.cursor()
-    cur.execute("SELECT id, title, price, image FROM produtos")
-    produtos = cur.fetchall()
-    conn.close()
+    """Retorna todos os produtos do banco (em cache após a primeira chamada)"""
+    return cache_catalogo.obter("lista", None, _consultar_produtos)
+
+def _consultar_produtos():
+    with conectar() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT id, title, price_cents, image FROM produtos")
+        produtos = cur.fetchall()
     
-    print(f"📦 {len(produtos)} produtos carregados do banco")
-    return produtos
+        log.debug("📦 %s produtos carregados do banco", len(produtos))
+        return produtos
 
 def listar_produtos_por_categoria(categoria):
-    """Retorna produtos filtrados por categoria"""
-    conn = conectar()
-    cur = conn.cursor()
-    cur.execute("SELECT id, title, price, image FROM produtos WHERE categoria = ?", (categoria,))
-    produtos = cur.fetchall()
-    conn.close()
-    
-    print(f"📦 {len(produtos)} produtos da categoria '{categoria}'")
-    return produtos
+    """Retorna produtos filtrados por categoria (em cache após a primeira chamada)"""
+    return cache_catalogo.obter("lista", categoria, lambda: _consultar_produtos_por_categoria(categoria))
+
+def _consultar_produtos_por_categoria(categoria):
+    with conectar() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT id, title, price_cents, image FROM produtos WHERE categoria = ?", (categoria,))
+        produtos = cur.fetchall()
+    
+        log.debug("📦 %s produtos da categoria '%s'", len(produtos), categoria)
+        return produtos
+
+# Tamanho padrão de página do catálogo (scroll infinito)
+TAMANHO_PAGINA = 20
+
+def _pagina(cur, limite):
+    """Lê até 'limite' linhas e devolve (produtos, próximo cursor ou None)"""
+    produtos = cur.fetchmany(limite + 1)
+    if len(produtos) > limite:
+        produtos = produtos[:limite]
+        return produtos, produtos[-1][0]
+    return produtos, None
+
+def listar_produtos_pagina(cursor=None, limite=TAMANHO_PAGINA):
+    """Retorna uma página do catálogo (paginação por cursor/keyset no id)
+    
+    Returns:
+        (produtos, proximo_cursor): proximo_cursor é None na última página
+    """
+    return cache_catalogo.obter("pagina", (None, cursor, limite),
+                                lambda: _consultar_pagina(cursor, limite))
+
+def _consultar_pagina(cursor, limite):
+    with conectar() as conn:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT id, title, price_cents, image FROM produtos
+            WHERE id > ?
+            ORDER BY id
+            LIMIT ?
+        """, (cursor or 0, limite + 1))
+        return _pagina(cur, limite)
+
+def geracao_catalogo():
+    """Muda a cada escrita no catálogo ou troca de banco (telas decidem se recarregam)"""
+    return cache_catalogo.geracao
+
+def pagina_home_em_cache():
+    """Primeira página do catálogo se já estiver em memória (não consulta o banco)"""
+    return cache_catalogo.consultar("pagina", (None, None, TAMANHO_PAGINA))
+
+def listar_produtos_por_categoria_pagina(categoria, cursor=None, limite=TAMANHO_PAGINA):
+    """Retorna uma página de produtos da categoria (paginação por cursor/keyset no id)"""
+    return cache_catalogo.obter("pagina", (categoria, cursor, limite),
+                                lambda: _consultar_pagina_categoria(categoria, cursor, limite))
+
+def _consultar_pagina_categoria(categoria, cursor, limite):
+    with conectar() as conn:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT id, title, price_cents, image FROM produtos
+            WHERE categoria = ? AND id > ?
+            ORDER BY id
+            LIMIT ?
+        """, (categoria, cursor or 0, limite + 1))
+        return _pagina(cur, limite)
 
-# Funções específicas por categoria (para compatibilidade com telas existentes)
-def listar_produtos_disney():
-    """Retorna produtos Disney do banco"""
-    return listar_produtos_por_categoria("disney")
+def pagina_categoria_em_cache(categoria):
+    """Primeira página da categoria se já estiver em memória (não consulta o banco)"""
+    return cache_catalogo.consultar("pagina", (categoria, None, TAMANHO_PAGINA))
 
-def listar_produtos_marvel():
-    """Retorna produtos Marvel do banco"""
-    return listar_produtos_por_categoria("marvel")
+# =============================================================================
+# FUNÇÕES DE CATEGORIAS
+# =============================================================================
 
-def listar_produtos_starwars():
-    """Retorna produtos Star Wars do banco"""
-    return listar_produtos_por_categoria("starwars")
+def listar_categorias():
+    """Retorna as categorias (slug, titulo, banner) na ordem de exibição (em cache)"""
+    return cache_catalogo.obter("categorias", None, _consultar_categorias)
 
-def listar_produtos_playstation():
-    """Retorna produtos PlayStation do banco"""
-    return listar_produtos_por_categoria("playstation")
+def _consultar_categorias():
+    with conectar() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT slug, titulo, banner FROM categorias ORDER BY ordem, titulo")
+        return cur.fetchall()
 
-def listar_produtos_xbox():
-    """Retorna produtos Xbox do banco"""
-    return listar_produtos_por_categoria("xbox")
+def adicionar_categoria(slug, titulo, banner=None, ordem=0):
+    """Adiciona (ou atualiza) uma categoria - aparece no app sem código novo"""
+    with conectar() as conn:
+        cur = conn.cursor()
+    
+        try:
+            cur.execute("""
+                INSERT INTO categorias (slug, titulo, banner, ordem) VALUES (?, ?, ?, ?)
+                ON CONFLICT(slug) DO UPDATE SET titulo = excluded.titulo,
+                    banner = excluded.banner, ordem = excluded.ordem
+            """, (slug, titulo, banner, ordem))
+            conn.commit()
+            cache_catalogo.invalidar()
+            log.info("✅ Categoria salva: %s", titulo)
+            return True
+        except Exception as e:
+            log.error("❌ Erro ao salvar categoria: %s", e)
+            return False
+
+# Busca só com tokens mais curtos que isso casa com palavras inteiras: "mi"*
+# casaria com um quinto do catálogo (Mickey, Minecraft...) e ranquear tudo
+# custa caro. Junto de um token maior ("stitch 4") o prefixo continua valendo
+PREFIXO_MINIMO = 3
+
+# Mesmos pesos do 'rank' configurado na migração 8 (título, descrição,
+# categoria), chamando bm25() direto: ~30% mais rápido que ORDER BY rank
+ORDEM_BUSCA = "bm25(produtos_fts, 10.0, 1.0, 3.0)"
+
+def _consulta_fts(termo):
+    """Transforma o texto digitado em uma consulta FTS5 por prefixo ("lego sta" -> "lego"* "sta"*, "mi" -> "mi")"""
+    tokens = re.findall(r"\w+", termo or "")
+    sufixo = "*" if any(len(token) >= PREFIXO_MINIMO for token in tokens) else ""
+    return " ".join(f'"{token}"{sufixo}' for token in tokens)
+
+def _sem_fts(erro):
+    """Erro de FTS5 indisponível (tabela/módulo ausente) ou de sintaxe do MATCH"""
+    mensagem = str(erro).lower()
+    return "produtos_fts" in mensagem or "fts5" in mensagem or "no such module" in mensagem
+
+def buscar_produtos(termo, limit=20, offset=0):
+    """Busca produtos por texto (título, descrição e categoria), ordenados por relevância"""
+    consulta = _consulta_fts(termo)
+    if not consulta:
+        return []
+    
+    with conectar() as conn:
+        cur = conn.cursor()
+        try:
+            # O FTS5 ordena por relevância (bm25) e pagina sozinho: o JOIN só
+            # busca as linhas da página, e todas as páginas vêm da mesma
+            # ordenação (rowid desempata, para nenhuma página repetir produto)
+            cur.execute(f"""
+                SELECT p.id, p.title, p.price_cents, p.image
+                FROM (
+                    SELECT rowid, {ORDEM_BUSCA} AS relevancia FROM produtos_fts
+                    WHERE produtos_fts MATCH ?
+                    ORDER BY relevancia, rowid
+                    LIMIT ? OFFSET ?
+                ) AS f
+                JOIN produtos p ON p.id = f.rowid
+                ORDER BY f.relevancia, f.rowid
+            """, (consulta, limit, offset))
+        except sqlite3.OperationalError as e:
+            # Banco travado, erro de disco etc. sobem para quem chamou
+            if not _sem_fts(e):
+                raise
+            # Sem FTS5: busca simples no título
+            log.warning("⚠️ Busca sem FTS5 (%s): usando LIKE no título", e)
+            cur.execute("""
+                SELECT id, title, price_cents, image FROM produtos
+                WHERE title LIKE ?
+                ORDER BY title
+                LIMIT ? OFFSET ?
+            """, (f"%{termo.strip()}%", limit, offset))
+        produtos = cur.fetchall()
+    
+        log.debug("🔎 %s produtos encontrados para '%s'", len(produtos), termo)
+        return produtos
 
 def buscar_produto_por_id(produto_id):
-    """Busca produto pelo ID no banco - ATUALIZADA COM DESCRIÇÃO"""
-    conn = conectar()
-    cur = conn.cursor()
-    cur.execute("SELECT id, title, price, image, categoria, descricao FROM produtos WHERE id = ?", (produto_id,))
-    produto = cur.fetchone()
-    conn.close()
+    """Busca produto pelo ID no banco - ATUALIZADA COM DESCRIÇÃO (em cache por id)"""
+    return cache_catalogo.obter("produto", produto_id, lambda: _consultar_produto(produto_id))
+
+def _consultar_produto(produto_id):
+    with conectar() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT id, title, price_cents, image, categoria, descricao FROM produtos WHERE id = ?", (produto_id,))
+        produto = cur.fetchone()
     
-    if produto:
-        print(f"📦 Produto encontrado: {produto[1]}")
-    else:
-        print(f"❌ Produto {produto_id} não encontrado")
+        if produto:
+            log.debug("📦 Produto encontrado: %s", produto[1])
+        else:
+            log.debug("❌ Produto %s não encontrado", produto_id)
     
-    return produto
+        return produto
+
+def buscar_produtos_por_ids(ids):
+    """Busca vários produtos de uma vez (pré-carga dos detalhes) -> {id: linha}, em cache por id"""
+    return cache_catalogo.obter_varios("produto", list(ids), _consultar_produtos_por_ids)
+
+def _consultar_produtos_por_ids(ids):
+    marcadores = ", ".join("?" * len(ids))
+    with conectar() as conn:
+        cur = conn.cursor()
+        cur.execute(f"SELECT id, title, price_cents, image, categoria, descricao FROM produtos WHERE id IN ({marcadores})",
+                    ids)
+        return {produto[0]: produto for produto in cur.fetchall()}
+
+def produto_em_cache(produto_id):
+    """Detalhes do produto se já estiverem em memória (não consulta o banco)"""
+    return cache_catalogo.consultar("produto", produto_id)
 
 def adicionar_produto(title, price, image, categoria="geral"):
-    """Adiciona um novo produto ao banco"""
-    conn = conectar()
-    cur = conn.cursor()
-    
-    try:
-        cur.execute("INSERT INTO produtos (title, price, image, categoria) VALUES (?, ?, ?, ?)", 
-                   (title, price, image, categoria))
-        conn.commit()
-        print(f"✅ Produto adicionado: {title}")
-        return True
-    except Exception as e:
-        print(f"❌ Erro ao adicionar produto: {e}")
-        return False
-    finally:
-        conn.close()
-
-def corrigir_caminhos_imagens():
-    """Corrige caminhos de imagens existentes no banco de dados"""
-    conn = conectar()
-    cur = conn.cursor()
-    
-    try:
-        # Atualiza todos os caminhos que começam com 'nerd_hub.kv/imagens'
-        cur.execute("""
-            UPDATE produtos 
-            SET image = REPLACE(image, 'nerd_hub.kv/imagens/', 'imagens/')
-            WHERE image LIKE 'nerd_hub.kv/imagens/%'
-        """)
-        
-        rows_affected = cur.rowcount
-        conn.commit()
-        
-        if rows_affected > 0:
-            print(f"✅ {rows_affected} caminhos de imagem corrigidos no banco")
-        else:
-            print("✅ Caminhos de imagem já estão corretos")
-        
-        return True
-    except Exception as e:
-        print(f"❌ Erro ao corrigir caminhos: {e}")
-        return False
-    finally:
-        conn.close()
+    """Adiciona um novo produto ao banco (price: "R$ 179,90", "179.90" ou 179.9)"""
+    with conectar() as conn:
+        cur = conn.cursor()
+    
+        try:
+            centavos = texto_para_centavos(price)
+            cur.execute("INSERT INTO produtos (title, price, price_cents, image, categoria) VALUES (?, ?, ?, ?, ?)", 
+                       (title, formatar_brl(centavos), centavos, image, categoria))
+            conn.commit()
+            cache_catalogo.invalidar()
+            log.info("✅ Produto adicionado: %s", title)
+            return True
+        except Exception as e:
+            log.error("❌ Erro ao adicionar produto: %s", e)
+            return False
 
 # =============================================================================
 # CLASSE DATABASE PARA COMPATIBILIDADE
@@ -577,6 +636,43 @@ class Database:
 # INICIALIZAÇÃO DO BANCO
 # =============================================================================
 if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Banco de dados do NerdHub")
+    parser.add_argument("--explain", action="store_true",
+                        help="mostra o EXPLAIN QUERY PLAN de cada consulta do app")
+    parser.add_argument("--limite-linhas", type=int, default=1000,
+                        help="falha se houver SCAN completo em tabela maior que isso")
+    parser.add_argument("--banco", help="banco a auditar (padrão: DB_PATH)")
+    parser.add_argument("--importar", metavar="ARQUIVO",
+                        help="importa produtos de um arquivo .csv ou .jsonl (ver importacao.py)")
+    parser.add_argument("--lote", type=int, default=10000,
+                        help="linhas por transação na importação")
+    args = parser.parse_args()
+
+    if args.importar:
+        # importacao.py usa o módulo "database" (este arquivo roda como __main__)
+        import database
+        from importacao import importar_produtos
+        database.DB_PATH = args.banco or DB_PATH
+        database.criar_tabelas()
+        resumo = importar_produtos(
+            args.importar, lote=args.lote,
+            ao_progresso=lambda parcial: print(f"   ... {parcial['importadas']:,} produtos", flush=True))
+        print(f"✅ {resumo['importadas']:,} produtos importados, {resumo['rejeitadas']:,} rejeitados "
+              f"em {resumo['segundos']:.1f}s ({resumo['por_segundo']:,.0f} linhas/s)")
+        sys.exit(0)
+
+    if args.explain:
+        from plano_consultas import auditar
+        problemas = auditar(args.banco, args.limite_linhas)
+        if problemas:
+            print(f"\n❌ {len(problemas)} consulta(s) com SCAN completo acima de {args.limite_linhas} linhas")
+            sys.exit(1)
+        print("\n✅ Nenhum SCAN completo acima do limite")
+        sys.exit(0)
+
     # Testa a conexão e cria tabelas
     print("🔄 Inicializando banco de dados...")
     criar_tabelas()
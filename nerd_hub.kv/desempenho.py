@@ -0,0 +1,179 @@
+# desempenho.py
+"""
+Painel de Desempenho
+====================
+Painel de depuração sobreposto às telas, para descobrir por que uma tela
+ficou lenta (SQL, construção da tela ou on_pre_enter):
+
+    FPS 58 | widgets 214
+    detalhes_produto: transição 412 ms
+      construção 18 ms | on_pre_enter 3 ms
+    SQL desde a navegação: 4 comandos, 2.1 ms
+
+Ativação: variável de ambiente NERDHUB_PAINEL=1 ou três toques seguidos
+no "NERD HUB" do header (o mesmo gesto esconde o painel).
+
+Os dados vêm de ganchos no app:
+- Gerenciador.on_current: início de cada navegação (mudar_tela, voltar,
+  current = ...) - zera os contadores de SQL
+- Gerenciador.construir_tela: tempo de construção da tela
+- on_pre_enter de cada tela (envolvido em construir_tela) e on_enter
+  (fim da transição)
+- PoolConexoes.definir_medicao: cada bloco 'with conectar()' informa seu
+  tempo e quantos comandos executou (só enquanto o painel está visível)
+
+Uso:
+    from desempenho import monitor
+
+    monitor.alternar()   # mostra/esconde o painel
+"""
+
+import os
+import threading
+import time
+
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.graphics import Color, Rectangle
+from kivy.metrics import dp
+from kivy.uix.label import Label
+
+from database import obter_pool
+from registro import obter_logger
+
+log = obter_logger(__name__)
+
+# Intervalo (s) entre atualizações do painel
+INTERVALO = 0.5
+
+
+class PainelDesempenho(Label):
+    """Texto sobreposto à janela, no canto inferior esquerdo"""
+
+    def __init__(self, **kwargs):
+        super().__init__(
+            size_hint=(None, None), halign="left", valign="bottom",
+            font_size="11sp", color=(1, 1, 0.4, 1), padding=(dp(6), dp(4)),
+            **kwargs)
+        self.bind(texture_size=lambda *args: setattr(self, "size", self.texture_size))
+        with self.canvas.before:
+            Color(0, 0, 0, 0.7)
+            self._fundo = Rectangle(pos=self.pos, size=self.size)
+        self.bind(pos=self._ajustar_fundo, size=self._ajustar_fundo)
+
+    def _ajustar_fundo(self, *args):
+        self._fundo.pos = self.pos
+        self._fundo.size = self.size
+
+
+class MonitorDesempenho:
+    """Métricas da navegação atual, alimentadas pelos ganchos do app"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.painel = None
+        self._evento = None
+        self.tela = None
+        self._inicio = None
+        self.transicao_ms = None
+        self.construcao_ms = 0.0
+        self.pre_enter_ms = 0.0
+        self.sql_comandos = 0
+        self.sql_ms = 0.0
+
+    # =========================================================================
+    # GANCHOS (thread do Kivy, exceto consulta)
+    # =========================================================================
+
+    def navegacao_iniciada(self, nome):
+        """Gerenciador.on_current: começa a medir uma nova navegação"""
+        self.tela = nome
+        self._inicio = time.perf_counter()
+        self.transicao_ms = None
+        self.construcao_ms = self.pre_enter_ms = 0.0
+        with self._lock:
+            self.sql_comandos = 0
+            self.sql_ms = 0.0
+
+    def tela_construida(self, segundos):
+        self.construcao_ms += segundos * 1000
+
+    def medir_pre_enter(self, tela):
+        """Envolve o on_pre_enter da tela para medir seu tempo"""
+        original = tela.on_pre_enter
+
+        def on_pre_enter(*args):
+            inicio = time.perf_counter()
+            try:
+                return original(*args)
+            finally:
+                self.pre_enter_ms += (time.perf_counter() - inicio) * 1000
+
+        tela.on_pre_enter = on_pre_enter
+        tela.bind(on_enter=self._tela_exibida)
+
+    def _tela_exibida(self, tela):
+        if tela.name == self.tela and self._inicio is not None and self.transicao_ms is None:
+            self.transicao_ms = (time.perf_counter() - self._inicio) * 1000
+
+    def consulta(self, segundos, comandos):
+        """PoolConexoes.definir_medicao: chamado na thread que usou o banco"""
+        with self._lock:
+            self.sql_comandos += comandos
+            self.sql_ms += segundos * 1000
+
+    # =========================================================================
+    # PAINEL
+    # =========================================================================
+
+    @property
+    def ativo(self):
+        return self.painel is not None
+
+    def mostrar(self):
+        if self.ativo:
+            return
+        self.painel = PainelDesempenho()
+        Window.add_widget(self.painel)
+        obter_pool().definir_medicao(self.consulta)
+        self._evento = Clock.schedule_interval(self.atualizar, INTERVALO)
+        self.atualizar()
+        log.info("📈 Painel de desempenho ativado")
+
+    def esconder(self):
+        if not self.ativo:
+            return
+        self._evento.cancel()
+        obter_pool().definir_medicao(None)
+        Window.remove_widget(self.painel)
+        self.painel = self._evento = None
+
+    def alternar(self):
+        """Mostra ou esconde o painel (gesto do header)"""
+        if self.ativo:
+            self.esconder()
+        else:
+            self.mostrar()
+
+    def texto(self):
+        """Conteúdo do painel"""
+        widgets = sum(1 for raiz in Window.children if raiz is not self.painel for _ in raiz.walk())
+        with self._lock:
+            comandos, sql_ms = self.sql_comandos, self.sql_ms
+        transicao = "em andamento" if self.transicao_ms is None else f"{self.transicao_ms:.0f} ms"
+        return (f"FPS {Clock.get_fps():.0f} | widgets {widgets}\n"
+                f"{self.tela or '-'}: transição {transicao}\n"
+                f"  construção {self.construcao_ms:.0f} ms | on_pre_enter {self.pre_enter_ms:.0f} ms\n"
+                f"SQL desde a navegação: {comandos} comandos, {sql_ms:.1f} ms")
+
+    def atualizar(self, dt=0):
+        self.painel.text = self.texto()
+
+
+monitor = MonitorDesempenho()
+
+
+def ativar_pelo_ambiente():
+    """Mostra o painel se NERDHUB_PAINEL=1"""
+    if os.environ.get("NERDHUB_PAINEL", "").strip() in ("1", "true", "sim"):
+        monitor.mostrar()
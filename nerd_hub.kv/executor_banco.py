@@ -0,0 +1,145 @@
+# executor_banco.py
+"""
+Executor de Banco em Segundo Plano
+==================================
+Tira as consultas ao SQLite da thread principal do Kivy. As chamadas do
+database.py rodam numa thread trabalhadora (fila FIFO) e o resultado volta
+para a thread da interface com Clock.schedule_once, onde é seguro mexer
+em widgets.
+
+Uso:
+    from executor_banco import em_segundo_plano
+
+    tarefa = em_segundo_plano(
+        listar_produtos_pagina, cursor,
+        ao_concluir=lambda resultado: ...,   # roda na thread do Kivy
+        ao_falhar=lambda erro: ...,          # opcional
+    )
+    tarefa.cancelar()  # descarta o resultado (ex.: usuário saiu da tela)
+
+Uma única thread trabalhadora mantém a ordem das operações: uma escrita
+enviada antes de uma leitura sempre termina antes dela. Executores com
+mais threads (executor_senhas, usado por com_senha) não garantem essa ordem.
+"""
+
+import queue
+import threading
+
+from kivy.clock import Clock
+from linha_do_tempo import trecho
+from registro import obter_logger
+
+log = obter_logger(__name__)
+
+
+class Tarefa:
+    """Chamada agendada no executor; pode ser cancelada antes de entregar o resultado"""
+
+    def __init__(self, funcao, args, kwargs, ao_concluir, ao_falhar):
+        self.funcao = funcao
+        self.args = args
+        self.kwargs = kwargs
+        self.ao_concluir = ao_concluir
+        self.ao_falhar = ao_falhar
+        self.cancelada = False
+
+    def cancelar(self):
+        """Não executa (se ainda estiver na fila) e não entrega o resultado"""
+        self.cancelada = True
+
+    @property
+    def nome(self):
+        return getattr(self.funcao, '__name__', str(self.funcao))
+
+    def _entregar(self, callback, valor):
+        if self.cancelada or callback is None:
+            return
+
+        def entregar(dt):
+            if not self.cancelada:
+                with trecho(f"{self.nome} -> interface", "executor"):
+                    callback(valor)
+
+        Clock.schedule_once(entregar, 0)
+
+    def executar(self):
+        if self.cancelada:
+            return
+        try:
+            with trecho(self.nome, "executor"):
+                resultado = self.funcao(*self.args, **self.kwargs)
+        except Exception as e:
+            log.exception("❌ Erro em segundo plano (%s): %s", self.nome, e)
+            self._entregar(self.ao_falhar, e)
+        else:
+            self._entregar(self.ao_concluir, resultado)
+
+
+class ExecutorBanco:
+    """Thread(s) trabalhadora(s) que consomem uma fila de Tarefas"""
+
+    def __init__(self, nome="executor-banco", threads=1):
+        self.nome = nome
+        self.threads = threads
+        self._fila = queue.Queue()
+        self._trabalhadoras = []
+        self._lock = threading.Lock()
+
+    def _iniciar(self):
+        with self._lock:
+            self._trabalhadoras = [thread for thread in self._trabalhadoras if thread.is_alive()]
+            while len(self._trabalhadoras) < self.threads:
+                thread = threading.Thread(target=self._trabalhar, daemon=True,
+                                          name=f"{self.nome}-{len(self._trabalhadoras)}")
+                thread.start()
+                self._trabalhadoras.append(thread)
+
+    def _trabalhar(self):
+        while True:
+            tarefa = self._fila.get()
+            try:
+                if tarefa is None:
+                    break
+                tarefa.executar()
+            finally:
+                self._fila.task_done()
+
+    def enviar(self, funcao, *args, ao_concluir=None, ao_falhar=None, **kwargs):
+        """Agenda funcao(*args, **kwargs) e devolve a Tarefa"""
+        tarefa = Tarefa(funcao, args, kwargs, ao_concluir, ao_falhar)
+        self._iniciar()
+        self._fila.put(tarefa)
+        return tarefa
+
+    def ocioso(self):
+        """True se não há tarefa na fila nem em execução (o resultado pode
+        ainda estar agendado para o próximo frame do Kivy)"""
+        return self._fila.unfinished_tasks == 0
+
+    def parar(self):
+        """Encerra as threads depois das tarefas já enfileiradas"""
+        with self._lock:
+            vivas = [thread for thread in self._trabalhadoras if thread.is_alive()]
+            for _ in vivas:
+                self._fila.put(None)
+            for thread in vivas:
+                thread.join(timeout=2)
+            self._trabalhadoras = []
+
+
+executor = ExecutorBanco()
+
+# Login, cadastro e troca de senha: o hash scrypt (ver senhas.py) leva dezenas
+# de ms e não deve atrasar as consultas do catálogo na fila do executor do banco
+THREADS_SENHAS = 2
+executor_senhas = ExecutorBanco(nome="executor-senhas", threads=THREADS_SENHAS)
+
+
+def em_segundo_plano(funcao, *args, ao_concluir=None, ao_falhar=None, **kwargs):
+    """Atalho para executor.enviar()"""
+    return executor.enviar(funcao, *args, ao_concluir=ao_concluir, ao_falhar=ao_falhar, **kwargs)
+
+
+def com_senha(funcao, *args, ao_concluir=None, ao_falhar=None, **kwargs):
+    """Como em_segundo_plano(), mas nas threads de senha (verificar_login, cadastrar_usuario, update_password)"""
+    return executor_senhas.enviar(funcao, *args, ao_concluir=ao_concluir, ao_falhar=ao_falhar, **kwargs)
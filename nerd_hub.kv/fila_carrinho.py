@@ -0,0 +1,99 @@
+# fila_carrinho.py
+"""
+Fila de Escrita do Carrinho
+===========================
+Toques em "adicionar ao carrinho" não vão direto para o banco: ficam
+somados em memória por (usuário, produto) e são gravados juntos, numa
+única transação (adicionar_lote_ao_carrinho_db), quando:
+- passa ATRASO segundos desde o primeiro toque pendente
+- o app troca de tela
+- alguém vai ler ou alterar o carrinho (gravar() antes da consulta)
+- o app é pausado ou fechado (gravar() síncrono em on_pause/on_stop)
+
+Uso:
+    from fila_carrinho import fila_carrinho
+
+    fila_carrinho.adicionar(usuario_id, produto_id)  # thread do Kivy, não toca no banco
+    fila_carrinho.descarregar()                       # agenda a gravação no executor
+    fila_carrinho.gravar()                            # grava agora (qualquer thread)
+
+Como o executor do banco tem uma thread só, uma leitura enviada depois de
+descarregar() já enxerga as adições. Se a gravação falhar, as adições
+voltam para a fila e entram na próxima tentativa.
+
+Quem precisa saber se a adição foi salva (ex.: a mensagem "Produto
+adicionado") passa ao_gravar(sucesso) em adicionar(): é chamado na thread
+do Kivy depois da gravação que incluir a adição - uma vez por gravação,
+mesmo que vários toques tenham entrado no mesmo lote.
+"""
+
+import threading
+
+from kivy.clock import Clock
+
+from database import adicionar_lote_ao_carrinho_db
+from executor_banco import em_segundo_plano
+from registro import obter_logger
+
+log = obter_logger(__name__)
+
+# Espera máxima (s) entre o primeiro toque pendente e a gravação
+ATRASO = 0.3
+
+
+class FilaCarrinho:
+    """Adições ao carrinho acumuladas em memória e gravadas em lote"""
+
+    def __init__(self, atraso=ATRASO):
+        self._pendentes = {}  # (usuario_id, produto_id) -> quantidade
+        self._avisos = []     # ao_gravar(sucesso) das adições pendentes
+        self._lock = threading.Lock()
+        self._gravando = threading.Lock()  # uma gravação por vez (on_pause espera a do executor)
+        self._gatilho = Clock.create_trigger(lambda dt: self.descarregar(), atraso)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pendentes)
+
+    def adicionar(self, usuario_id, produto_id, quantidade=1, ao_gravar=None):
+        """Soma a adição às pendentes e agenda a gravação"""
+        with self._lock:
+            chave = (usuario_id, produto_id)
+            self._pendentes[chave] = self._pendentes.get(chave, 0) + quantidade
+            if ao_gravar is not None:
+                self._avisos.append(ao_gravar)
+        self._gatilho()
+
+    def descarregar(self, ao_concluir=None):
+        """Agenda a gravação das pendentes no executor do banco (thread do Kivy)"""
+        self._gatilho.cancel()
+        if not len(self):
+            return None
+        return em_segundo_plano(self.gravar, ao_concluir=ao_concluir)
+
+    def gravar(self):
+        """Grava as pendentes numa única transação; False se a gravação falhou"""
+        with self._gravando:
+            with self._lock:
+                lote, self._pendentes = self._pendentes, {}
+                avisos, self._avisos = self._avisos, []
+            if not lote:
+                return True
+
+            sucesso = adicionar_lote_ao_carrinho_db((u, p, q) for (u, p), q in lote.items())
+            if sucesso:
+                log.debug("💾 %s linha(s) do carrinho gravada(s) numa transação", len(lote))
+            else:
+                # Devolve o lote para a próxima tentativa (somando com toques novos)
+                with self._lock:
+                    for chave, quantidade in lote.items():
+                        self._pendentes[chave] = self._pendentes.get(chave, 0) + quantidade
+                log.warning("⚠️ %s linha(s) do carrinho continuam pendentes", len(lote))
+
+            # Cada aviso uma vez por gravação (toques seguidos repetem o mesmo)
+            for aviso in dict.fromkeys(avisos):
+                Clock.schedule_once(lambda dt, aviso=aviso: aviso(sucesso))
+            return sucesso
+
+
+fila_carrinho = FilaCarrinho()
@@ -0,0 +1,223 @@
+# importacao.py
+"""
+Importação de Produtos em Massa
+===============================
+Carrega um catálogo de CSV ou JSONL sem passar por adicionar_produto()
+(uma conexão e um commit por produto):
+
+- o arquivo é lido em streaming (gerador), sem carregar tudo na memória
+- cada linha é validada e normalizada (normalizar_produto); linhas
+  inválidas são contadas e ignoradas
+- as linhas válidas entram com executemany, em transações de LOTE linhas
+- o índice do catálogo e o trigger da busca saem durante a carga: no fim
+  o índice é recriado uma vez e só os produtos novos entram no FTS
+
+Campos (cabeçalho do CSV ou chaves de cada objeto do JSONL):
+    title        obrigatório
+    price        "R$ 1.349,90", "1349.90" ou número - ou price_cents (134990)
+    image        caminho relativo (opcional)
+    categoria    slug, ex.: "starwars" (padrão: "geral")
+    descricao    opcional (padrão: a descrição padrão dos produtos)
+
+Uso:
+    from importacao import importar_produtos
+    resumo = importar_produtos("catalogo.csv")   # {"lidas", "importadas", ...}
+
+    python database.py --importar catalogo.jsonl [--lote 10000]
+
+Se a importação for interrompida, os lotes já gravados ficam no banco e a
+próxima importação recria o que faltar (índice, trigger e índice FTS).
+"""
+
+import csv
+import itertools
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+
+import database
+from migracoes import DESCRICAO_PADRAO, reparar_catalogo
+from precos import formatar_brl, texto_para_centavos
+from registro import obter_logger
+
+log = obter_logger(__name__)
+
+# Linhas por transação
+LOTE = 10000
+
+CATEGORIA_PADRAO = "geral"
+
+# Linhas inválidas detalhadas no log (as demais só entram na contagem)
+AVISOS_MAXIMOS = 20
+
+DIGITO = re.compile(r"\d")
+
+SQL_INSERIR = """
+    INSERT INTO produtos (title, price, price_cents, image, categoria, descricao)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+
+# =============================================================================
+# LEITURA (geradores de (número da linha, registro))
+# =============================================================================
+
+def ler_csv(caminho):
+    with open(caminho, newline="", encoding="utf-8-sig") as arquivo:
+        leitor = csv.DictReader(arquivo)
+        for registro in leitor:
+            yield leitor.line_num, registro
+
+
+def ler_jsonl(caminho):
+    with open(caminho, encoding="utf-8") as arquivo:
+        for numero, linha in enumerate(arquivo, 1):
+            if not linha.strip():
+                continue
+            try:
+                yield numero, json.loads(linha)
+            except ValueError as e:
+                yield numero, e
+
+
+LEITORES = {".csv": ler_csv, ".jsonl": ler_jsonl, ".ndjson": ler_jsonl}
+
+
+# =============================================================================
+# VALIDAÇÃO
+# =============================================================================
+
+def _centavos(registro):
+    centavos = registro.get("price_cents")
+    if centavos not in (None, ""):
+        return int(centavos)
+
+    preco = registro.get("price")
+    if isinstance(preco, (int, float)):
+        return texto_para_centavos(preco)
+    texto = str(preco or "").strip()
+    if not texto:
+        raise ValueError("sem price/price_cents")
+    if not DIGITO.search(texto):
+        raise ValueError(f"preço inválido: {texto!r}")
+    return texto_para_centavos(texto)
+
+
+def normalizar_produto(registro):
+    """Linha do arquivo -> tupla de SQL_INSERIR; ValueError se for inválida"""
+    if not isinstance(registro, dict):
+        raise ValueError(f"registro não é um objeto: {registro!r}"[:120])
+
+    title = " ".join(str(registro.get("title") or "").split())
+    if not title:
+        raise ValueError("title vazio")
+
+    centavos = _centavos(registro)
+    if centavos < 0:
+        raise ValueError(f"preço negativo: {centavos}")
+
+    image = str(registro.get("image") or "").strip()
+    if image.startswith("nerd_hub.kv/"):
+        image = image[len("nerd_hub.kv/"):]
+    categoria = str(registro.get("categoria") or "").strip().lower() or CATEGORIA_PADRAO
+    descricao = str(registro.get("descricao") or "").strip() or DESCRICAO_PADRAO
+
+    return title, formatar_brl(centavos), centavos, image, categoria, descricao
+
+
+# =============================================================================
+# IMPORTAÇÃO
+# =============================================================================
+
+def _existe_busca(cur):
+    return cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'produtos_fts'"
+                       ).fetchone() is not None
+
+
+def _indexar_busca(cur, ultimo_id, completo):
+    """Põe no FTS os produtos com id > ultimo_id (ou refaz o índice inteiro)"""
+    if not _existe_busca(cur):
+        return
+    if completo:
+        cur.execute("INSERT INTO produtos_fts(produtos_fts) VALUES ('rebuild')")
+    else:
+        cur.execute("""
+            INSERT INTO produtos_fts (rowid, title, descricao, categoria)
+            SELECT id, title, descricao, categoria FROM produtos WHERE id > ?
+        """, (ultimo_id,))
+
+
+@contextmanager
+def carga_em_massa(conn):
+    """Bloco de inserções em massa em produtos (commits por lote são do chamador):
+    sem o índice do catálogo e sem o trigger da busca, cada INSERT só escreve na
+    tabela; no fim o índice é recriado e os produtos novos entram no FTS"""
+    cur = conn.cursor()
+    # Sobras de uma carga interrompida: trigger sem produtos indexados
+    reindexar_tudo = reparar_catalogo(cur)
+    ultimo_id = cur.execute("SELECT COALESCE(MAX(id), 0) FROM produtos").fetchone()[0]
+
+    cur.execute("DROP INDEX IF EXISTS idx_produtos_categoria")
+    cur.execute("DROP TRIGGER IF EXISTS produtos_fts_ai")
+    conn.commit()
+    try:
+        yield cur
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        reparar_catalogo(cur)
+        _indexar_busca(cur, ultimo_id, reindexar_tudo)
+        conn.commit()
+        database.cache_catalogo.invalidar()
+
+
+def importar_produtos(caminho, formato=None, lote=LOTE, ao_progresso=None):
+    """Importa os produtos de um arquivo CSV ou JSONL.
+
+    Args:
+        formato: ".csv" ou ".jsonl" (padrão: pela extensão do arquivo)
+        lote: linhas por transação
+        ao_progresso: chamado com o resumo parcial depois de cada lote
+
+    Returns:
+        dict: lidas, importadas, rejeitadas, segundos e por_segundo
+    """
+    leitor = LEITORES.get((formato or os.path.splitext(caminho)[1]).lower())
+    if leitor is None:
+        raise ValueError(f"Formato não suportado: {caminho} (use .csv ou .jsonl)")
+
+    resumo = {"lidas": 0, "importadas": 0, "rejeitadas": 0}
+    inicio = time.perf_counter()
+
+    def validas():
+        for numero, registro in leitor(caminho):
+            resumo["lidas"] += 1
+            try:
+                if isinstance(registro, Exception):
+                    raise ValueError(f"JSON inválido: {registro}")
+                yield normalizar_produto(registro)
+            except (ValueError, TypeError) as e:
+                resumo["rejeitadas"] += 1
+                if resumo["rejeitadas"] <= AVISOS_MAXIMOS:
+                    log.warning("⚠️ Linha %s ignorada: %s", numero, e)
+
+    linhas = validas()
+    with database.conectar() as conn, carga_em_massa(conn) as cur:
+        while True:
+            bloco = list(itertools.islice(linhas, lote))
+            if not bloco:
+                break
+            cur.executemany(SQL_INSERIR, bloco)
+            conn.commit()
+            resumo["importadas"] += len(bloco)
+            if ao_progresso:
+                ao_progresso(dict(resumo))
+
+    resumo["segundos"] = time.perf_counter() - inicio
+    resumo["por_segundo"] = resumo["importadas"] / resumo["segundos"] if resumo["segundos"] else 0.0
+    log.info("📦 %s produtos importados de %s (%s rejeitados) em %.1fs - %.0f linhas/s",
+             resumo["importadas"], caminho, resumo["rejeitadas"], resumo["segundos"], resumo["por_segundo"])
+    return resumo
@@ -0,0 +1,154 @@
+# linha_do_tempo.py
+"""
+Linha do Tempo do Início
+========================
+Registra os trechos do início do app (imports, banco, .kv, construção da
+Home, primeira página de produtos, primeiro frame), aninhados e por
+thread, e exporta no formato Trace Event do Chrome - o arquivo abre no
+Perfetto (ui.perfetto.dev) ou em chrome://tracing.
+
+Ativação pela variável de ambiente NERDHUB_TRACE:
+
+    NERDHUB_TRACE=1 python main.py                   # grava linha_do_tempo.json ao lado do main.py
+    NERDHUB_TRACE=/tmp/inicio.json python main.py    # grava no caminho indicado
+
+O arquivo é gravado quando a Home aparece com produtos (ou ao fechar o
+app, o que vier antes) e o registro para por aí - é uma ferramenta do
+início a frio, não fica gravando a sessão inteira. Só usa a biblioteca
+padrão, então funciona igual no desktop e no aparelho (no Android o
+arquivo fica na pasta privada do app, ao lado do banco).
+
+No Linux/Android o tempo 0 é o início do processo (lido de /proc), e o
+trecho "interpretador" mostra o que aconteceu antes do main.py; nos
+outros sistemas o tempo 0 é o import deste módulo.
+
+Uso:
+    from linha_do_tempo import trecho, marcar
+
+    with trecho("criar_tabelas"):
+        ...
+    marcar("Home: primeira página")
+
+Desligado, trecho() devolve um contexto vazio compartilhado (custo de
+uma chamada de função).
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+
+ARQUIVO_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "linha_do_tempo.json")
+
+_NULO = contextlib.nullcontext()
+
+
+def _desde_o_inicio_do_processo():
+    """Segundos desde o início do processo (Linux/Android); None se não der para saber"""
+    try:
+        with open("/proc/self/stat") as arquivo:
+            campos = arquivo.read().rsplit(")", 1)[1].split()
+        inicio = int(campos[19]) / os.sysconf("SC_CLK_TCK")  # starttime, em ticks desde o boot
+        return max(0.0, time.clock_gettime(time.CLOCK_BOOTTIME) - inicio)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class LinhaDoTempo:
+    """Eventos do início, em microssegundos desde a origem"""
+
+    def __init__(self, caminho=None):
+        self.caminho = caminho
+        self.ativa = caminho is not None
+        self.eventos = []
+        self.threads = {}
+        self.marcas = set()
+        self._lock = threading.Lock()
+
+        decorrido = _desde_o_inicio_do_processo() if self.ativa else None
+        self.origem = time.perf_counter() - (decorrido or 0.0)
+        if decorrido:
+            self.registrar("interpretador", self.origem, categoria="processo")
+
+    def _us(self, instante):
+        return round((instante - self.origem) * 1e6, 1)
+
+    def _evento(self, evento):
+        thread = threading.current_thread()
+        evento["pid"] = os.getpid()
+        evento["tid"] = thread.ident
+        with self._lock:
+            self.threads.setdefault(thread.ident, thread.name)
+            self.eventos.append(evento)
+
+    def registrar(self, nome, inicio, categoria="inicio", **args):
+        """Trecho de 'inicio' (time.perf_counter()) até agora"""
+        if not self.ativa:
+            return
+        fim = time.perf_counter()
+        self._evento({"name": nome, "cat": categoria, "ph": "X", "ts": self._us(inicio),
+                      "dur": round((fim - inicio) * 1e6, 1), "args": args})
+
+    @contextlib.contextmanager
+    def _trecho(self, nome, categoria, args):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(nome, inicio, categoria, **args)
+
+    def trecho(self, nome, categoria="inicio", **args):
+        """Contexto 'with' que vira um trecho da linha do tempo"""
+        if not self.ativa:
+            return _NULO
+        return self._trecho(nome, categoria, args)
+
+    def marcar(self, nome, **args):
+        """Instante marcado na linha do tempo"""
+        if not self.ativa:
+            return
+        self.marcas.add(nome)
+        self._evento({"name": nome, "cat": "marca", "ph": "i", "s": "g",
+                      "ts": self._us(time.perf_counter()), "args": args})
+
+    def marcado(self, nome):
+        return nome in self.marcas
+
+    def eventos_trace(self):
+        """Eventos no formato Trace Event (com os nomes das threads)"""
+        with self._lock:
+            eventos = list(self.eventos)
+            threads = dict(self.threads)
+        nomes = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": ident, "args": {"name": nome}}
+                 for ident, nome in threads.items()]
+        return nomes + sorted(eventos, key=lambda evento: evento["ts"])
+
+    def exportar(self):
+        """Grava o JSON e para de registrar; retorna o caminho (None se inativa)"""
+        if not self.ativa:
+            return None
+        self.ativa = False
+        with open(self.caminho, "w", encoding="utf-8") as arquivo:
+            json.dump({"traceEvents": self.eventos_trace(), "displayTimeUnit": "ms"}, arquivo, ensure_ascii=False)
+        return self.caminho
+
+    def duracoes(self):
+        """Duração (ms) de cada trecho da thread principal, na ordem em que começaram"""
+        principal = threading.main_thread().ident
+        return [(evento["name"], evento["dur"] / 1000) for evento in self.eventos_trace()
+                if evento["ph"] == "X" and evento["tid"] == principal]
+
+
+def _caminho_do_ambiente():
+    valor = os.environ.get("NERDHUB_TRACE", "").strip()
+    if not valor or valor in ("0", "false", "nao"):
+        return None
+    return ARQUIVO_PADRAO if valor in ("1", "true", "sim") else valor
+
+
+linha_do_tempo = LinhaDoTempo(_caminho_do_ambiente())
+
+trecho = linha_do_tempo.trecho
+marcar = linha_do_tempo.marcar
+registrar = linha_do_tempo.registrar
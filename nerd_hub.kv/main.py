@@ -1,4 +1,10 @@
 # main.py - ATUALIZADO
+import time
+
+# Primeiro import: a linha do tempo do início mede os demais (NERDHUB_TRACE=1)
+from linha_do_tempo import linha_do_tempo, marcar, registrar, trecho
+_inicio_imports = time.perf_counter()
+
 from kivy.app import App
 from kivy.lang import Builder
 from kivy.core.window import Window
@@ -6,28 +12,58 @@ from kivy.uix.screenmanager import ScreenManager, Screen
 from kivy.uix.popup import Popup
 from kivy.uix.label import Label
 from kivy.clock import Clock
+import importlib
 import os
 
+registrar("imports do Kivy", _inicio_imports)
+_inicio_imports_app = time.perf_counter()
+
 from database import (
-    criar_tabelas, verificar_login, cadastrar_usuario, 
-    carregar_usuario_teste, listar_usuarios,
-    listar_produtos, listar_produtos_disney, listar_produtos_marvel,
-    listar_produtos_starwars, listar_produtos_playstation, 
-    listar_produtos_xbox, buscar_produto_por_id
+    inicializar_banco, verificar_login, cadastrar_usuario,
+    listar_produtos, listar_categorias, buscar_produto_por_id
 )
-
-# Importação das telas
-from paginas.playstation import PlaystationScreen
-from paginas.disney import DisneyScreen
-from paginas.marvel import MarvelScreen
-from paginas.starwars import StarWarsScreen
-from paginas.xbox import XboxScreen
-from paginas.home import HomeScreen
-from paginas.login import LoginScreen
-from paginas.carrinho import CarrinhoScreen
-from paginas.cadastro import CadastroScreen
-from paginas.produto_detalhes import DetalhesProdutoScreen
-from paginas.perfil import PerfilScreen
+from desempenho import ativar_pelo_ambiente, monitor
+from executor_banco import com_senha, executor, executor_senhas
+from fila_carrinho import fila_carrinho
+from miniaturas import carregar_manifesto, gerar_miniaturas_em_segundo_plano
+from registro import obter_logger
+
+# Widgets usados pelas regras .kv (registrados na Factory ao importar)
+from paginas.grade_produtos import GradeProdutos, LinhaProdutos
+from paginas.imagem_produto import ImagemProduto
+from paginas.carrossel_categorias import CarrosselCategorias
+
+registrar("imports do app", _inicio_imports_app)
+registrar("imports do main.py", _inicio_imports)
+
+log = obter_logger("main")
+
+# Telas: nome -> (arquivo .kv, módulo, classe[, propriedades])
+# Cada tela só é importada, tem seu .kv carregado e é instanciada na
+# primeira vez que for exibida (ver Gerenciador.get_screen).
+# As telas de categoria são registradas no build() a partir do banco.
+TELAS = {
+    "home": ("telas/home.kv", "paginas.home", "HomeScreen"),
+    "login": ("telas/login.kv", "paginas.login", "LoginScreen"),
+    "carrinho": ("telas/carrinho.kv", "paginas.carrinho", "CarrinhoScreen"),
+    "detalhes_produto": ("telas/detalhes_produto.kv", "paginas.produto_detalhes", "DetalhesProdutoScreen"),
+    "cadastro": ("telas/cadastro.kv", "paginas.cadastro", "CadastroScreen"),
+    "perfil": ("telas/perfil.kv", "paginas.perfil", "PerfilScreen"),
+    "busca": ("telas/busca.kv", "paginas.busca", "BuscaScreen"),
+}
+
+# Telas prováveis depois da Home, construídas quando o app fica ocioso
+# (lista vazia desativa o pré-aquecimento)
+TELAS_PREAQUECIDAS = ("detalhes_produto", "login", "busca")
+
+
+def telas_de_categoria():
+    """Uma tela CategoriaScreen por categoria cadastrada, com nome = slug"""
+    return {
+        slug: ("telas/categoria.kv", "paginas.categoria", "CategoriaScreen",
+               {"categoria": slug, "titulo": titulo, "banner": banner or ""})
+        for slug, titulo, banner in listar_categorias()
+    }
 
 # Tamanho da janela (para teste no desktop)
 Window.size = (420, 900)
@@ -63,6 +99,8 @@ HEADER_KV = '''
         font_size: '18sp'
         bold: True
         on_release: app.root.current = "home"
+        # Três toques seguidos: painel de desempenho (ver desempenho.py)
+        on_touch_down: if args[1].is_triple_tap and self.collide_point(*args[1].pos): app.alternar_painel()
 
     # Campo de busca
     TextInput:
@@ -79,6 +117,7 @@ HEADER_KV = '''
         padding: [dp(12), dp(10)]
         radius: [dp(8),]
         pos_hint: {'center_y': 0.5}
+        on_focus: app.abrir_busca(self) if self.focus else None
 
     # Ícones do carrinho e perfil
     BoxLayout:
@@ -106,9 +145,71 @@ HEADER_KV = '''
 #  GERENCIADOR DE TELAS
 # -------------------------------
 class Gerenciador(ScreenManager):
-    def __init__(self, **kwargs):
+    def __init__(self, telas=None, **kwargs):
         super().__init__(**kwargs)
         self.historico = []
+        self.fabricas = dict(telas or {})  # telas ainda não construídas
+        self.kv_carregados = set()  # um .kv pode servir várias telas (categorias)
+
+    def construir_tela(self, nome):
+        """Carrega o .kv, importa e instancia a tela (só na primeira vez)"""
+        kv, modulo, classe, *propriedades = self.fabricas.pop(nome)
+        inicio = time.perf_counter()
+        if kv not in self.kv_carregados:
+            with trecho("Builder.load_file", arquivo=kv):
+                Builder.load_file(kv)
+            self.kv_carregados.add(kv)
+        propriedades = propriedades[0] if propriedades else {}
+        with trecho("import", modulo=modulo):
+            fabrica = getattr(importlib.import_module(modulo), classe)
+        with trecho("instanciar", classe=classe):
+            tela = fabrica(name=nome, **propriedades)
+        monitor.medir_pre_enter(tela)
+        self.add_widget(tela)
+        segundos = time.perf_counter() - inicio
+        monitor.tela_construida(segundos)
+        registrar(f"construir_tela({nome})", inicio)
+        log.debug("🧱 Tela '%s' construída em %.0f ms", nome, segundos * 1000)
+        return tela
+
+    def construir_todas(self):
+        """Constrói de uma vez todas as telas que faltam"""
+        for nome in list(self.fabricas):
+            self.construir_tela(nome)
+
+    def preaquecer(self, nomes, intervalo=0.2):
+        """Constrói as telas indicadas uma por vez, nos intervalos ociosos"""
+        pendentes = [nome for nome in nomes if nome in self.fabricas]
+        
+        def proxima(dt):
+            while pendentes:
+                nome = pendentes.pop(0)
+                if nome in self.fabricas:
+                    self.construir_tela(nome)
+                    break
+            if pendentes:
+                Clock.schedule_once(proxima, intervalo)
+        
+        if pendentes:
+            Clock.schedule_once(proxima, intervalo)
+
+    def on_current(self, instance, value):
+        """Toda navegação passa por aqui (mudar_tela, voltar, current = ...)"""
+        monitor.navegacao_iniciada(value)
+        super().on_current(instance, value)
+
+    def get_screen(self, name):
+        """Mudar de tela (mudar_tela, current = ...) passa por aqui: constrói sob demanda"""
+        if name in self.fabricas:
+            return self.construir_tela(name)
+        return super().get_screen(name)
+
+    def has_screen(self, name):
+        return name in self.fabricas or super().has_screen(name)
+
+    def tela_construida(self, nome):
+        """True se a tela já existe (não constrói)"""
+        return nome not in self.fabricas and super().has_screen(nome)
 
     def mudar_tela(self, nome_tela):
         """Função original - mantém compatibilidade"""
@@ -121,7 +222,7 @@ class Gerenciador(ScreenManager):
         app = App.get_running_app()
         
         if not app.usuario_logado:
-            print(f"❌ Acesso negado à tela '{nome_tela}' - usuário não logado")
+            log.debug("❌ Acesso negado à tela '%s' - usuário não logado", nome_tela)
             app.mostrar_popup("Faça o login para continuar!")
             # Redireciona para login
             if self.current:
@@ -147,50 +248,90 @@ class Gerenciador(ScreenManager):
 # -------------------------------
 class NerdHubApp(App):
     usuario_logado = None  # Guarda usuário atual
+    miniaturas_em_dia = True  # manifesto das miniaturas válido (ver build)
 
     def build(self):
+        inicio = time.perf_counter()
         # Inicializar banco de dados
-        print("🚀 Iniciando aplicação NerdHub...")
+        log.info("🚀 Iniciando aplicação NerdHub...")
         
-        # ✅ APENAS cria as tabelas se não existirem (dados persistentes)
-        criar_tabelas()
-        carregar_usuario_teste()
-        
-        # Debug: listar usuários
-        listar_usuarios()
+        # ✅ Esquema atualizado + usuário de teste (só verificações de tempo
+        # constante: o início não cresce com a quantidade de usuários/produtos)
+        with trecho("inicializar_banco"):
+            inicializar_banco()
+
+        # Miniaturas das imagens: só lê o manifesto; se faltar alguma, o
+        # on_start gera em segundo plano (até lá valem os originais)
+        with trecho("carregar_manifesto"):
+            self.miniaturas_em_dia = carregar_manifesto()
 
         # Carregar header primeiro - CORRIGIDO
-        Builder.load_string(HEADER_KV)
+        with trecho("Builder.load_string(HEADER_KV)"):
+            Builder.load_string(HEADER_KV)
         
-        # Carregar telas KV
-        Builder.load_file("telas/home.kv")
-        Builder.load_file("telas/login.kv")
-        Builder.load_file("telas/playstation.kv")
-        Builder.load_file("telas/xbox.kv")
-        Builder.load_file("telas/marvel.kv")
-        Builder.load_file("telas/starwars.kv")
-        Builder.load_file("telas/disney.kv")
-        Builder.load_file("telas/carrinho.kv")
-        Builder.load_file("telas/detalhes_produto.kv")
-        Builder.load_file("telas/cadastro.kv")
-        Builder.load_file("telas/perfil.kv")
-
-        # Gerenciador de telas
-        sm = Gerenciador()
-        sm.add_widget(HomeScreen(name="home"))
-        sm.add_widget(LoginScreen(name="login"))
-        sm.add_widget(PlaystationScreen(name="playstation"))
-        sm.add_widget(XboxScreen(name="xbox"))
-        sm.add_widget(MarvelScreen(name="marvel"))
-        sm.add_widget(StarWarsScreen(name="starwars"))
-        sm.add_widget(DisneyScreen(name="disney"))
-        sm.add_widget(CarrinhoScreen(name="carrinho"))
-        sm.add_widget(DetalhesProdutoScreen(name="detalhes_produto"))
-        sm.add_widget(CadastroScreen(name="cadastro"))
-        sm.add_widget(PerfilScreen(name="perfil"))
-
+        # Regras compartilhadas: grade de produtos (o ProductCard fica no home.kv,
+        # que é carregado junto com a Home, a primeira tela)
+        for kv in ("telas/grade_produtos.kv", "telas/carrossel_categorias.kv"):
+            with trecho("Builder.load_file", arquivo=kv):
+                Builder.load_file(kv)
+
+        # Gerenciador de telas: só a Home é construída agora, as demais
+        # na primeira vez que forem abertas
+        with trecho("telas_de_categoria"):
+            categorias = telas_de_categoria()
+        sm = Gerenciador(telas={**TELAS, **categorias})
+        sm.current = "home"
+
+        # Adições ao carrinho pendentes vão para o banco a cada troca de tela
+        sm.bind(current=lambda *args: fila_carrinho.descarregar())
+
+        registrar("build", inicio)
         return sm
 
+    def on_start(self):
+        """Depois do primeiro frame, adianta as telas mais prováveis"""
+        self.root.preaquecer(TELAS_PREAQUECIDAS)
+        if not self.miniaturas_em_dia:
+            gerar_miniaturas_em_segundo_plano()
+        ativar_pelo_ambiente()  # NERDHUB_PAINEL=1
+        if linha_do_tempo.ativa:
+            marcar("on_start")
+            Window.bind(on_flip=self.quadro_do_inicio)
+
+    def quadro_do_inicio(self, *args):
+        """Linha do tempo: marca o primeiro frame e exporta no primeiro com a Home preenchida"""
+        if not linha_do_tempo.marcado("primeiro frame"):
+            marcar("primeiro frame")
+        if linha_do_tempo.marcado("Home: primeira página"):
+            marcar("primeiro frame da Home com produtos")
+            Window.unbind(on_flip=self.quadro_do_inicio)
+            self.exportar_linha_do_tempo()
+
+    def exportar_linha_do_tempo(self):
+        caminho = linha_do_tempo.exportar()
+        if caminho:
+            total = max(evento["ts"] for evento in linha_do_tempo.eventos) / 1000
+            log.info("⏱️ Linha do tempo do início (%.0f ms) gravada em %s - abrir em ui.perfetto.dev",
+                     total, caminho)
+
+    def on_pause(self):
+        """App indo para segundo plano (Android pode encerrá-lo): grava o carrinho pendente"""
+        fila_carrinho.gravar()
+        return True
+
+    def on_stop(self):
+        """Grava o carrinho pendente e encerra as threads dos executores de banco e de senhas"""
+        self.exportar_linha_do_tempo()  # app fechado antes da Home aparecer
+        fila_carrinho.gravar()
+        executor.parar()
+        executor_senhas.parar()
+
+        # NERDHUB_SQL_RASTREIO=1: resumo no log (uma vez - o Kivy pode chamar on_stop de novo)
+        from database import desativar_rastreio_sql
+        rastreador = desativar_rastreio_sql()
+        if rastreador is not None:
+            log.info("🔎 SQL desta sessão:\n%s", rastreador.resumo())
+
     # ... (o resto do código permanece igual)
 
     # -------------------------------
@@ -205,54 +346,90 @@ class NerdHubApp(App):
         )
         popup.open()
 
+    def alternar_painel(self):
+        """Três toques no "NERD HUB" do header: mostra/esconde o painel de desempenho"""
+        monitor.alternar()
+
     # -------------------------------
     #  LOGIN E CADASTRO - CORRIGIDAS
     # -------------------------------
-    def fazer_login(self, email, senha):
-        """Usa a função do database.py para verificar login - CORRIGIDA"""
-        print(f"🔐 Tentando login: {email}")
+    def fazer_login(self, email, senha, ao_concluir=None):
+        """Usa a função do database.py para verificar login (em segundo plano).
+        ao_concluir(sucesso) é chamado na thread do Kivy com o resultado."""
+        log.debug("🔐 Tentando login: %s", email)
         
         if not email or not senha:
             self.mostrar_popup("Preencha todos os campos!")
-            return False
-            
-        usuario = verificar_login(email, senha)
+            if ao_concluir:
+                ao_concluir(False)
+            return
+        
+        def concluir(usuario):
+            sucesso = self.login_verificado(usuario)
+            if ao_concluir:
+                ao_concluir(sucesso)
+        
+        def falhou(erro):
+            # Erro do banco/executor não é senha errada: mensagem genérica
+            log.error("❌ Erro ao verificar login de %s: %s", email, erro)
+            self.mostrar_popup("Não foi possível entrar agora. Tente novamente.")
+            if ao_concluir:
+                ao_concluir(False)
+        
+        # Hash scrypt: roda nas threads de senha, não na fila do banco
+        com_senha(verificar_login, email, senha, ao_concluir=concluir, ao_falhar=falhou)
+
+    def login_verificado(self, usuario):
+        """Resultado de verificar_login: guarda o usuário e vai para a Home"""
         if usuario:
             self.usuario_logado = {
                 'id': usuario[0],
                 'nome': usuario[1], 
                 'email': usuario[2]
             }
-            print(f"✅ Login bem-sucedido! Usuário: {self.usuario_logado}")
+            log.debug("✅ Login bem-sucedido! Usuário: %s", self.usuario_logado)
             self.mostrar_popup(f"Bem-vindo, {usuario[1]}!")
             self.root.mudar_tela("home")
             return True
         else:
-            print("❌ Falha no login - usuário não encontrado ou senha incorreta")
+            log.debug("❌ Falha no login - usuário não encontrado ou senha incorreta")
             self.mostrar_popup("E-mail ou senha incorretos.")
             return False
 
-    def cadastrar_usuario(self, nome, email, senha):
-        """Usa a função do database.py para cadastrar - CORRIGIDA"""
-        print(f"📝 Tentando cadastrar: {nome}, {email}")
+    def cadastrar_usuario(self, nome, email, senha, ao_concluir=None):
+        """Usa a função do database.py para cadastrar (em segundo plano).
+        ao_concluir(sucesso) é chamado na thread do Kivy com o resultado."""
+        log.debug("📝 Tentando cadastrar: %s, %s", nome, email)
+        
+        def concluir(sucesso):
+            if ao_concluir:
+                ao_concluir(sucesso)
         
         if not nome or not email or not senha:
             self.mostrar_popup("Preencha todos os campos!")
-            return False
+            concluir(False)
+            return
             
         # Validação básica de email
         if "@" not in email or "." not in email:
             self.mostrar_popup("Por favor, insira um email válido!")
-            return False
-            
-        sucesso = cadastrar_usuario(nome, email, senha)
-        if sucesso:
-            self.mostrar_popup("Cadastro realizado com sucesso!")
-            print("✅ Usuário cadastrado com sucesso!")
-            return True
-        else:
-            self.mostrar_popup("E-mail já cadastrado!")
-            return False
+            concluir(False)
+            return
+        
+        def cadastrado(sucesso):
+            if sucesso:
+                self.mostrar_popup("Cadastro realizado com sucesso!")
+                log.info("✅ Usuário cadastrado com sucesso!")
+            else:
+                self.mostrar_popup("E-mail já cadastrado!")
+            concluir(sucesso)
+        
+        def falhou(erro):
+            log.error("❌ Erro ao cadastrar %s: %s", email, erro)
+            self.mostrar_popup("Não foi possível concluir o cadastro. Tente novamente.")
+            concluir(False)
+        
+        com_senha(cadastrar_usuario, nome, email, senha, ao_concluir=cadastrado, ao_falhar=falhou)
 
     # -------------------------------
     #  FUNÇÕES DE NAVEGAÇÃO COM LOGIN
@@ -285,64 +462,82 @@ class NerdHubApp(App):
             self.root.mudar_tela(nome_tela)
             return True
 
+    # -------------------------------
+    #  BUSCA
+    # -------------------------------
+    def abrir_busca(self, campo):
+        """Campo "Buscar..." do header: abre a tela de busca com o texto digitado"""
+        texto = campo.text
+        campo.focus = False
+        campo.text = ""
+        
+        tela_busca = self.root.get_screen("busca")
+        tela_busca.termo = texto
+        if self.root.current != "busca":
+            self.root.mudar_tela("busca")
+
     # -------------------------------
     #  CARRINHO - ATUALIZADAS
     # -------------------------------
     def adicionar_ao_carrinho(self, produto_info):
         """Função para adicionar produtos ao carrinho - ATUALIZADA"""
-        print(f"🛒 Adicionar ao carrinho: {produto_info['title']}")
-        print(f"🔐 Status: {'Logado' if self.usuario_logado else 'Não logado'}")
+        log.debug("🛒 Adicionar ao carrinho: %s", produto_info['title'])
+        log.debug("🔐 Status: %s", 'Logado' if self.usuario_logado else 'Não logado')
         
         # VERIFICAÇÃO IMEDIATA
         if not self.usuario_logado:
-            print("❌ Usuário não logado - redirecionando para login")
+            log.debug("❌ Usuário não logado - redirecionando para login")
             self.mostrar_popup("Faça login para adicionar produtos.")
             Clock.schedule_once(lambda dt: self.root.mudar_tela("login"), 0.5)
             return
             
-        # SE ESTIVER LOGADO - Adiciona ao carrinho NO BANCO DE DADOS
-        print(f"✅ Usuário {self.usuario_logado['nome']} adicionando ao carrinho")
-        try:
-            # Adiciona ao banco de dados
-            from database import adicionar_ao_carrinho_db
-            sucesso = adicionar_ao_carrinho_db(
-                self.usuario_logado['id'], 
-                produto_info['id']
-            )
-            
-            if sucesso:
-                self.mostrar_popup("Produto adicionado ao carrinho!")
-                # Atualiza a tela do carrinho se estiver aberta
-                self.atualizar_tela_carrinho()
-            else:
-                self.mostrar_popup("Erro ao adicionar produto ao carrinho.")
-                
-        except Exception as e:
-            print(f"💥 Erro ao adicionar ao carrinho: {e}")
-            self.mostrar_popup("Erro ao adicionar produto.")
+        # SE ESTIVER LOGADO - Entra na fila de escrita do carrinho (toques
+        # seguidos viram uma única transação, ver fila_carrinho.py)
+        log.debug("✅ Usuário %s adicionando ao carrinho", self.usuario_logado['nome'])
+        # A confirmação só aparece depois que o lote foi gravado no banco
+        fila_carrinho.adicionar(self.usuario_logado['id'], produto_info['id'],
+                                ao_gravar=self.produto_adicionado)
+
+    def produto_adicionado(self, sucesso):
+        """Resultado da gravação da fila do carrinho (thread do Kivy)"""
+        if sucesso:
+            self.mostrar_popup("Produto adicionado ao carrinho!")
+            # Atualiza a tela do carrinho se estiver aberta
+            self.atualizar_tela_carrinho()
+        else:
+            # O lote volta para a fila e entra na próxima gravação
+            self.mostrar_popup("Não foi possível salvar no carrinho agora. Tentaremos de novo.")
 
     def atualizar_tela_carrinho(self):
         """Atualiza a tela do carrinho se estiver visível"""
-        try:
-            carrinho_screen = self.root.get_screen("carrinho")
-            if carrinho_screen:
-                carrinho_screen.carregar_carrinho_usuario()
-        except:
-            pass  # Tela do carrinho não está carregada
+        if not self.root.tela_construida("carrinho") or self.root.current != "carrinho":
+            return  # ao entrar, a tela recarrega sozinha (on_pre_enter)
+        self.root.get_screen("carrinho").carregar_carrinho_usuario()
 
     def obter_carrinho_usuario(self):
         """Retorna os itens do carrinho do usuário logado"""
         if not self.usuario_logado:
             return []
         
+        fila_carrinho.gravar()  # adições pendentes entram na consulta
         from database import obter_carrinho_usuario
         return obter_carrinho_usuario(self.usuario_logado['id'])
 
+    def obter_total_carrinho(self):
+        """Retorna o total do carrinho do usuário logado em centavos"""
+        if not self.usuario_logado:
+            return 0
+        
+        fila_carrinho.gravar()  # adições pendentes entram na consulta
+        from database import obter_total_carrinho
+        return obter_total_carrinho(self.usuario_logado['id'])
+
     def remover_do_carrinho(self, produto_id):
         """Remove produto do carrinho do usuário"""
         if not self.usuario_logado:
             return False
         
+        fila_carrinho.gravar()  # senão a adição pendente reapareceria depois
         from database import remover_do_carrinho_db
         return remover_do_carrinho_db(self.usuario_logado['id'], produto_id)
 
@@ -351,6 +546,7 @@ class NerdHubApp(App):
         if not self.usuario_logado:
             return False
         
+        fila_carrinho.gravar()  # senão a adição pendente reapareceria depois
         from database import limpar_carrinho_usuario
         return limpar_carrinho_usuario(self.usuario_logado['id'])
 
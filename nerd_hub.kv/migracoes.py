@@ -0,0 +1,329 @@
+# migracoes.py
+"""
+Migrações de Esquema
+====================
+O banco guarda a versão do esquema em PRAGMA user_version. Cada migração
+do registro MIGRACOES tem um número; ao iniciar, o app aplica só as que
+forem maiores que a versão gravada no arquivo. Um banco já na versão
+atual custa uma única leitura do pragma.
+
+Cada migração roda na sua própria transação (BEGIN IMMEDIATE) junto com a
+atualização do user_version: ou ela é aplicada por inteiro, ou nada muda.
+
+Bancos criados antes deste registro estão na versão 0 e podem ter
+qualquer formato histórico, por isso as migrações verificam o que já
+existe (colunas, tabelas) antes de alterar.
+
+Para mudar o esquema: acrescente uma função no fim de MIGRACOES com o
+próximo número - nunca altere uma migração já publicada.
+
+Uso:
+    with conectar() as conn:
+        aplicadas = migrar(conn)
+"""
+
+from precos import texto_para_centavos
+from registro import obter_logger
+
+log = obter_logger(__name__)
+
+DESCRICAO_PADRAO = ("Produto de alta qualidade para verdadeiros nerds! Este item é perfeito "
+                    "para colecionadores e fãs que buscam itens exclusivos e autênticos.")
+
+# Categorias iniciais: (slug, título, banner, ordem)
+CATEGORIAS_INICIAIS = [
+    ("disney", "Disney", "imagens/imagens_home/banner_disney.png", 1),
+    ("xbox", "Xbox", "imagens/imagens_home/banner_xbox.png", 2),
+    ("marvel", "Marvel", "imagens/imagens_home/banner_marvel.png", 3),
+    ("playstation", "PlayStation", "imagens/imagens_home/banner_playstation.png", 4),
+    ("starwars", "Star Wars", "imagens/imagens_home/banner_starwars.png", 5),
+]
+
+# Produtos iniciais: (título, preço, imagem, categoria)
+PRODUTOS_INICIAIS = [
+    # Produtos Gerais - CAMINHOS CORRIGIDOS PARA ANDROID
+    ("FORZA - Xbox Series X", "R$ 179,00", "imagens/imagem_produtos_home/forza.jpg", "xbox"),
+    ("LEGO Minecraft - Aventura", "R$ 1.349,90", "imagens/imagem_produtos_home/lego_minecraft.jpg", "lego"),
+    ("PlayStation 5 Pro", "R$ 6.509,00", "imagens/imagem_produtos_home/ps5.jpg", "playstation"),
+    ("PlayStation Portal", "R$ 1.349,90", "imagens/imagem_produtos_home/portal.jpg", "playstation"),
+    ("Funko Pop! Star Wars", "R$ 389,90", "imagens/imagem_produtos_home/funko.jpg", "starwars"),
+    ("Camiseta Marvel Avengers", "R$ 82,35", "imagens/imagem_produtos_home/camiseta_marvel.jpg", "marvel"),
+    ("Pelúcia Chewbacca", "R$ 141,50", "imagens/imagem_produtos_home/chewbacca.jpg", "starwars"),
+    ("LEGO Star Wars - 75257", "R$ 201,00", "imagens/imagem_produtos_home/lego_starwars.jpg", "starwars"),
+
+    # Produtos Disney
+    ("Pelúcia Mickey Mouse - Disney", "R$ 89,90", "imagens/imagem_produtos_home/mickey.jpg", "disney"),
+    ("LEGO Disney Castle - 43222", "R$ 1.299,90", "imagens/imagem_produtos_home/lego_castle.jpg", "disney"),
+    ("Funko Pop! Mickey Mouse - Disney", "R$ 79,90", "imagens/imagem_produtos_home/funko_mickey.jpg", "disney"),
+    ("Camiseta Mickey Classic - Disney", "R$ 59,90", "imagens/imagem_produtos_home/camiseta_mickey.jpg", "disney"),
+
+    # Produtos Marvel
+    ("Action Figure Homem de Ferro", "R$ 129,90", "imagens/imagem_produtos_home/camiseta_marvel.jpg", "marvel"),
+    ("Camiseta Avengers", "R$ 79,90", "imagens/imagem_produtos_home/camiseta_marvel.jpg", "marvel"),
+
+    # Produtos Star Wars
+    ("Action Figure Darth Vader", "R$ 149,90", "imagens/imagem_produtos_home/darth_vader.jpg", "starwars"),
+    ("LEGO Millennium Falcon", "R$ 899,90", "imagens/imagem_produtos_home/millennium_falcon.jpg", "starwars"),
+
+    # Produtos PlayStation
+    ("Controle DualSense PS5", "R$ 449,00", "imagens/imagem_produtos_home/ps5.jpg", "playstation"),
+    ("Headset PlayStation Pulse 3D", "R$ 599,00", "imagens/imagem_produtos_home/portal.jpg", "playstation"),
+
+    # Produtos Xbox
+    ("Controle Xbox Series X", "R$ 499,00", "imagens/imagem_produtos_home/forza.jpg", "xbox"),
+    ("Headset Xbox Wireless", "R$ 699,00", "imagens/imagem_produtos_home/forza.jpg", "xbox"),
+]
+
+# Índice de cobertura do catálogo e trigger que indexa produtos novos na
+# busca: importar_produtos (importacao.py) tira os dois durante a carga em
+# massa e recria no fim (ver reparar_catalogo)
+INDICE_CATALOGO = """
+    CREATE INDEX IF NOT EXISTS idx_produtos_categoria
+    ON produtos (categoria, id, title, price_cents, image)
+    """
+
+GATILHO_BUSCA_INSERCAO = """
+    CREATE TRIGGER IF NOT EXISTS produtos_fts_ai AFTER INSERT ON produtos BEGIN
+        INSERT INTO produtos_fts (rowid, title, descricao, categoria)
+        VALUES (new.id, new.title, new.descricao, new.categoria);
+    END
+    """
+
+
+def _colunas(cur, tabela):
+    return {linha[1] for linha in cur.execute(f"PRAGMA table_info({tabela})")}
+
+
+def _existe_tabela(cur, nome):
+    return cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                       (nome,)).fetchone() is not None
+
+
+# =============================================================================
+# MIGRAÇÕES (em ordem; nunca altere uma que já foi publicada)
+# =============================================================================
+
+def _m001_tabelas(cur):
+    """Tabelas usuarios, produtos e carrinho (formato atual para bancos novos)"""
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS usuarios (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome TEXT NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        senha TEXT NOT NULL,
+        telefone TEXT,
+        data_nascimento TEXT,
+        data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    cur.execute(f"""
+    CREATE TABLE IF NOT EXISTS produtos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        price TEXT NOT NULL,
+        price_cents INTEGER NOT NULL DEFAULT 0,
+        image TEXT,
+        categoria TEXT,
+        descricao TEXT DEFAULT '{DESCRICAO_PADRAO}'
+    )
+    """)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS carrinho (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        usuario_id INTEGER NOT NULL,
+        produto_id INTEGER NOT NULL,
+        quantidade INTEGER DEFAULT 1,
+        adicionado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (usuario_id) REFERENCES usuarios (id),
+        FOREIGN KEY (produto_id) REFERENCES produtos (id),
+        UNIQUE(usuario_id, produto_id)
+    )
+    """)
+
+def _m002_descricao(cur):
+    """Coluna descricao em produtos (bancos antigos)"""
+    if "descricao" not in _colunas(cur, "produtos"):
+        cur.execute(f"ALTER TABLE produtos ADD COLUMN descricao TEXT DEFAULT '{DESCRICAO_PADRAO}'")
+
+def _m003_perfil(cur):
+    """Colunas de perfil em usuarios (bancos antigos)"""
+    colunas = _colunas(cur, "usuarios")
+    if "telefone" not in colunas:
+        cur.execute("ALTER TABLE usuarios ADD COLUMN telefone TEXT")
+    if "data_nascimento" not in colunas:
+        cur.execute("ALTER TABLE usuarios ADD COLUMN data_nascimento TEXT")
+    if "data_criacao" not in colunas:
+        # ALTER TABLE não aceita DEFAULT CURRENT_TIMESTAMP: linhas antigas ficam NULL
+        cur.execute("ALTER TABLE usuarios ADD COLUMN data_criacao TIMESTAMP")
+
+def _m004_preco_centavos(cur):
+    """Preço numérico em centavos (price_cents) a partir do texto"""
+    if "price_cents" in _colunas(cur, "produtos"):
+        return
+    cur.execute("ALTER TABLE produtos ADD COLUMN price_cents INTEGER NOT NULL DEFAULT 0")
+    cur.execute("SELECT id, price FROM produtos")
+    cur.executemany(
+        "UPDATE produtos SET price_cents = ? WHERE id = ?",
+        [(texto_para_centavos(preco), produto_id) for produto_id, preco in cur.fetchall()]
+    )
+
+def _m005_caminhos_imagens(cur):
+    """Caminhos 'nerd_hub.kv/imagens/...' viram 'imagens/...' (Android)"""
+    cur.execute("""
+        UPDATE produtos
+        SET image = REPLACE(image, 'nerd_hub.kv/imagens/', 'imagens/')
+        WHERE image LIKE 'nerd_hub.kv/imagens/%'
+    """)
+
+def _m006_indices(cur):
+    """Índices de cobertura do catálogo (categoria paginada) e do carrinho"""
+    cur.execute(INDICE_CATALOGO)
+    cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_carrinho_usuario_data
+    ON carrinho (usuario_id, adicionado_em, produto_id, quantidade)
+    """)
+
+def _m007_categorias(cur):
+    """Tabela de categorias com as cinco categorias iniciais"""
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS categorias (
+        slug TEXT PRIMARY KEY,
+        titulo TEXT NOT NULL,
+        banner TEXT,
+        ordem INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+    if cur.execute("SELECT 1 FROM categorias LIMIT 1").fetchone() is None:
+        cur.executemany("INSERT INTO categorias (slug, titulo, banner, ordem) VALUES (?, ?, ?, ?)",
+                        CATEGORIAS_INICIAIS)
+
+def _m008_busca(cur):
+    """Índice FTS5 de produtos (title, descricao, categoria) e seus triggers"""
+    if _existe_tabela(cur, "produtos_fts"):
+        return
+    try:
+        # remove_diacritics 2: "pelucia" encontra "Pelúcia"
+        cur.execute("""
+        CREATE VIRTUAL TABLE produtos_fts USING fts5(
+            title, descricao, categoria,
+            content = 'produtos',
+            content_rowid = 'id',
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+        """)
+    except Exception as e:
+        # SQLite compilado sem FTS5 (alguns builds Android): busca usa LIKE
+        log.warning("⚠️ FTS5 indisponível, busca usará LIKE: %s", e)
+        return
+
+    # Título pesa mais que categoria, que pesa mais que descrição
+    cur.execute("INSERT INTO produtos_fts(produtos_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0, 3.0)')")
+
+    # Triggers mantêm o índice sincronizado com a tabela produtos
+    cur.execute(GATILHO_BUSCA_INSERCAO)
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS produtos_fts_ad AFTER DELETE ON produtos BEGIN
+        INSERT INTO produtos_fts (produtos_fts, rowid, title, descricao, categoria)
+        VALUES ('delete', old.id, old.title, old.descricao, old.categoria);
+    END
+    """)
+    cur.execute("""
+    CREATE TRIGGER IF NOT EXISTS produtos_fts_au AFTER UPDATE OF title, descricao, categoria ON produtos BEGIN
+        INSERT INTO produtos_fts (produtos_fts, rowid, title, descricao, categoria)
+        VALUES ('delete', old.id, old.title, old.descricao, old.categoria);
+        INSERT INTO produtos_fts (rowid, title, descricao, categoria)
+        VALUES (new.id, new.title, new.descricao, new.categoria);
+    END
+    """)
+
+    # Indexa os produtos que já existem no banco
+    cur.execute("INSERT INTO produtos_fts(produtos_fts) VALUES ('rebuild')")
+
+def _m009_produtos_iniciais(cur):
+    """Catálogo inicial, só se o banco não tiver nenhum produto"""
+    if cur.execute("SELECT 1 FROM produtos LIMIT 1").fetchone() is not None:
+        return
+    cur.executemany(
+        "INSERT INTO produtos (title, price, price_cents, image, categoria) VALUES (?, ?, ?, ?, ?)",
+        [(title, price, texto_para_centavos(price), image, categoria)
+         for title, price, image, categoria in PRODUTOS_INICIAIS]
+    )
+    log.info("📦 %s produtos carregados no banco", len(PRODUTOS_INICIAIS))
+
+
+# (versão, descrição, função) - a versão do banco é a da última aplicada
+MIGRACOES = [
+    (1, "tabelas usuarios, produtos e carrinho", _m001_tabelas),
+    (2, "coluna descricao em produtos", _m002_descricao),
+    (3, "colunas de perfil em usuarios", _m003_perfil),
+    (4, "preço em centavos (price_cents)", _m004_preco_centavos),
+    (5, "caminhos de imagens relativos", _m005_caminhos_imagens),
+    (6, "índices de catálogo e carrinho", _m006_indices),
+    (7, "tabela categorias", _m007_categorias),
+    (8, "índice de busca FTS5", _m008_busca),
+    (9, "produtos iniciais", _m009_produtos_iniciais),
+]
+
+VERSAO_ATUAL = MIGRACOES[-1][0]
+
+
+# =============================================================================
+# EXECUÇÃO
+# =============================================================================
+
+def versao(conn):
+    """Versão do esquema gravada no arquivo (PRAGMA user_version)"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrar(conn, migracoes=MIGRACOES):
+    """Aplica as migrações pendentes, cada uma na sua transação.
+
+    Returns:
+        int: quantidade de migrações aplicadas (0 = banco já estava atualizado)
+    """
+    atual = versao(conn)
+    if atual >= migracoes[-1][0]:
+        if atual > migracoes[-1][0]:
+            log.warning("⚠️ Banco na versão %s, mais nova que a do app (%s)", atual, migracoes[-1][0])
+        return 0
+
+    aplicadas = 0
+    for numero, descricao, funcao in migracoes:
+        if numero <= atual:
+            continue
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Outro processo pode ter migrado enquanto esperávamos o lock
+            if versao(conn) >= numero:
+                conn.rollback()
+                continue
+            funcao(conn.cursor())
+            conn.execute(f"PRAGMA user_version = {int(numero)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            log.error("❌ Migração %s (%s) falhou - banco mantido na versão %s", numero, descricao, versao(conn))
+            raise
+
+        aplicadas += 1
+        log.info("🔄 Migração %s: %s", numero, descricao)
+
+    return aplicadas
+
+
+def reparar_catalogo(cur):
+    """Recria o índice do catálogo e o trigger de inserção da busca, se faltarem.
+
+    Returns:
+        bool: True se o trigger foi recriado - produtos inseridos sem ele não
+        estão no índice FTS, que precisa de um 'rebuild'
+    """
+    cur.execute(INDICE_CATALOGO)
+    if not _existe_tabela(cur, "produtos_fts"):
+        return False
+    faltava = cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'produtos_fts_ai'"
+                          ).fetchone() is None
+    cur.execute(GATILHO_BUSCA_INSERCAO)
+    return faltava
@@ -0,0 +1,509 @@
+# miniaturas.py
+"""
+Miniaturas e Cache de Texturas
+==============================
+As imagens originais dos produtos chegam a 2560x2560 (lego_minecraft.jpg),
+mas são exibidas em caixas de ~130dp. Este módulo:
+
+1. Gera miniaturas do tamanho certo para cada lugar onde a imagem aparece
+   (card, carrinho, detalhes, banner) e para cada densidade de tela (@1x,
+   @2x, @3x), em imagens/miniaturas/. Roda antes do build:
+
+       python miniaturas.py --densidades 1 2 3
+
+   ou no primeiro start do app (só a densidade atual), em segundo plano:
+   uma thread lista e decodifica os originais e a thread do Kivy só faz a
+   redução no Fbo, uma imagem por frame; até terminar, o app usa as imagens
+   originais. O resultado fica em imagens/miniaturas/manifesto.json (qual
+   arquivo usar para cada variante), e os próximos starts só leem o
+   manifesto e comparam o mtime das pastas de origem - sem listar nem
+   checar cada imagem. Imagem trocada no lugar (mesmo nome): rodar o
+   comando acima ou apagar o manifesto. Uma variante cuja miniatura não
+   fica menor que o original (em bytes) não é gravada: o manifesto aponta
+   para o próprio original.
+
+2. Mantém um cache LRU de texturas com orçamento de memória de GPU,
+   compartilhado por ProductCard, CarrinhoCard e a tela de detalhes
+   (ver paginas/imagem_produto.py). carregar() decodifica o arquivo numa
+   thread separada e só cria a textura (GPU) na thread do Kivy; pedidos
+   para o mesmo arquivo são agrupados e podem ser cancelados.
+   precarregar() só decodifica e guarda (ver precarga.py), para a tela
+   seguinte achar a textura pronta.
+
+A redução usa o próprio Kivy (textura com mipmap desenhada num Fbo), sem
+dependências extras. Se a miniatura não existir, a imagem original é usada.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+if __name__ == "__main__":
+    os.environ.setdefault("KIVY_NO_ARGS", "1")  # argumentos são do argparse abaixo
+
+from kivy.clock import Clock
+from kivy.core.image import Image as CoreImage, ImageLoader
+from kivy.metrics import Metrics
+from registro import obter_logger
+
+log = obter_logger(__name__)
+
+PASTA_MINIATURAS = os.path.join("imagens", "miniaturas")
+MANIFESTO = os.path.join(PASTA_MINIATURAS, "manifesto.json")
+
+# Muda quando o jeito de gerar muda: manifestos antigos são ignorados e tudo é gerado de novo
+VERSAO_MINIATURAS = 2  # 2: miniaturas reduzidas eram gravadas de cabeça para baixo
+
+# Maior lado (em dp) de cada variante, conforme onde a imagem aparece
+TIPOS = {
+    "card": 200,      # ProductCard: ~190 x 130dp
+    "carrinho": 120,  # CarrinhoCard: 30% da largura x 100dp
+    "detalhe": 300,   # tela de detalhes: 300 x 300
+    "banner": 420,    # banners da largura da tela
+}
+
+# Quais variantes gerar: (pasta, prefixo dos arquivos, tipos)
+ORIGENS = (
+    (os.path.join("imagens", "imagem_produtos_home"), "", ("card", "carrinho", "detalhe")),
+    (os.path.join("imagens", "imagens_home"), "banner_", ("banner",)),
+)
+
+# Abaixo dessa redução não compensa re-codificar: o original é copiado
+ESCALA_MINIMA = 0.75
+
+# Memória de GPU (aprox. largura x altura x 4 bytes) reservada às texturas
+ORCAMENTO_TEXTURAS = 32 * 1024 * 1024
+
+# Threads que decodificam imagens em segundo plano
+THREADS_DECODIFICACAO = 2
+
+EXTENSOES = (".jpg", ".jpeg", ".png")
+
+
+def densidade_atual():
+    """Densidade arredondada para cima (1, 2, 3...) usada para escolher a variante"""
+    return max(1, math.ceil(Metrics.density))
+
+
+def caminho_miniatura(origem, tipo, densidade=None):
+    """imagens/imagem_produtos_home/forza.jpg -> imagens/miniaturas/card@2x/imagem_produtos_home/forza.jpg"""
+    densidade = densidade or densidade_atual()
+    pasta, nome = os.path.split(os.path.normpath(origem))
+    return os.path.join(PASTA_MINIATURAS, f"{tipo}@{densidade}x", os.path.basename(pasta), nome)
+
+
+_resolvidos = {}  # (origem, tipo) -> arquivo usado na densidade atual (vem do manifesto)
+
+def resolver(origem, tipo):
+    """Caminho da miniatura adequada segundo o manifesto, senão a imagem original"""
+    return _resolvidos.get((os.path.normpath(origem), tipo), origem)
+
+
+# =============================================================================
+# MANIFESTO
+# =============================================================================
+
+def _chave(origem, tipo, densidade):
+    return f"{tipo}@{densidade}x|{os.path.normpath(origem)}"
+
+
+def _estado_das_pastas():
+    """mtime de cada pasta de origem (muda quando uma imagem é adicionada ou removida)"""
+    return {pasta: os.stat(pasta).st_mtime_ns for pasta, _, _ in ORIGENS if os.path.isdir(pasta)}
+
+
+def _ler_manifesto():
+    try:
+        with open(MANIFESTO, encoding="utf-8") as arquivo:
+            manifesto = json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+    return manifesto if manifesto.get("versao") == VERSAO_MINIATURAS else None
+
+
+def _aplicar(manifesto, densidade):
+    """Thread do Kivy: passa a resolver as imagens pelo manifesto"""
+    sufixo = f"@{densidade}x"
+    resolvidos = {}
+    for chave, caminho in manifesto["arquivos"].items():
+        variante, origem = chave.split("|", 1)
+        tipo, _, densidade_variante = variante.partition("@")
+        if f"@{densidade_variante}" == sufixo:
+            resolvidos[(origem, tipo)] = caminho
+    _resolvidos.clear()
+    _resolvidos.update(resolvidos)
+
+
+def carregar_manifesto(densidade=None):
+    """Usa o manifesto se ele estiver em dia; False quando é preciso gerar miniaturas"""
+    densidade = densidade or densidade_atual()
+    manifesto = _ler_manifesto()
+    if (manifesto is None or densidade not in manifesto["densidades"]
+            or manifesto["pastas"] != _estado_das_pastas()):
+        return False
+    _aplicar(manifesto, densidade)
+    return True
+
+
+def _gravar_manifesto(densidades):
+    """Registra o arquivo usado por cada variante (miniatura ou original) e o estado das pastas"""
+    pastas = _estado_das_pastas()
+    anterior = _ler_manifesto()
+    if anterior and anterior["pastas"] == pastas:
+        densidades = set(densidades) | set(anterior["densidades"])
+
+    arquivos = {}
+    for origem, tipos in _imagens():
+        for tipo in tipos:
+            for densidade in densidades:
+                destino = caminho_miniatura(origem, tipo, densidade)
+                arquivos[_chave(origem, tipo, densidade)] = destino if os.path.exists(destino) else origem
+
+    manifesto = {"versao": VERSAO_MINIATURAS, "gerado_em": time.time(), "densidades": sorted(densidades),
+                 "pastas": pastas, "arquivos": arquivos}
+    os.makedirs(PASTA_MINIATURAS, exist_ok=True)
+    temporario = MANIFESTO + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(manifesto, arquivo, indent=1)
+    os.replace(temporario, MANIFESTO)
+    return manifesto
+
+
+# =============================================================================
+# GERAÇÃO
+# =============================================================================
+
+def _imagens():
+    """(caminho da imagem original, tipos de variante) de cada imagem das ORIGENS"""
+    for pasta, prefixo, tipos in ORIGENS:
+        if not os.path.isdir(pasta):
+            continue
+        for nome in sorted(os.listdir(pasta)):
+            if nome.startswith(prefixo) and nome.lower().endswith(EXTENSOES):
+                yield os.path.join(pasta, nome), tipos
+
+
+def _em_dia(origem, tipo, densidade, destino, anterior):
+    """A variante já foi gerada (ou trocada pelo original) a partir da versão atual da imagem"""
+    if anterior is None:
+        return False  # sem manifesto desta versão: arquivos antigos não servem
+    usado = anterior["arquivos"].get(_chave(origem, tipo, densidade))
+    if usado == destino:
+        return os.path.exists(destino) and os.path.getmtime(destino) >= os.path.getmtime(origem)
+    if usado == os.path.normpath(origem):
+        return os.path.getmtime(origem) <= anterior["gerado_em"]
+    return False
+
+
+def _reduzir(textura, largura, altura, destino):
+    """Desenha a textura (com mipmap) num Fbo do tamanho final e salva em disco"""
+    from kivy.graphics import Fbo, Rectangle, ClearColor, ClearBuffers, Color
+
+    fbo = Fbo(size=(largura, altura))
+    with fbo:
+        ClearColor(1, 1, 1, 0)
+        ClearBuffers()
+        Color(1, 1, 1, 1)
+        Rectangle(texture=textura, size=(largura, altura))
+    fbo.draw()
+    # O Fbo guarda as linhas de baixo para cima: flipped=True grava a imagem em pé
+    fbo.texture.save(destino, flipped=True)
+
+
+def _pendentes(densidades):
+    """(origem, [(tipo, densidade, destino)]) das imagens com variantes faltando ou desatualizadas"""
+    anterior = _ler_manifesto()
+    for origem, tipos in _imagens():
+        pendentes = [
+            (tipo, densidade, caminho_miniatura(origem, tipo, densidade))
+            for tipo in tipos for densidade in densidades
+            if not _em_dia(origem, tipo, densidade, caminho_miniatura(origem, tipo, densidade), anterior)
+        ]
+        if pendentes:
+            yield origem, pendentes
+
+
+def _gerar_variantes(origem, textura, pendentes):
+    """Grava as variantes de uma imagem a partir da textura original (thread do Kivy: usa GL).
+    Retorna quantas miniaturas foram gravadas."""
+    textura.min_filter = "linear_mipmap_linear"
+    largura, altura = textura.size
+    gravadas = 0
+    for tipo, densidade, destino in pendentes:
+        escala = TIPOS[tipo] * densidade / max(largura, altura)
+        if escala < ESCALA_MINIMA:
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            _reduzir(textura, max(1, round(largura * escala)), max(1, round(altura * escala)), destino)
+            if os.path.getsize(destino) < os.path.getsize(origem):
+                gravadas += 1
+                continue
+        # O original já é (quase) do tamanho dessa variante, ou a miniatura não
+        # ficou menor que ele: o manifesto aponta para o original
+        if os.path.exists(destino):
+            os.remove(destino)
+    return gravadas
+
+
+def gerar_miniaturas(densidades=None):
+    """Gera as miniaturas que faltam ou estão desatualizadas e grava o manifesto.
+    Síncrono (linha de comando, benchmarks); precisa de uma janela (contexto GL).
+
+    Returns:
+        int: quantidade de arquivos gerados
+    """
+    densidades = densidades or [densidade_atual()]
+    gerados = 0
+
+    for origem, pendentes in _pendentes(densidades):
+        # Decodifica o original uma única vez para todas as variantes
+        try:
+            textura = CoreImage(origem, mipmap=True, nocache=True).texture
+        except Exception as e:
+            log.error("❌ Erro ao ler %s: %s", origem, e)
+            continue
+        gerados += _gerar_variantes(origem, textura, pendentes)
+
+    _aplicar(_gravar_manifesto(densidades), densidade_atual())
+    if gerados:
+        log.info("🖼️ %s miniaturas geradas em %s", gerados, PASTA_MINIATURAS)
+    return gerados
+
+
+def gerar_miniaturas_em_segundo_plano():
+    """Gera as miniaturas da densidade atual sem travar a interface (ver o topo do arquivo)"""
+    threading.Thread(target=_gerar_em_segundo_plano, args=([densidade_atual()],),
+                     name="miniaturas", daemon=True).start()
+
+
+def _gerar_em_segundo_plano(densidades):
+    """Thread 'miniaturas': lista e decodifica; cada redução vai para a thread do Kivy"""
+    gerados = 0
+    for origem, pendentes in _pendentes(densidades):
+        try:
+            imagem = ImageLoader.load(origem, mipmap=True, nocache=True)
+        except Exception as e:
+            log.error("❌ Erro ao ler %s: %s", origem, e)
+            continue
+
+        # Um original decodificado por vez: espera a redução terminar
+        pronto = threading.Event()
+
+        def reduzir(dt, origem=origem, imagem=imagem, pendentes=pendentes):
+            nonlocal gerados
+            try:
+                if imagem.texture is not None:
+                    gerados += _gerar_variantes(origem, imagem.texture, pendentes)
+            except Exception as e:
+                log.error("❌ Erro ao gerar miniaturas de %s: %s", origem, e)
+            finally:
+                pronto.set()
+
+        Clock.schedule_once(reduzir, 0)
+        pronto.wait()
+
+    manifesto = _gravar_manifesto(densidades)
+    densidade = densidades[0]
+    Clock.schedule_once(lambda dt: _aplicar(manifesto, densidade), 0)
+    if gerados:
+        log.info("🖼️ %s miniaturas geradas em %s", gerados, PASTA_MINIATURAS)
+
+
+# =============================================================================
+# CACHE DE TEXTURAS
+# =============================================================================
+
+class PedidoTextura:
+    """Carregamento assíncrono pedido por um widget; cancelar() descarta a entrega"""
+
+    def __init__(self, ao_concluir):
+        self.ao_concluir = ao_concluir
+        self.cancelado = False
+
+    def cancelar(self):
+        self.cancelado = True
+
+
+class CacheTexturas:
+    """Cache LRU de texturas limitado por memória (usar só na thread do Kivy;
+    só _pendentes é lido também pelas threads de imagens, sob o _lock)"""
+
+    def __init__(self, orcamento=ORCAMENTO_TEXTURAS):
+        self.orcamento = orcamento
+        self._texturas = OrderedDict()
+        self._pendentes = {}  # caminho -> pedidos aguardando a decodificação
+        self._lock = threading.Lock()
+        self._threads = None
+        self.bytes_usados = 0
+        self.acertos = 0
+        self.falhas = 0
+
+    def _em_cache(self, caminho):
+        textura = self._texturas.get(caminho)
+        if textura is not None:
+            self._texturas.move_to_end(caminho)
+            self.acertos += 1
+        return textura
+
+    def _guardar(self, caminho, textura):
+        self._texturas[caminho] = textura
+        self.bytes_usados += self._tamanho(textura)
+        self._liberar()
+
+    def obter(self, caminho):
+        """Textura da imagem em 'caminho' (ou None se não puder ser lida); decodifica na hora"""
+        textura = self._em_cache(caminho)
+        if textura is not None:
+            return textura
+
+        self.falhas += 1
+        try:
+            textura = CoreImage(caminho, nocache=True).texture
+        except Exception as e:
+            log.error("❌ Erro ao carregar imagem %s: %s", caminho, e)
+            return None
+
+        self._guardar(caminho, textura)
+        return textura
+
+    def carregar(self, caminho, ao_concluir):
+        """Entrega a textura com ao_concluir(textura) sem travar a interface.
+
+        Se já estiver em cache, chama ao_concluir na hora e retorna None;
+        senão retorna um PedidoTextura que pode ser cancelado. Se o arquivo
+        não puder ser lido, ao_concluir recebe None.
+        """
+        textura = self._em_cache(caminho)
+        if textura is not None:
+            ao_concluir(textura)
+            return None
+
+        pedido = PedidoTextura(ao_concluir)
+        with self._lock:
+            if caminho in self._pendentes:
+                # Já está sendo decodificado para outro widget
+                self._pendentes[caminho].append(pedido)
+                return pedido
+            self._pendentes[caminho] = [pedido]
+
+        self.falhas += 1
+        self._enviar(caminho)
+        return pedido
+
+    def precarregar(self, caminho):
+        """Decodifica em segundo plano e só guarda no cache (ninguém espera a entrega)"""
+        with self._lock:
+            if caminho in self._texturas or caminho in self._pendentes:
+                return
+            self._pendentes[caminho] = []
+        self._enviar(caminho)
+
+    def _enviar(self, caminho):
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(THREADS_DECODIFICACAO, thread_name_prefix="imagens")
+        self._threads.submit(self._decodificar, caminho)
+
+    def _decodificar(self, caminho):
+        """Thread de imagens: lê e decodifica o arquivo (sem tocar na GPU)"""
+        with self._lock:
+            pedidos = self._pendentes.get(caminho, ())
+            desistir = pedidos and all(pedido.cancelado for pedido in pedidos)
+        if desistir:
+            Clock.schedule_once(lambda dt: self._desistir(caminho), 0)
+            return
+        try:
+            imagem = ImageLoader.load(caminho, nocache=True)
+        except Exception as e:
+            log.error("❌ Erro ao carregar imagem %s: %s", caminho, e)
+            imagem = None
+        Clock.schedule_once(lambda dt: self._entregar(caminho, imagem), 0)
+
+    def _desistir(self, caminho):
+        """Thread do Kivy: descarta a decodificação de pedidos todos cancelados,
+        a não ser que um widget tenha pedido (ou retomado) a imagem nesse meio tempo"""
+        with self._lock:
+            if any(not pedido.cancelado for pedido in self._pendentes.get(caminho, ())):
+                descartar = False
+            else:
+                self._pendentes.pop(caminho, None)
+                descartar = True
+        if not descartar:
+            self._enviar(caminho)
+
+    def _entregar(self, caminho, imagem):
+        """Thread do Kivy: cria a textura e avisa os pedidos não cancelados
+        (com None se a imagem não pôde ser lida)"""
+        with self._lock:
+            pedidos = [pedido for pedido in self._pendentes.pop(caminho, ()) if not pedido.cancelado]
+        textura = None
+        if imagem is not None:
+            try:
+                textura = imagem.texture
+            except Exception as e:
+                log.error("❌ Erro ao criar a textura de %s: %s", caminho, e)
+        if textura is not None:
+            self._guardar(caminho, textura)
+        for pedido in pedidos:
+            pedido.ao_concluir(textura)
+
+    @staticmethod
+    def _tamanho(textura):
+        return textura.width * textura.height * 4
+
+    def _liberar(self):
+        # Descarta as menos usadas recentemente; widgets que ainda exibem
+        # uma textura descartada continuam com a sua referência
+        while self.bytes_usados > self.orcamento and len(self._texturas) > 1:
+            _, textura = self._texturas.popitem(last=False)
+            self.bytes_usados -= self._tamanho(textura)
+
+    def limpar(self):
+        self._texturas.clear()
+        self.bytes_usados = 0
+
+    def estatisticas(self):
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "pendentes": len(self._pendentes),
+            "texturas": len(self._texturas),
+            "memoria_mb": self.bytes_usados / (1024 * 1024),
+        }
+
+
+cache_texturas = CacheTexturas()
+
+
+def obter_textura(origem, tipo="card"):
+    """Textura da variante 'tipo' da imagem, pelo cache compartilhado"""
+    if not origem:
+        return None
+    return cache_texturas.obter(resolver(origem, tipo))
+
+
+def carregar_textura(origem, tipo, ao_concluir):
+    """Versão assíncrona de obter_textura (ver CacheTexturas.carregar)"""
+    return cache_texturas.carregar(resolver(origem, tipo), ao_concluir)
+
+
+def precarregar_textura(origem, tipo):
+    """Deixa a variante 'tipo' da imagem no cache, sem travar a interface"""
+    if origem:
+        cache_texturas.precarregar(resolver(origem, tipo))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    parser = argparse.ArgumentParser(description="Gera as miniaturas das imagens do app")
+    parser.add_argument("--densidades", type=int, nargs="+", default=[1, 2, 3])
+    args = parser.parse_args()
+
+    from kivy.base import EventLoop
+    EventLoop.ensure_window()
+    gerar_miniaturas(args.densidades)
@@ -0,0 +1,108 @@
+# paginas/busca.py
+"""
+Tela de Busca
+=============
+Busca produtos enquanto o usuário digita. Cada tecla reinicia um timer
+(Clock.create_trigger), e a consulta ao índice FTS5 só roda quando a
+digitação para por alguns instantes. A consulta roda no executor de
+banco; uma busca nova cancela o resultado da anterior.
+"""
+
+from kivy.uix.screenmanager import Screen
+from kivy.properties import StringProperty
+from kivy.clock import Clock
+from database import buscar_produtos
+from executor_banco import em_segundo_plano
+
+# Espera após a última tecla antes de consultar o banco (segundos)
+ATRASO_BUSCA = 0.3
+
+# Quantidade de resultados exibidos
+LIMITE_RESULTADOS = 40
+
+
+class BuscaScreen(Screen):
+    termo = StringProperty("")
+    mensagem = StringProperty("Digite para buscar produtos")
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._busca_agendada = Clock.create_trigger(self.executar_busca, ATRASO_BUSCA)
+        self.tarefa = None
+
+    def on_enter(self, *args):
+        """Coloca o cursor no campo de busca ao abrir a tela"""
+        Clock.schedule_once(lambda dt: setattr(self.ids.busca_input, "focus", True), 0)
+
+    def agendar_busca(self, texto):
+        """Chamado a cada tecla: reinicia o timer de busca (debounce)"""
+        self.termo = texto
+        self._busca_agendada.cancel()
+        self._busca_agendada()
+
+    def buscar_agora(self, texto):
+        """Enter no teclado: busca imediatamente"""
+        self.termo = texto
+        self._busca_agendada.cancel()
+        self.executar_busca()
+
+    def executar_busca(self, *args):
+        """Consulta o índice de busca em segundo plano"""
+        grid = self.ids.resultados_grid
+        if self.tarefa:
+            self.tarefa.cancelar()
+
+        termo = self.termo.strip()
+        if not termo:
+            grid.definir_produtos([])
+            grid.tem_mais = False
+            self.mensagem = "Digite para buscar produtos"
+            return
+
+        grid.definir_produtos([])
+        grid.carregando = True
+        self.mensagem = "Buscando..."
+        self.tarefa = em_segundo_plano(
+            buscar_produtos, termo, limit=LIMITE_RESULTADOS,
+            ao_concluir=lambda produtos: self.mostrar_resultados(termo, produtos),
+            ao_falhar=self.falha_na_busca,
+        )
+
+    def mostrar_resultados(self, termo, produtos):
+        """Mostra a primeira página de resultados"""
+        grid = self.ids.resultados_grid
+        grid.definir_produtos(produtos)
+        grid.tem_mais = len(produtos) == LIMITE_RESULTADOS
+
+        if produtos:
+            self.mensagem = f"Resultados para \"{termo}\""
+        else:
+            self.mensagem = f"Nenhum produto encontrado para \"{termo}\""
+
+    def falha_na_busca(self, erro):
+        grid = self.ids.resultados_grid
+        grid.carregando = False
+        grid.tem_mais = False
+        self.mensagem = "Erro ao buscar produtos."
+
+    def carregar_mais_resultados(self):
+        """Scroll infinito: próxima página de resultados"""
+        grid = self.ids.resultados_grid
+        # Uma busca nova também cancela esta página (self.tarefa é sempre a última)
+        if self.tarefa:
+            self.tarefa.cancelar()
+        self.tarefa = em_segundo_plano(
+            buscar_produtos, self.termo.strip(), limit=LIMITE_RESULTADOS,
+            offset=len(grid.produtos),
+            ao_concluir=self.mostrar_mais_resultados,
+            ao_falhar=self.falha_na_busca,
+        )
+
+    def mostrar_mais_resultados(self, produtos):
+        grid = self.ids.resultados_grid
+        grid.adicionar_produtos(produtos)
+        grid.tem_mais = len(produtos) == LIMITE_RESULTADOS
+
+    def voltar(self):
+        """Volta para a tela anterior"""
+        self.manager.voltar()
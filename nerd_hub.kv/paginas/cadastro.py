@@ -3,6 +3,9 @@ from kivy.uix.screenmanager import Screen
 from kivy.properties import StringProperty
 from kivy.clock import Clock
 from kivy.app import App
+from registro import obter_logger
+
+log = obter_logger(__name__)
 
 class CadastroScreen(Screen):
     mensagem = StringProperty("")
@@ -16,12 +19,14 @@ class CadastroScreen(Screen):
             self.mensagem = "Preencha todos os campos."
             return
 
-        print(f"🖥️ Tela cadastro - Tentando cadastrar: {nome}, {email}")
+        log.debug("🖥️ Tela cadastro - Tentando cadastrar: %s, %s", nome, email)
+        self.mensagem = "Cadastrando..."
         
-        # Usa a função do App principal
+        # Usa a função do App principal (grava em segundo plano)
         app = App.get_running_app()
-        sucesso = app.cadastrar_usuario(nome, email, senha)
-        
+        app.cadastrar_usuario(nome, email, senha, ao_concluir=self.resultado_cadastro)
+
+    def resultado_cadastro(self, sucesso):
         if sucesso:
             self.mensagem = "✅ Cadastro realizado com sucesso!"
             self.limpar_campos()
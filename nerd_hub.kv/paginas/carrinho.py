@@ -1,20 +1,33 @@
 # paginas/carrinho.py - ATUALIZADO
+from types import SimpleNamespace
 from kivy.uix.screenmanager import Screen
 from kivy.properties import ListProperty
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
 from kivy.metrics import dp
 from kivy.app import App
+from kivy.factory import Factory
+from precos import formatar_brl
+from executor_banco import em_segundo_plano
+from registro import obter_logger
+
+log = obter_logger(__name__)
 
 class CarrinhoScreen(Screen):
     itens = ListProperty([])
+    tarefa = None  # consulta em andamento no executor
+
+    def __init__(self, **kwargs):
+        self.cards = {}  # id do produto -> (item exibido, CarrinhoCard)
+        self.aviso = None  # placeholder "carregando" / "carrinho vazio"
+        super().__init__(**kwargs)
 
     def on_pre_enter(self):
         """Carrega o carrinho do usuário ao entrar na tela"""
         app = App.get_running_app()
         
         if not app.usuario_logado:
-            print("❌ Acesso não autorizado ao carrinho - redirecionando para login")
+            log.debug("❌ Acesso não autorizado ao carrinho - redirecionando para login")
             app.mostrar_popup("Faça o login para acessar seu carrinho!")
             self.manager.current = "login"
             return
@@ -23,37 +36,59 @@ class CarrinhoScreen(Screen):
         self.carregar_carrinho_usuario()
 
     def carregar_carrinho_usuario(self):
-        """Carrega o carrinho do usuário logado do banco de dados"""
+        """Carrega o carrinho do usuário logado do banco de dados (em segundo plano)"""
         app = App.get_running_app()
         
         if not app.usuario_logado:
             self.itens = []
             return
         
-        # Obtém itens do banco de dados
-        itens_db = app.obter_carrinho_usuario()
-        
-        # Converte para o formato esperado pela interface
-        self.itens = []
-        for item in itens_db:
-            self.itens.append({
-                'id': item[0],
-                'title': item[1],
-                'price': item[2],
-                'image': item[3],
-                'quantidade': item[4]
-            })
-        
-        self.atualizar_lista()
-        self.atualizar_total()
+        if self.tarefa:
+            self.tarefa.cancelar()
+        self.mostrar_carregando()
+        self.tarefa = em_segundo_plano(app.obter_carrinho_usuario,
+                                       ao_concluir=self.mostrar_itens,
+                                       ao_falhar=lambda erro: app.mostrar_popup("Erro ao carregar o carrinho!"))
+
+    def mostrar_itens(self, itens_db):
+        """Converte as linhas do banco para o formato esperado pela interface"""
+        self.itens = [{
+            'id': item[0],
+            'title': item[1],
+            'price': formatar_brl(item[2]),
+            'price_cents': item[2],
+            'image': item[3],
+            'quantidade': item[4]
+        } for item in itens_db]
+
+    def mostrar_carregando(self):
+        """Placeholder exibido enquanto o carrinho é consultado (só se ainda não há cards)"""
+        if self.cards:
+            return  # recarga: os cards atuais ficam até o diff chegar
+        self.mostrar_aviso(Label(
+            text="Carregando carrinho...",
+            font_size='16sp',
+            color=(0.5, 0.5, 0.5, 1),
+            size_hint_y=None,
+            height=dp(200)
+        ))
+
+    def mostrar_aviso(self, widget):
+        """Troca o conteúdo da lista por um aviso (carregando / carrinho vazio)"""
+        layout = self.ids.carrinho_lista
+        layout.clear_widgets()
+        self.cards = {}
+        self.aviso = widget
+        layout.add_widget(widget)
 
     def on_itens(self, instance, value):
         self.atualizar_lista()
         self.atualizar_total()
 
     def atualizar_lista(self):
+        """Aplica a diferença entre os cards na tela e self.itens, pela chave 'id':
+        remove os cards que saíram, atualiza só os que mudaram e cria os novos"""
         layout = self.ids.carrinho_lista
-        layout.clear_widgets()
 
         if not self.itens:
             empty_box = BoxLayout(
@@ -77,66 +112,91 @@ class CarrinhoScreen(Screen):
                 halign='center',
                 valign='middle'
             ))
-            layout.add_widget(empty_box)
-            if hasattr(self, 'ids') and 'total_label' in self.ids:
-                self.ids.total_label.text = "Total: R$ 0,00"
+            self.mostrar_aviso(empty_box)
             return
 
-        from kivy.factory import Factory
-        for produto in self.itens:
-            card = Factory.CarrinhoCard()
-            card.produto = type('Produto', (), {
-                'id': produto.get("id", 0),
-                'title': produto.get("title", ""),
-                'price': produto.get("price", ""),
-                'image': produto.get("image", "imagens/imagem_produtos_home/forza.jpg"),
-                'quantidade': produto.get("quantidade", 1)
-            })()
-            card.remover_callback = self.remover_item
-            layout.add_widget(card)
+        if self.aviso:
+            layout.remove_widget(self.aviso)
+            self.aviso = None
 
-        self.atualizar_total()
+        novos = {item['id']: item for item in self.itens}
+        for produto_id in [pid for pid in self.cards if pid not in novos]:
+            layout.remove_widget(self.cards.pop(produto_id)[1])
+
+        criados = alterados = 0
+        for posicao, item in enumerate(self.itens):
+            anterior = self.cards.get(item['id'])
+            if anterior is None:
+                card = self.criar_card(item)
+                criados += 1
+            else:
+                card = anterior[1]
+                if anterior[0] != item:
+                    card.produto = self.produto_do_item(item)
+                    alterados += 1
+            self.cards[item['id']] = (item, card)
+
+            # children do Kivy é invertido: o primeiro item fica no fim da lista
+            if card.parent is None:
+                layout.add_widget(card, index=len(layout.children) - posicao)
+            elif layout.children[len(layout.children) - 1 - posicao] is not card:
+                layout.remove_widget(card)
+                layout.add_widget(card, index=len(layout.children) - posicao)
+
+        log.debug("🛒 Carrinho: %s cards (%s novos, %s atualizados)", len(self.cards), criados, alterados)
+
+    def produto_do_item(self, item):
+        return SimpleNamespace(
+            id=item.get("id", 0),
+            title=item.get("title", ""),
+            price=item.get("price", ""),
+            image=item.get("image", "imagens/imagem_produtos_home/forza.jpg"),
+            quantidade=item.get("quantidade", 1)
+        )
+
+    def criar_card(self, item):
+        card = Factory.CarrinhoCard()
+        card.produto = self.produto_do_item(item)
+        card.remover_callback = self.remover_item
+        return card
 
     def remover_item(self, produto):
         """Remove item do carrinho no banco de dados"""
         app = App.get_running_app()
-        
-        if app.remover_do_carrinho(produto.id):
-            # Remove da lista local
+        em_segundo_plano(app.remover_do_carrinho, produto.id,
+                         ao_concluir=lambda sucesso: self.item_removido(produto, sucesso))
+
+    def item_removido(self, produto, sucesso):
+        app = App.get_running_app()
+        if sucesso:
+            # Remove da lista local (on_itens tira só esse card e recalcula o total)
             for item in self.itens[:]:
                 if item.get('id') == produto.id:
                     self.itens.remove(item)
                     break
             
-            self.atualizar_lista()
             app.mostrar_popup("Produto removido do carrinho!")
         else:
             app.mostrar_popup("Erro ao remover produto!")
 
     def atualizar_total(self):
-        total = 0.0
-
-        for produto in self.itens:
-            preco_str = produto.get("price", "R$ 0,00")
-            quantidade = produto.get("quantidade", 1)
-            try:
-                preco_limpo = preco_str.replace("R$", "").strip()
-                preco_limpo = preco_limpo.replace(".", "").replace(",", ".")
-                valor = float(preco_limpo)
-                total += valor * quantidade
-            except ValueError:
-                print(f"Erro ao converter preço: {preco_str}")
+        """Total calculado no banco: SUM(price_cents * quantidade)"""
+        app = App.get_running_app()
+        em_segundo_plano(app.obter_total_carrinho, ao_concluir=self.mostrar_total)
 
+    def mostrar_total(self, total):
         if hasattr(self, 'ids') and 'total_label' in self.ids:
-            self.ids.total_label.text = f"Total: R$ {total:,.2f}".replace(".", "#").replace(",", ".").replace("#", ",")
+            self.ids.total_label.text = f"Total: {formatar_brl(total)}"
 
     def limpar_carrinho(self):
         """Limpa todo o carrinho"""
         app = App.get_running_app()
-        
-        if app.limpar_carrinho():
+        em_segundo_plano(app.limpar_carrinho, ao_concluir=self.carrinho_limpo)
+
+    def carrinho_limpo(self, sucesso):
+        app = App.get_running_app()
+        if sucesso:
             self.itens = []
-            self.atualizar_lista()
             app.mostrar_popup("Carrinho limpo!")
         else:
             app.mostrar_popup("Erro ao limpar carrinho!")
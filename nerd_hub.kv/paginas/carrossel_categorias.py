@@ -0,0 +1,61 @@
+# paginas/carrossel_categorias.py
+"""
+Carrossel de Categorias
+=======================
+Carrossel de banners das categorias usado na Home e nas telas de
+categoria. Os slides vêm da tabela `categorias` (listar_categorias), então
+uma categoria nova aparece aqui sem mudar nenhum .kv. As categorias
+recebidas vão para a pré-carga (ver precarga.py), para que a tela de cada
+uma abra com produtos e banner já em memória.
+
+Uso no .kv:
+    CarrosselCategorias:
+        excluir: root.categoria   # opcional: esconde a categoria atual
+"""
+
+from kivy.uix.carousel import Carousel
+from kivy.uix.floatlayout import FloatLayout
+from kivy.properties import StringProperty, ListProperty
+from database import listar_categorias
+from executor_banco import em_segundo_plano
+from precarga import precarregador
+from registro import obter_logger
+
+log = obter_logger(__name__)
+
+
+class SlideCategoria(FloatLayout):
+    """Banner de uma categoria; tocar abre a tela da categoria"""
+    slug = StringProperty("")
+    titulo = StringProperty("")
+    banner = StringProperty("")
+
+
+class CarrosselCategorias(Carousel):
+    excluir = StringProperty("")
+    categorias = ListProperty()  # (slug, titulo, banner)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        em_segundo_plano(listar_categorias, ao_concluir=self.mostrar_categorias,
+                         ao_falhar=self.falha_ao_carregar)
+
+    def mostrar_categorias(self, categorias):
+        self.categorias = categorias
+        precarregador.categorias(categorias)
+
+    def falha_ao_carregar(self, erro):
+        log.error("❌ Erro ao carregar categorias: %s", erro)
+
+    def on_categorias(self, instance, valor):
+        self._montar_slides()
+
+    def on_excluir(self, instance, valor):
+        self._montar_slides()
+
+    def _montar_slides(self):
+        self.clear_widgets()
+        for slug, titulo, banner in self.categorias:
+            if slug == self.excluir:
+                continue
+            self.add_widget(SlideCategoria(slug=slug, titulo=titulo, banner=banner or ""))
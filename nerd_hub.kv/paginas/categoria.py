@@ -0,0 +1,85 @@
+# paginas/categoria.py
+"""
+Tela de Categoria
+=================
+Uma única tela para todas as categorias: título, banner e slug vêm da
+tabela `categorias` (ver main.py, que registra uma tela por categoria).
+A regra <CategoriaScreen> do telas/categoria.kv é carregada uma vez e só
+as categorias visitadas chegam a criar widgets. Se a primeira página já
+estiver em memória (pré-carga do carrossel, ver precarga.py), os produtos
+aparecem sem passar pelo executor.
+"""
+
+from kivy.uix.screenmanager import Screen
+from kivy.properties import StringProperty
+from database import geracao_catalogo, listar_produtos_por_categoria_pagina, pagina_categoria_em_cache
+from executor_banco import em_segundo_plano
+from registro import obter_logger
+
+log = obter_logger(__name__)
+
+class CategoriaScreen(Screen):
+    categoria = StringProperty("")  # slug usado nas consultas (ex.: "disney")
+    titulo = StringProperty("")
+    banner = StringProperty("")
+    cursor = None  # id do último produto carregado (paginação)
+    tarefa = None  # consulta em andamento no executor
+    geracao = None  # geracao_catalogo() da primeira página na grade
+
+    def on_pre_enter(self):
+        """Carrega os produtos da categoria quando a tela está prestes a ser mostrada"""
+        # Voltando (ex.: dos detalhes) sem mudança no catálogo: mantém as
+        # páginas do scroll infinito e a posição da rolagem
+        if self.geracao is not None and self.geracao == geracao_catalogo():
+            return
+        self.carregar_produtos()
+
+    def carregar_produtos(self):
+        """Carrega a primeira página de produtos do BANCO DE DADOS (em segundo plano)"""
+        grade = self.ids.products_grid
+        if self.tarefa:
+            self.tarefa.cancelar()
+            self.tarefa = None
+        self.geracao = None
+        geracao = geracao_catalogo()
+        pagina = pagina_categoria_em_cache(self.categoria)
+        if pagina is not None:
+            self.mostrar_produtos(pagina, geracao)
+            return
+        grade.definir_produtos([])
+        grade.carregando = True
+        self.tarefa = em_segundo_plano(listar_produtos_por_categoria_pagina, self.categoria,
+                                       ao_concluir=lambda resultado: self.mostrar_produtos(resultado, geracao),
+                                       ao_falhar=self.falha_ao_carregar)
+
+    def mostrar_produtos(self, resultado, geracao=None):
+        produtos, self.cursor = resultado
+        self.geracao = geracao
+        
+        # Grade virtualizada: só os cards visíveis viram widgets
+        grade = self.ids.products_grid
+        grade.definir_produtos(produtos)
+        grade.tem_mais = self.cursor is not None
+        log.debug("✅ %s produtos %s carregados do banco", len(produtos), self.titulo)
+
+    def carregar_mais_produtos(self):
+        """Scroll infinito: carrega a próxima página quando a grade chega ao fim"""
+        self.tarefa = em_segundo_plano(listar_produtos_por_categoria_pagina, self.categoria, self.cursor,
+                                       ao_concluir=self.mostrar_mais_produtos,
+                                       ao_falhar=self.falha_ao_carregar)
+
+    def mostrar_mais_produtos(self, resultado):
+        produtos, self.cursor = resultado
+        grade = self.ids.products_grid
+        grade.adicionar_produtos(produtos)
+        grade.tem_mais = self.cursor is not None
+
+    def falha_ao_carregar(self, erro):
+        log.error("❌ Erro ao carregar produtos %s: %s", self.titulo, erro)
+        grade = self.ids.products_grid
+        grade.carregando = False
+        grade.tem_mais = False
+
+    def voltar(self):
+        """Volta para a tela anterior"""
+        self.manager.voltar()
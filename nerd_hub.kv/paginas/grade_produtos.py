@@ -0,0 +1,219 @@
+# paginas/grade_produtos.py
+"""
+Grade de Produtos Virtualizada
+==============================
+Grade compartilhada pela Home, telas de categoria e busca, baseada no
+RecycleView do Kivy: só os cards visíveis na tela existem como widgets,
+e eles são reaproveitados (reciclados) durante a rolagem.
+
+Cada item do RecycleView é uma LINHA com até `colunas` ProductCards.
+Um cabeçalho opcional (ex.: banner e carrossel da Home) pode ocupar a
+primeira posição da lista e rola junto com os produtos.
+
+Scroll infinito: quando a rolagem chega perto do fim e `tem_mais` é True,
+a grade dispara o evento `on_fim_da_lista`; a tela busca a próxima página
+e entrega os produtos com `adicionar_produtos()`.
+
+Enquanto `carregando` é True (consulta rodando em segundo plano), a grade
+mostra linhas "esqueleto" no fim da lista no lugar dos cards.
+
+Quando a rolagem para, os cards visíveis vão para a pré-carga (ver
+precarga.py): detalhes e imagem grande ficam prontos antes do toque.
+"""
+
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.boxlayout import BoxLayout
+from kivy.properties import ListProperty, NumericProperty, StringProperty, BooleanProperty
+from kivy.clock import Clock
+from kivy.factory import Factory
+from kivy.metrics import dp
+from precarga import precarregador, ATRASO as ATRASO_PRECARGA
+from precos import formatar_brl
+
+# Altura de uma linha de cards (card de 290dp + 12dp de espaçamento)
+ALTURA_LINHA = dp(302)
+
+# Distância do fim (em pixels) que dispara o carregamento da próxima página
+DISTANCIA_CARREGAR = dp(600)
+
+# Linhas esqueleto exibidas enquanto a primeira página carrega
+LINHAS_ESQUELETO = 2
+
+
+class LinhaProdutos(BoxLayout):
+    """Linha da grade: mantém seus cards e só troca os dados ao ser reciclada"""
+    produtos = ListProperty([])
+    colunas = NumericProperty(2)
+
+    def on_produtos(self, instance, produtos):
+        while len(self.children) < self.colunas:
+            self.add_widget(Factory.ProductCard())
+
+        # children fica em ordem inversa à de inserção
+        for card, produto in zip(reversed(self.children), produtos + [None] * self.colunas):
+            if produto is None:
+                card.opacity = 0
+                card.disabled = True
+                continue
+            card.opacity = 1
+            card.disabled = False
+            card.produto_id = produto["produto_id"]
+            card.title = produto["title"]
+            card.price = produto["price"]
+            card.image = produto["image"]
+
+    def on_parent(self, instance, parent):
+        """O RecycleView tira a linha do layout quando ela sai da área visível:
+        cancela as imagens que ainda não carregaram e retoma ao voltar"""
+        for card in self.children:
+            imagem = card.ids.get("imagem")
+            if imagem is None:
+                continue
+            if parent is None:
+                imagem.cancelar()
+            else:
+                imagem.retomar()
+
+
+class GradeProdutos(RecycleView):
+    """RecycleView de produtos em linhas de `colunas` cards"""
+    colunas = NumericProperty(2)
+    cabecalho = StringProperty("")
+    altura_cabecalho = NumericProperty(0)
+    tem_mais = BooleanProperty(False)
+    carregando = BooleanProperty(False)
+
+    __events__ = ("on_fim_da_lista",)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.produtos = []
+        self._posicao_anterior = None
+        self._verificar = Clock.create_trigger(self._verificar_fim)
+        self._precarga = Clock.create_trigger(self._precarregar_visiveis, ATRASO_PRECARGA)
+        self.fbind("cabecalho", self._atualizar_dados)
+        self.fbind("altura_cabecalho", self._atualizar_dados)
+        self.fbind("scroll_y", self._verificar)
+        self.fbind("height", self._verificar)
+        self.fbind("tem_mais", self._verificar)
+        self.fbind("scroll_y", self._agendar_precarga)
+        self.fbind("data", self._agendar_precarga)
+        self.fbind("layout_manager", self._vincular_layout)
+        self._vincular_layout(self, self.layout_manager)
+        self._atualizar_dados()
+
+    def _vincular_layout(self, instance, layout):
+        if layout is not None:
+            layout.fbind("height", self._ao_mudar_altura)
+
+    def _ao_mudar_altura(self, layout, altura):
+        # scroll_y é relativo: sem esta correção, quem está no fim da lista
+        # continuaria no (novo) fim e dispararia todas as páginas em sequência
+        if self._posicao_anterior is not None and altura > self.height:
+            self.scroll_y = max(0, 1 - self._posicao_anterior / (altura - self.height))
+            self._posicao_anterior = None
+        self._verificar()
+
+    @staticmethod
+    def item_produto(produto):
+        """Converte uma linha do banco (id, title, price_cents, image) para o card"""
+        return {
+            "produto_id": produto[0],
+            "title": produto[1],
+            "price": formatar_brl(produto[2]),
+            "image": produto[3],
+        }
+
+    def definir_produtos(self, produtos):
+        """Substitui os produtos exibidos (linhas do banco)"""
+        self.produtos = [self.item_produto(p) for p in produtos]
+        self.carregando = False
+        self._atualizar_dados()
+        self.scroll_y = 1
+
+    def adicionar_produtos(self, produtos):
+        """Acrescenta uma nova página ao fim da grade, sem recriar as linhas existentes"""
+        novos = [self.item_produto(p) for p in produtos]
+        self.carregando = False
+        if not novos:
+            return
+
+        layout = self.layout_manager
+        if layout is not None and layout.height > self.height:
+            # Distância (em pixels) do topo, para manter a posição após crescer
+            self._posicao_anterior = (layout.height - self.height) * (1 - self.scroll_y)
+
+        # Completa a última linha se ela ficou pela metade
+        inicio = len(self.produtos) - len(self.produtos) % self.colunas
+        if inicio < len(self.produtos):
+            self.data.pop()
+        self.produtos.extend(novos)
+        self.data.extend(self._linhas(self.produtos[inicio:]))
+        self._verificar()
+
+    def produtos_visiveis(self):
+        """Produtos das linhas que estão na tela (as que o RecycleView mantém como widgets), de cima para baixo"""
+        layout = self.layout_manager
+        if layout is None:
+            return []
+        linhas = sorted((linha for linha in layout.children if isinstance(linha, LinhaProdutos)),
+                        key=lambda linha: -linha.y)
+        return [produto for linha in linhas for produto in linha.produtos]
+
+    def _agendar_precarga(self, *args):
+        # Reinicia a espera a cada movimento: só pré-carrega quando a rolagem para
+        self._precarga.cancel()
+        self._precarga()
+
+    def _precarregar_visiveis(self, *args):
+        produtos = self.produtos_visiveis()
+        if produtos:
+            precarregador.produtos_visiveis(produtos)
+
+    def _verificar_fim(self, *args):
+        """Dispara on_fim_da_lista quando falta pouco para o fim da rolagem"""
+        layout = self.layout_manager
+        if not self.tem_mais or self.carregando or layout is None:
+            return
+        if self.data and not layout.height:
+            return  # layout ainda não calculado
+        restante = max(0, layout.height - self.height) * self.scroll_y
+        if restante <= DISTANCIA_CARREGAR:
+            self.carregando = True
+            self.dispatch("on_fim_da_lista")
+
+    def on_fim_da_lista(self):
+        pass
+
+    def on_carregando(self, instance, carregando):
+        """Mostra/remove as linhas esqueleto no fim da lista"""
+        if carregando:
+            self.data.extend(self._esqueleto())
+        else:
+            while self.data and self.data[-1]["viewclass"] == "LinhaCarregando":
+                self.data.pop()
+
+    def _esqueleto(self):
+        quantidade = 1 if self.produtos else LINHAS_ESQUELETO
+        return [{"viewclass": "LinhaCarregando", "height": ALTURA_LINHA} for _ in range(quantidade)]
+
+    def _linhas(self, itens):
+        colunas = self.colunas
+        return [
+            {
+                "viewclass": "LinhaProdutos",
+                "colunas": colunas,
+                "produtos": itens[i:i + colunas],
+                "height": ALTURA_LINHA,
+            }
+            for i in range(0, len(itens), colunas)
+        ]
+
+    def _atualizar_dados(self, *args):
+        dados = []
+        if self.cabecalho:
+            dados.append({"viewclass": self.cabecalho, "height": self.altura_cabecalho})
+        dados.extend(self._linhas(self.produtos))
+        if self.carregando:
+            dados.extend(self._esqueleto())
+        self.data = dados
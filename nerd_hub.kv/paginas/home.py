@@ -1,34 +1,71 @@
 from kivy.uix.screenmanager import Screen
 from kivy.app import App
-from database import listar_produtos
+from database import geracao_catalogo, listar_produtos_pagina, pagina_home_em_cache
+from executor_banco import em_segundo_plano
+from linha_do_tempo import marcar
+from registro import obter_logger
+
+log = obter_logger(__name__)
 
 class HomeScreen(Screen):
+    cursor = None  # id do último produto carregado (paginação)
+    tarefa = None  # consulta em andamento no executor
+    geracao = None  # geracao_catalogo() da primeira página na grade
+
     def on_pre_enter(self):
         """Carrega produtos quando a tela está prestes a ser mostrada"""
+        # Voltando (ex.: dos detalhes) sem mudança no catálogo: mantém as
+        # páginas do scroll infinito e a posição da rolagem
+        if self.geracao is not None and self.geracao == geracao_catalogo():
+            return
         self.carregar_produtos()
 
     def carregar_produtos(self):
-        """Carrega produtos do BANCO DE DADOS"""
-        try:
-            produtos = listar_produtos()
-            
-            grid = self.ids.products_grid
-            grid.clear_widgets()
+        """Carrega a primeira página de produtos do BANCO DE DADOS (em segundo plano)"""
+        grade = self.ids.products_grid
+        if self.tarefa:
+            self.tarefa.cancelar()
+            self.tarefa = None
+        self.geracao = None
+        geracao = geracao_catalogo()
+        pagina = pagina_home_em_cache()
+        if pagina is not None:
+            self.mostrar_produtos(pagina, geracao)
+            return
+        grade.definir_produtos([])
+        grade.carregando = True
+        self.tarefa = em_segundo_plano(listar_produtos_pagina,
+                                       ao_concluir=lambda resultado: self.mostrar_produtos(resultado, geracao),
+                                       ao_falhar=self.falha_ao_carregar)
 
-            for produto in produtos:
-                from kivy.factory import Factory
-                card = Factory.ProductCard()
-                card.produto_id = produto[0]
-                card.title = produto[1]
-                card.price = produto[2]
-                card.image = produto[3]
-                # NÃO é mais necessário fazer bind aqui - a navegação está no arquivo .kv
-                grid.add_widget(card)
-                
-            print(f"✅ {len(produtos)} produtos carregados do banco")
-            
-        except Exception as e:
-            print(f"❌ Erro ao carregar produtos: {e}")
+    def mostrar_produtos(self, resultado, geracao=None):
+        produtos, self.cursor = resultado
+        self.geracao = geracao
+        
+        # Grade virtualizada: só os cards visíveis viram widgets
+        grade = self.ids.products_grid
+        grade.definir_produtos(produtos)
+        grade.tem_mais = self.cursor is not None
+        marcar("Home: primeira página", produtos=len(produtos))
+        log.debug("✅ %s produtos carregados do banco", len(produtos))
+
+    def carregar_mais_produtos(self):
+        """Scroll infinito: carrega a próxima página quando a grade chega ao fim"""
+        self.tarefa = em_segundo_plano(listar_produtos_pagina, self.cursor,
+                                       ao_concluir=self.mostrar_mais_produtos,
+                                       ao_falhar=self.falha_ao_carregar)
+
+    def mostrar_mais_produtos(self, resultado):
+        produtos, self.cursor = resultado
+        grade = self.ids.products_grid
+        grade.adicionar_produtos(produtos)
+        grade.tem_mais = self.cursor is not None
+
+    def falha_ao_carregar(self, erro):
+        log.error("❌ Erro ao carregar produtos: %s", erro)
+        grade = self.ids.products_grid
+        grade.carregando = False
+        grade.tem_mais = False
 
     def ir_para_tela(self, tela):
         """Navega para outras telas usando o sistema de histórico"""
@@ -40,11 +77,11 @@ class HomeScreen(Screen):
         
         if app.usuario_logado:
             # Usuário está logado - vai para carrinho normalmente
-            print(f"✅ Usuário {app.usuario_logado['nome']} acessando carrinho")
+            log.debug("✅ Usuário %s acessando carrinho", app.usuario_logado['nome'])
             self.manager.mudar_tela("carrinho")
         else:
             # Usuário não está logado - mostra mensagem e vai para login
-            print("❌ Usuário não logado - redirecionando para login")
+            log.debug("❌ Usuário não logado - redirecionando para login")
             app.mostrar_popup("Faça o login para acessar seu carrinho!")
             # Redireciona para tela de login após um breve delay
             from kivy.clock import Clock
@@ -60,7 +97,7 @@ class HomeScreen(Screen):
         Args:
             produto_id (int): ID do produto a ser exibido
         """
-        print(f"🔍 Abrindo detalhes do produto ID: {produto_id}")
+        log.debug("🔍 Abrindo detalhes do produto ID: %s", produto_id)
         
         try:
             # Obtém a tela de detalhes do produto
@@ -73,7 +110,7 @@ class HomeScreen(Screen):
             self.manager.mudar_tela("detalhes_produto")
             
         except Exception as e:
-            print(f"❌ Erro ao abrir detalhes do produto: {e}")
+            log.error("❌ Erro ao abrir detalhes do produto: %s", e)
             # Exibe popup de erro ao usuário
             app = App.get_running_app()
             app.mostrar_popup("Erro ao abrir detalhes do produto. Tente novamente.")
\ No newline at end of file
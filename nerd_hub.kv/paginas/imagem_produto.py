@@ -0,0 +1,81 @@
+# paginas/imagem_produto.py
+"""
+Imagem de Produto
+=================
+Image que exibe a miniatura do tamanho certo (ver miniaturas.py) e pega a
+textura do cache LRU compartilhado, em vez de decodificar o JPEG original
+a cada card criado ou reciclado.
+
+Por padrão a imagem é decodificada em segundo plano: enquanto isso o
+widget fica transparente (aparece o fundo cinza do card) e a tela não
+espera nenhum arquivo para desenhar o primeiro frame. Cards que saem da
+área visível cancelam o carregamento pendente (ver LinhaProdutos).
+
+Uso no .kv:
+    ImagemProduto:
+        caminho: root.image
+        tipo: 'card'        # card, carrinho, detalhe ou banner
+        imagem_padrao: ''   # sem caminho, nada (padrão: IMAGEM_PADRAO)
+"""
+
+from kivy.uix.image import Image
+from kivy.properties import StringProperty, BooleanProperty
+from miniaturas import obter_textura, carregar_textura
+
+# Imagem usada quando o produto não tem imagem
+IMAGEM_PADRAO = "imagens/imagem_produtos_home/forza.jpg"
+
+
+class ImagemProduto(Image):
+    caminho = StringProperty("")
+    tipo = StringProperty("card")
+    imagem_padrao = StringProperty(IMAGEM_PADRAO)
+    assincrono = BooleanProperty(True)
+
+    def __init__(self, **kwargs):
+        self._pedido = None
+        self._carregada = False
+        super().__init__(**kwargs)
+
+    def on_caminho(self, instance, valor):
+        self._atualizar()
+
+    def on_tipo(self, instance, valor):
+        self._atualizar()
+
+    def on_imagem_padrao(self, instance, valor):
+        if not self.caminho:
+            self._atualizar()
+
+    def _atualizar(self):
+        self.cancelar()
+        caminho = self.caminho or self.imagem_padrao
+        if not caminho:
+            self._mostrar(None)
+            return
+        if not self.assincrono:
+            self._mostrar(obter_textura(caminho, self.tipo))
+            return
+
+        # Placeholder: transparente até a textura chegar
+        self._carregada = False
+        self.color = (1, 1, 1, 0)
+        self._pedido = carregar_textura(caminho, self.tipo, self._mostrar)
+
+    def _mostrar(self, textura):
+        self._pedido = None
+        self._carregada = textura is not None
+        self.texture = textura
+        # Sem textura (arquivo ilegível) o placeholder continua e retomar() tenta de novo
+        self.color = (1, 1, 1, 1) if self._carregada else (1, 1, 1, 0)
+
+    def cancelar(self):
+        """Desiste do carregamento pendente (ex.: card saiu da tela)"""
+        if self._pedido is not None:
+            self._pedido.cancelar()
+            self._pedido = None
+
+    def retomar(self):
+        """Volta a carregar se o carregamento anterior foi cancelado"""
+        if self._pedido is None and not self._carregada:
+            self._atualizar()
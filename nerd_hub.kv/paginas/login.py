@@ -3,6 +3,9 @@ from kivy.uix.screenmanager import Screen
 from kivy.properties import StringProperty
 from kivy.clock import Clock
 from kivy.app import App
+from registro import obter_logger
+
+log = obter_logger(__name__)
 
 class LoginScreen(Screen):
     mensagem = StringProperty("")
@@ -15,12 +18,15 @@ class LoginScreen(Screen):
             self.mensagem = "Preencha todos os campos."
             return
 
-        print(f"🖥️ Tela login - Tentando login: {email}")
+        log.debug("🖥️ Tela login - Tentando login: %s", email)
+        self.mensagem = "Entrando..."
         
         # Usa a função do App principal para manter consistência
+        # (a verificação roda em segundo plano e chama resultado_login)
         app = App.get_running_app()
-        sucesso = app.fazer_login(email, senha)
-        
+        app.fazer_login(email, senha, ao_concluir=self.resultado_login)
+
+    def resultado_login(self, sucesso):
         if sucesso:
             self.mensagem = " Login realizado com sucesso!"
             self.limpar_campos()
@@ -3,7 +3,9 @@ from kivy.uix.screenmanager import Screen
 from kivy.properties import StringProperty, BooleanProperty
 from kivy.app import App
 from database import Database
+from executor_banco import em_segundo_plano, com_senha
 import re
+import logging
 from kivy.clock import Clock
 from datetime import datetime, timedelta
 from kivy.uix.button import Button
@@ -12,6 +14,9 @@ from kivy.uix.popup import Popup
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.widget import Widget
+from registro import obter_logger
+
+log = obter_logger(__name__)
 
 class PerfilScreen(Screen):
     username = StringProperty("")
@@ -36,7 +41,7 @@ class PerfilScreen(Screen):
         """Verifica se o usuário está logado antes de entrar na tela"""
         app = App.get_running_app()
         if not app.usuario_logado:
-            print("❌ Acesso negado à tela de perfil - usuário não logado")
+            log.debug("❌ Acesso negado à tela de perfil - usuário não logado")
             app.mostrar_popup("Faça o login para acessar seu perfil!")
             self.manager.current = 'login'
             return
@@ -48,27 +53,30 @@ class PerfilScreen(Screen):
         """Carrega os dados do usuário do banco de dados"""
         app = App.get_running_app()
         if app.usuario_logado:
-            print(f"🔄 Carregando dados do usuário ID: {app.usuario_logado['id']}")
+            log.debug("🔄 Carregando dados do usuário ID: %s", app.usuario_logado['id'])
+            em_segundo_plano(self.db.get_user_by_id, app.usuario_logado['id'],
+                             ao_concluir=self.mostrar_dados_usuario)
+    
+    def mostrar_dados_usuario(self, user_data):
+        """Preenche os campos com a linha retornada pelo banco"""
+        if user_data:
+            self.username = user_data[1] if user_data[1] else ""
+            self.full_name = user_data[1] if user_data[1] else ""
+            self.email = user_data[2] if user_data[2] else ""
             
-            user_data = self.db.get_user_by_id(app.usuario_logado['id'])
-            if user_data:
-                self.username = user_data[1] if user_data[1] else ""
-                self.full_name = user_data[1] if user_data[1] else ""
-                self.email = user_data[2] if user_data[2] else ""
-                
-                phone_from_db = user_data[4] if len(user_data) > 4 and user_data[4] else ""
-                self.phone = self.formatar_telefone(phone_from_db) if phone_from_db else ""
-                
-                birth_date_from_db = user_data[5] if len(user_data) > 5 and user_data[5] else ""
-                self.birth_date = self.formatar_data_nascimento(birth_date_from_db) if birth_date_from_db else ""
-                
-                print(f"✅ Dados carregados:")
-                print(f"   👤 Nome: {self.username}")
-                print(f"   📧 Email: {self.email}")
-                print(f"   📞 Telefone: {self.phone}")
-                print(f"   🎂 Data Nascimento: {self.birth_date}")
-            else:
-                print("❌ Não foi possível carregar os dados do usuário")
+            phone_from_db = user_data[4] if len(user_data) > 4 and user_data[4] else ""
+            self.phone = self.formatar_telefone(phone_from_db) if phone_from_db else ""
+            
+            birth_date_from_db = user_data[5] if len(user_data) > 5 and user_data[5] else ""
+            self.birth_date = self.formatar_data_nascimento(birth_date_from_db) if birth_date_from_db else ""
+            
+            log.debug("✅ Dados carregados:")
+            log.debug("   👤 Nome: %s", self.username)
+            log.debug("   📧 Email: %s", self.email)
+            log.debug("   📞 Telefone: %s", self.phone)
+            log.debug("   🎂 Data Nascimento: %s", self.birth_date)
+        else:
+            log.debug("❌ Não foi possível carregar os dados do usuário")
     
     def formatar_telefone(self, telefone):
         """Formata o telefone para o padrão (XX) XXXXX-XXXX"""
@@ -535,15 +543,16 @@ class PerfilScreen(Screen):
     
     def debug_dados(self):
         """Função de debug para verificar os dados atuais"""
-        print("=== DEBUG PERFIL ===")
-        print(f"Nome: {self.full_name}")
-        print(f"Email: {self.email}")
-        print(f"Telefone: {self.phone}")
-        print(f"Telefone (banco): {self.preparar_telefone_para_banco(self.phone)}")
-        print(f"Data Nascimento: {self.birth_date}")
-        print(f"Data Nascimento (banco): {self.preparar_data_para_banco(self.birth_date)}")
-        print(f"Nova Senha: {self.new_password}")
-        print("====================")
+        if not log.isEnabledFor(logging.DEBUG):
+            return  # não formata nada com o debug desligado
+        log.debug("=== DEBUG PERFIL ===")
+        log.debug("Nome: %s", self.full_name)
+        log.debug("Email: %s", self.email)
+        log.debug("Telefone: %s", self.phone)
+        log.debug("Telefone (banco): %s", self.preparar_telefone_para_banco(self.phone))
+        log.debug("Data Nascimento: %s", self.birth_date)
+        log.debug("Data Nascimento (banco): %s", self.preparar_data_para_banco(self.birth_date))
+        log.debug("====================")
     
     def change_profile_picture(self):
         """Abre seletor de arquivos para trocar foto de perfil"""
@@ -569,31 +578,38 @@ class PerfilScreen(Screen):
         self.debug_dados()
             
         if app.usuario_logado:
-            print(f"🔄 Salvando informações do usuário ID: {app.usuario_logado['id']}")
+            log.debug("🔄 Salvando informações do usuário ID: %s", app.usuario_logado['id'])
             
             # Prepara os dados para o banco (remove formatação)
             telefone_banco = self.preparar_telefone_para_banco(self.phone)
             data_banco = self.preparar_data_para_banco(self.birth_date)
             
-            success = self.db.update_user_profile(
+            # Grava em segundo plano; o resultado chega em informacoes_salvas
+            em_segundo_plano(
+                self.db.update_user_profile,
                 app.usuario_logado['id'],
                 nome=self.full_name,
                 email=self.email,
                 telefone=telefone_banco if telefone_banco else None,
-                data_nascimento=data_banco if data_banco else None
+                data_nascimento=data_banco if data_banco else None,
+                ao_concluir=self.informacoes_salvas
             )
-            
-            if success:
-                app.mostrar_popup("Informações atualizadas com sucesso!")
-                # Atualiza o nome de usuário também
+    
+    def informacoes_salvas(self, success):
+        """Resultado de update_user_profile"""
+        app = App.get_running_app()
+        if success:
+            app.mostrar_popup("Informações atualizadas com sucesso!")
+            # Atualiza o nome de usuário também
+            if app.usuario_logado:
                 app.usuario_logado['nome'] = self.full_name
-                print("✅ Informações pessoais salvas no banco de dados!")
-                
-                # Recarrega os dados para confirmar
-                self.load_user_data()
-            else:
-                app.mostrar_popup("Erro ao atualizar informações. Tente novamente.")
-                print("❌ Falha ao salvar informações no banco")
+            log.info("✅ Informações pessoais salvas no banco de dados!")
+            
+            # Recarrega os dados para confirmar
+            self.load_user_data()
+        else:
+            app.mostrar_popup("Erro ao atualizar informações. Tente novamente.")
+            log.error("❌ Falha ao salvar informações no banco")
     
     def change_password(self):
         """Altera a senha do usuário"""
@@ -615,24 +631,29 @@ class PerfilScreen(Screen):
             return
         
         if app.usuario_logado:
-            print(f"🔄 Alterando senha do usuário ID: {app.usuario_logado['id']}")
+            log.debug("🔄 Alterando senha do usuário ID: %s", app.usuario_logado['id'])
             
-            success = self.db.update_password(app.usuario_logado['id'], self.new_password)
-            if success:
-                app.mostrar_popup("Senha alterada com sucesso!")
-                self.new_password = ""
-                self.confirm_password = ""
-                print("✅ Senha alterada com sucesso no banco de dados!")
-            else:
-                app.mostrar_popup("Erro ao alterar senha!")
-                print("❌ Falha ao alterar senha no banco")
+            com_senha(self.db.update_password, app.usuario_logado['id'], self.new_password,
+                      ao_concluir=self.senha_alterada)
+    
+    def senha_alterada(self, success):
+        """Resultado de update_password"""
+        app = App.get_running_app()
+        if success:
+            app.mostrar_popup("Senha alterada com sucesso!")
+            self.new_password = ""
+            self.confirm_password = ""
+            log.info("✅ Senha alterada com sucesso no banco de dados!")
+        else:
+            app.mostrar_popup("Erro ao alterar senha!")
+            log.error("❌ Falha ao alterar senha no banco")
     
     def switch_account(self):
         """Volta para a tela de login para trocar de conta"""
         app = App.get_running_app()
         app.usuario_logado = None
         self.manager.current = 'login'
-        print("🔁 Trocar conta - redirecionando para login")
+        log.debug("🔁 Trocar conta - redirecionando para login")
     
     def voltar_para_home(self):
         """Volta para a tela home"""
@@ -6,7 +6,8 @@ Esta tela exibe informações completas sobre um produto específico,
 incluindo imagem, nome, descrição, preço e botão para adicionar ao carrinho.
 
 Funcionalidades:
-- Carrega dados do produto do banco de dados usando o ID
+- Carrega dados do produto do banco de dados usando o ID (ou da memória,
+  se a pré-carga já buscou o produto - ver precarga.py)
 - Exibe imagem em alta resolução
 - Mostra descrição detalhada do produto
 - Verifica login antes de adicionar ao carrinho
@@ -18,7 +19,12 @@ from kivy.uix.screenmanager import Screen
 from kivy.properties import StringProperty, NumericProperty
 from kivy.app import App
 from kivy.clock import Clock
-from database import buscar_produto_por_id
+from database import buscar_produto_por_id, produto_em_cache
+from executor_banco import em_segundo_plano
+from precos import formatar_brl
+from registro import obter_logger
+
+log = obter_logger(__name__)
 
 
 class DetalhesProdutoScreen(Screen):
@@ -41,54 +47,71 @@ class DetalhesProdutoScreen(Screen):
     imagem = StringProperty("imagens/imagem_produtos_home/forza.jpg")  # Caminho corrigido
     descricao = StringProperty("Carregando descrição do produto...")
     categoria = StringProperty("geral")
+    tarefa = None  # consulta em andamento no executor
     
     def on_pre_enter(self, *args):
         """
         Executado antes da tela ser exibida.
         Carrega os dados do produto do banco de dados.
         """
-        print(f"📱 Abrindo detalhes do produto ID: {self.produto_id}")
+        log.debug("📱 Abrindo detalhes do produto ID: %s", self.produto_id)
         self.carregar_produto()
     
     def carregar_produto(self):
         """
         Busca os dados do produto no banco de dados e atualiza a interface.
         
-        Utiliza a função buscar_produto_por_id() do database.py para
-        recuperar todas as informações do produto baseado no ID.
+        Utiliza a função buscar_produto_por_id() do database.py, em segundo
+        plano, para recuperar todas as informações do produto baseado no ID.
+        Enquanto a consulta roda, a tela mostra "Carregando...". Se o produto
+        já estiver em memória (pré-carga), aparece direto, sem consulta.
         """
-        try:
-            # Busca produto no banco de dados
-            produto = buscar_produto_por_id(self.produto_id)
+        if self.tarefa:
+            self.tarefa.cancelar()
+            self.tarefa = None
+        
+        produto = produto_em_cache(self.produto_id)
+        if produto is not None:
+            self.mostrar_produto(produto)
+            return
+        
+        self.titulo = "Carregando..."
+        self.preco = ""
+        self.descricao = "Carregando descrição do produto..."
+        self.tarefa = em_segundo_plano(buscar_produto_por_id, self.produto_id,
+                                       ao_concluir=self.mostrar_produto,
+                                       ao_falhar=self.falha_ao_carregar)
+    
+    def mostrar_produto(self, produto):
+        """Atualiza a interface com a linha retornada pelo banco"""
+        if produto:
+            # Produto encontrado - atualiza as propriedades
+            self.titulo = produto[1]           # title
+            self.preco = formatar_brl(produto[2])  # price_cents
+            self.imagem = produto[3]           # image
+            self.categoria = produto[4] if len(produto) > 4 else "geral"  # categoria
             
-            if produto:
-                # Produto encontrado - atualiza as propriedades
-                self.titulo = produto[1]           # title
-                self.preco = produto[2]            # price
-                self.imagem = produto[3]           # image
-                self.categoria = produto[4] if len(produto) > 4 else "geral"  # categoria
-                
-                # Descrição (com fallback se não existir)
-                if len(produto) > 5 and produto[5]:
-                    self.descricao = produto[5]
-                else:
-                    # Descrição padrão baseada na categoria
-                    self.descricao = self.gerar_descricao_padrao()
-                
-                print(f"✅ Produto carregado: {self.titulo}")
-                
+            # Descrição (com fallback se não existir)
+            if len(produto) > 5 and produto[5]:
+                self.descricao = produto[5]
             else:
-                # Produto não encontrado - exibe mensagem de erro
-                self.titulo = "Produto não encontrado"
-                self.preco = "R$ 0,00"
-                self.descricao = "Desculpe, não conseguimos encontrar este produto. Por favor, tente novamente."
-                print(f"❌ Produto {self.produto_id} não encontrado no banco")
-                
-        except Exception as e:
-            # Erro ao carregar produto
-            print(f"💥 Erro ao carregar produto: {e}")
-            self.titulo = "Erro ao carregar"
-            self.descricao = f"Ocorreu um erro ao carregar o produto: {str(e)}"
+                # Descrição padrão baseada na categoria
+                self.descricao = self.gerar_descricao_padrao()
+            
+            log.debug("✅ Produto carregado: %s", self.titulo)
+            
+        else:
+            # Produto não encontrado - exibe mensagem de erro
+            self.titulo = "Produto não encontrado"
+            self.preco = "R$ 0,00"
+            self.descricao = "Desculpe, não conseguimos encontrar este produto. Por favor, tente novamente."
+            log.debug("❌ Produto %s não encontrado no banco", self.produto_id)
+    
+    def falha_ao_carregar(self, erro):
+        """Erro ao carregar produto"""
+        log.error("💥 Erro ao carregar produto: %s", erro)
+        self.titulo = "Erro ao carregar"
+        self.descricao = f"Ocorreu um erro ao carregar o produto: {str(erro)}"
     
     def gerar_descricao_padrao(self):
         """
@@ -147,7 +170,7 @@ class DetalhesProdutoScreen(Screen):
         
         # Verificação de login
         if not app.usuario_logado:
-            print("❌ Usuário não logado - tentativa de adicionar ao carrinho")
+            log.debug("❌ Usuário não logado - tentativa de adicionar ao carrinho")
             app.mostrar_popup("Faça login para adicionar produtos ao carrinho!")
             
             # Redireciona para tela de login após breve delay
@@ -162,8 +185,8 @@ class DetalhesProdutoScreen(Screen):
             'image': self.imagem
         }
         
-        print(f"🛒 Adicionando ao carrinho: {self.titulo} (ID: {self.produto_id})")
-        print(f"👤 Usuário: {app.usuario_logado['nome']}")
+        log.debug("🛒 Adicionando ao carrinho: %s (ID: %s)", self.titulo, self.produto_id)
+        log.debug("👤 Usuário: %s", app.usuario_logado['nome'])
         
         # Chama a função de adicionar ao carrinho do App principal
         # Esta função já gerencia banco de dados e feedback ao usuário
@@ -176,7 +199,7 @@ class DetalhesProdutoScreen(Screen):
         Utiliza o sistema de histórico do Gerenciador (ScreenManager customizado)
         para retornar à tela de onde o usuário veio (geralmente Home ou categoria).
         """
-        print("⬅️ Voltando da tela de detalhes")
+        log.debug("⬅️ Voltando da tela de detalhes")
         
         # Verifica se o gerenciador tem função de voltar
         if hasattr(self.manager, "voltar"):
@@ -0,0 +1,140 @@
+# plano_consultas.py
+"""
+Auditoria de planos de consulta
+===============================
+Executa todas as funções públicas do database.py sobre uma CÓPIA do banco,
+captura cada SQL emitido (set_trace_callback) e imprime o
+EXPLAIN QUERY PLAN de cada formato de consulta.
+
+Falha (retorna problemas) quando alguma consulta faz SCAN completo numa
+tabela com mais linhas que o limite configurado.
+
+Uso:
+    python database.py --explain [--limite-linhas 1000] [--banco outro.db]
+"""
+
+import contextlib
+import io
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+
+import database
+
+# Comandos que têm plano de consulta relevante
+_AUDITAVEIS = ("SELECT", "UPDATE", "DELETE", "INSERT", "WITH")
+
+_LITERAIS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_TABELAS = re.compile(r"\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+
+
+def _formato(sql):
+    """Normaliza o SQL trocando literais por '?' (agrupa chamadas iguais)"""
+    return " ".join(_LITERAIS.sub("?", sql).split())
+
+
+def executar_carga():
+    """Chama cada função pública do database.py ao menos uma vez"""
+    db = database
+    db.criar_tabelas()
+    db.carregar_usuario_teste()
+    db.listar_usuarios()
+
+    db.cadastrar_usuario("Auditoria", "auditoria@email.com", "senha")
+    usuario = db.verificar_login("auditoria@email.com", "senha")
+    usuario_id = usuario[0] if usuario else 1
+    db.get_user_by_id(usuario_id)
+    db.get_user_by_email("auditoria@email.com")
+    db.update_user_profile(usuario_id, nome="Auditoria", telefone="11999999999")
+    db.update_password(usuario_id, "senha")
+
+    db.adicionar_produto("Produto Auditoria", "R$ 10,00", "imagens/imagem_produtos_home/forza.jpg", "xbox")
+    produtos, cursor = db.listar_produtos_pagina()
+    db.listar_produtos_pagina(cursor)
+    db.listar_produtos()
+    db.listar_produtos_por_categoria("xbox")
+    db.listar_produtos_por_categoria_pagina("xbox")
+    db.buscar_produtos("lego")
+    produto_id = produtos[0][0] if produtos else 1
+    db.buscar_produto_por_id(produto_id)
+    db.buscar_produtos_por_ids([produto[0] for produto in produtos[:8]] or [produto_id])
+
+    db.adicionar_ao_carrinho_db(usuario_id, produto_id)
+    db.adicionar_ao_carrinho_db(usuario_id, produto_id)
+    db.adicionar_lote_ao_carrinho_db([(usuario_id, produto_id, 2)])
+    db.obter_carrinho_usuario(usuario_id)
+    db.obter_total_carrinho(usuario_id)
+    db.remover_do_carrinho_db(usuario_id, produto_id)
+    db.limpar_carrinho_usuario(usuario_id)
+
+
+def _limitada(sql):
+    """Consultas do tipo 'SELECT ... FROM t LIMIT n' (sondagens) leem no máximo n linhas"""
+    maiusculo = sql.upper()
+    return " LIMIT " in maiusculo and not any(
+        palavra in maiusculo for palavra in (" WHERE ", " ORDER BY ", " GROUP BY ", "COUNT(", "SUM("))
+
+
+def _tabelas_da_consulta(sql):
+    """Mapeia alias -> tabela para interpretar as linhas 'SCAN x' do plano"""
+    mapa = {}
+    for tabela, alias in _TABELAS.findall(sql):
+        mapa[tabela] = tabela
+        if alias and alias.upper() not in ("ON", "WHERE", "SET", "VALUES", "JOIN", "ORDER", "GROUP", "LIMIT"):
+            mapa[alias] = tabela
+    return mapa
+
+
+def auditar(banco=None, limite_linhas=1000):
+    """Imprime o plano de cada consulta e retorna a lista de problemas encontrados"""
+    origem = banco or database.DB_PATH
+    pasta_tmp = tempfile.mkdtemp(prefix="nerdhub_explain_")
+    copia = os.path.join(pasta_tmp, "usuarios.db")
+    caminho_original = database.DB_PATH
+
+    # Cópia consistente mesmo com WAL ativo
+    fonte, destino = sqlite3.connect(origem), sqlite3.connect(copia)
+    fonte.backup(destino)
+    fonte.close()
+    destino.close()
+
+    consultas = {}
+    try:
+        database.DB_PATH = copia
+        pool = database.obter_pool()
+        pool.definir_rastreio(lambda sql: consultas.setdefault(_formato(sql), sql))
+        with contextlib.redirect_stdout(io.StringIO()):
+            executar_carga()
+        pool.definir_rastreio(None)
+
+        problemas = []
+        linhas_por_tabela = {}
+        conn = sqlite3.connect(copia)
+        for formato, sql in consultas.items():
+            comando = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+            if sql.lstrip().startswith("--") or comando not in _AUDITAVEIS:
+                continue
+
+            print(f"\n{formato}")
+            mapa = _tabelas_da_consulta(sql)
+            for _, _, _, detalhe in conn.execute(f"EXPLAIN QUERY PLAN {sql}"):
+                print(f"   {detalhe}")
+                encontrado = re.match(r"SCAN (\w+)", detalhe)
+                if not encontrado or "VIRTUAL TABLE" in detalhe:
+                    continue
+                tabela = mapa.get(encontrado.group(1))
+                if tabela is None or tabela.startswith("sqlite_") or _limitada(formato):
+                    continue  # subconsulta/CTE, catálogo interno ou leitura limitada
+                if tabela not in linhas_por_tabela:
+                    linhas_por_tabela[tabela] = conn.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0]
+                if linhas_por_tabela[tabela] > limite_linhas:
+                    problemas.append((formato, detalhe, linhas_por_tabela[tabela]))
+                    print(f"   ❌ SCAN completo em '{tabela}' ({linhas_por_tabela[tabela]} linhas)")
+        conn.close()
+        return problemas
+    finally:
+        database.obter_pool().fechar()
+        database.DB_PATH = caminho_original
+        shutil.rmtree(pasta_tmp, ignore_errors=True)
@@ -0,0 +1,154 @@
+# precarga.py
+"""
+Pré-carga de Detalhes e Categorias
+==================================
+Adianta o trabalho das telas que o usuário provavelmente vai abrir, para
+que elas apareçam direto da memória, sem "Carregando..." nem decodificar
+imagem na thread da interface:
+
+- cards visíveis numa grade (GradeProdutos avisa quando a rolagem para):
+  a linha completa do produto vai para o cache do catálogo
+  (buscar_produtos_por_ids, uma consulta para todos) e a imagem 'detalhe'
+  é decodificada para o cache de texturas
+- categorias do carrossel (CarrosselCategorias): a primeira página de
+  produtos vai para o cache do catálogo, o banner da tela da categoria e
+  as miniaturas da primeira linha de cards para o cache de texturas
+
+DetalhesProdutoScreen e CategoriaScreen olham o cache antes de consultar
+o banco e, se a pré-carga já passou por ali, mostram tudo no mesmo frame.
+
+A pré-carga nunca disputa com a interface: só trabalha quando não há
+transição de tela em andamento e a fila do executor do banco está vazia,
+e deixa no máximo uma tarefa (pequena) de cada vez na fila - uma consulta
+pedida pelo usuário espera, no pior caso, essa tarefa terminar.
+
+Desligar (ex.: para comparar no benchmarks/bench_precarga.py):
+    NERDHUB_PRECARGA=0 python main.py
+"""
+
+import os
+
+from kivy.app import App
+from kivy.clock import Clock
+
+from database import (buscar_produtos_por_ids, listar_produtos_por_categoria_pagina,
+                      pagina_categoria_em_cache, produto_em_cache)
+from executor_banco import em_segundo_plano, executor
+from miniaturas import precarregar_textura
+from registro import obter_logger
+
+log = obter_logger(__name__)
+
+# Espera (s) depois da última rolagem de uma grade antes de pré-carregar
+ATRASO = 0.3
+
+# Espera (s) para tentar de novo quando a interface ou o executor estão ocupados
+ESPERA_OCIOSO = 0.1
+
+# Máximo de cards visíveis pré-carregados de cada vez
+LIMITE_PRODUTOS = 8
+
+# Cards da primeira página de cada categoria com a miniatura pré-carregada
+CARDS_POR_CATEGORIA = 2
+
+
+def _ativa_pelo_ambiente():
+    return os.environ.get("NERDHUB_PRECARGA", "1").strip() not in ("0", "false", "nao")
+
+
+class Precarregador:
+    """Fila de pré-carga, consumida um trabalho por vez nos momentos ociosos"""
+
+    def __init__(self, ativo=True):
+        self.ativo = ativo
+        self._produtos = {}    # produto_id -> imagem (só os visíveis mais recentes)
+        self._categorias = {}  # slug -> banner, na ordem do carrossel
+        self._tarefa = None    # consulta de pré-carga na fila do executor
+        self._gatilho = Clock.create_trigger(self._trabalhar)
+        self._espera = Clock.create_trigger(self._trabalhar, ESPERA_OCIOSO)
+
+    def produtos_visiveis(self, itens):
+        """Cards na tela (dicionários da GradeProdutos), de cima para baixo"""
+        if not self.ativo:
+            return
+        self._produtos = {item["produto_id"]: item["image"] for item in itens[:LIMITE_PRODUTOS]}
+        self._gatilho()
+
+    def categorias(self, categorias):
+        """Categorias do carrossel: (slug, titulo, banner)"""
+        if not self.ativo:
+            return
+        for slug, titulo, banner in categorias:
+            self._categorias[slug] = banner
+        self._gatilho()
+
+    def pendente(self):
+        return bool(self._produtos or self._categorias or self._tarefa)
+
+    # =========================================================================
+    # TRABALHO (thread do Kivy)
+    # =========================================================================
+
+    @staticmethod
+    def _ocioso():
+        app = App.get_running_app()
+        gerenciador = app.root if app else None
+        if gerenciador is not None and gerenciador.transition.is_active:
+            return False
+        return executor.ocioso()
+
+    def _trabalhar(self, dt=0):
+        if self._tarefa is not None:
+            return  # o fim da tarefa atual chama de novo
+        if not self._ocioso():
+            self._espera()
+            return
+
+        # Cards visíveis primeiro: são o próximo toque mais provável
+        if self._produtos:
+            self._precarregar_produtos()
+        elif self._categorias:
+            self._precarregar_categoria()
+
+        if self._tarefa is None and (self._produtos or self._categorias):
+            self._gatilho()
+
+    def _precarregar_produtos(self):
+        itens, self._produtos = self._produtos, {}
+        for imagem in itens.values():
+            precarregar_textura(imagem, "detalhe")
+        faltando = [produto_id for produto_id in itens if produto_em_cache(produto_id) is None]
+        if faltando:
+            log.debug("⏩ Pré-carregando detalhes de %s produtos", len(faltando))
+            self._enviar(buscar_produtos_por_ids, faltando)
+
+    def _precarregar_categoria(self):
+        slug = next(iter(self._categorias))
+        precarregar_textura(self._categorias.pop(slug), "banner")
+        pagina = pagina_categoria_em_cache(slug)
+        if pagina is not None:
+            self._miniaturas_da_categoria(pagina)
+            return
+        log.debug("⏩ Pré-carregando a categoria '%s'", slug)
+        self._enviar(listar_produtos_por_categoria_pagina, slug, ao_concluir=self._miniaturas_da_categoria)
+
+    def _miniaturas_da_categoria(self, resultado):
+        produtos, cursor = resultado
+        for produto in produtos[:CARDS_POR_CATEGORIA]:
+            precarregar_textura(produto[3], "card")
+
+    def _enviar(self, funcao, *args, ao_concluir=None):
+        def concluido(resultado):
+            self._tarefa = None
+            if ao_concluir:
+                ao_concluir(resultado)
+            self._gatilho()
+
+        def falhou(erro):
+            self._tarefa = None
+            self._gatilho()
+
+        self._tarefa = em_segundo_plano(funcao, *args, ao_concluir=concluido, ao_falhar=falhou)
+
+
+precarregador = Precarregador(ativo=_ativa_pelo_ambiente())
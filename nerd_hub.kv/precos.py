@@ -0,0 +1,50 @@
+# precos.py
+"""
+Preços em centavos
+==================
+O banco guarda preços como inteiros (centavos) na coluna price_cents.
+O texto exibido na tela ("R$ 1.349,90") é gerado só na hora de desenhar,
+por um formatador com cache.
+"""
+
+import re
+from functools import lru_cache
+
+# "1349.90" (ponto decimal); "R$ 1.349,90" segue o formato brasileiro
+PONTO_DECIMAL = re.compile(r"\d+\.\d{1,2}")
+
+
+def texto_para_centavos(texto):
+    """Converte um preço para centavos: "R$ 1.349,90", "1349.90" ou 1349.9 -> 134990
+
+    ValueError para preço negativo; texto sem dígitos vale 0.
+    """
+    if texto is None:
+        return 0
+    if isinstance(texto, (int, float)) and not isinstance(texto, bool):
+        if texto < 0:
+            raise ValueError(f"preço negativo: {texto}")
+        return round(texto * 100)
+
+    texto = str(texto).strip()
+    if "-" in texto:
+        raise ValueError(f"preço negativo: {texto!r}")
+    numero = re.sub(r"^R\$\s*", "", texto)
+    if PONTO_DECIMAL.fullmatch(numero):
+        return round(float(numero) * 100)
+
+    limpo = re.sub(r"[^\d,]", "", texto)
+    if not limpo:
+        return 0
+    reais, _, centavos = limpo.partition(",")
+    centavos = (centavos + "00")[:2]
+    return int(reais or 0) * 100 + int(centavos)
+
+
+@lru_cache(maxsize=1024)
+def formatar_brl(centavos):
+    """Formata centavos no padrão brasileiro: 134990 -> 'R$ 1.349,90', -150 -> '-R$ 1,50'"""
+    centavos = int(centavos or 0)
+    sinal = "-" if centavos < 0 else ""
+    reais, resto = divmod(abs(centavos), 100)
+    return f"{sinal}R$ {reais:,}".replace(",", ".") + f",{resto:02d}"
@@ -0,0 +1,269 @@
+# rastreio_sql.py
+"""
+Rastreio de SQL
+===============
+Estatísticas de cada forma de comando SQL executada pelo app (o texto com
+literais trocados por '?'), para saber quais consultas rodam mais e quais
+custam mais:
+
+    forma                                         execuções  total ms  p50 ms  p99 ms   linhas
+    SELECT id, title, price ... WHERE id > ? ...         12      8.4    0.61    1.90      240
+
+Duas fontes alimentam o RastreadorSQL:
+- set_trace_callback do sqlite3: conta cada comando que o SQLite de fato
+  executa (inclusive BEGIN/COMMIT implícitos, scripts e cada linha de um
+  executemany)
+- ConexaoRastreada/CursorRastreado: medem o tempo de cada execute() até
+  o resultado ser lido por inteiro (ou o cursor ser descartado) e contam
+  as linhas devolvidas (ou alteradas, em INSERT/UPDATE/DELETE)
+
+Comandos acima de limite_ms vão para o log de SQL lento (arquivo
+sql_lento.log ao lado do banco e o logger "sql_lento"), sem os
+parâmetros - que podem ter senhas e e-mails.
+
+Uso (database.py liga o rastreio no pool de conexões):
+    rastreador = database.ativar_rastreio_sql(limite_ms=20)
+    ...
+    print(rastreador.resumo())
+
+Ou NERDHUB_SQL_RASTREIO=1 (limite em NERDHUB_SQL_LENTO_MS) para rastrear
+desde o início; o app escreve o resumo no log ao fechar.
+"""
+
+import functools
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+
+from registro import obter_logger
+
+log_lento = obter_logger("sql_lento")
+
+# Comandos mais lentos que isso (ms) vão para o log de SQL lento
+LIMITE_LENTO_MS = 50.0
+
+# Tempos guardados por forma para calcular p50/p99 (os mais recentes)
+AMOSTRAS = 2000
+
+TEXTO = re.compile(r"'(?:[^']|'')*'")
+NUMERO = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+NULO = re.compile(r"\bNULL\b", re.IGNORECASE)  # parâmetro None no SQL expandido do trace
+LISTA = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+ESPACOS = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=1024)
+def normalizar(sql):
+    """Forma do comando: literais viram '?', listas '(?, ?, ?)' viram '(?...)'"""
+    forma = TEXTO.sub("?", sql)
+    forma = NUMERO.sub("?", forma)
+    forma = NULO.sub("?", forma)
+    forma = LISTA.sub("(?...)", forma)
+    return ESPACOS.sub(" ", forma).strip().rstrip(";")
+
+
+def percentil(valores, p):
+    """Percentil p (0-100) por vizinho mais próximo"""
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p / 100))]
+
+
+class EstatisticaSQL:
+    """Números acumulados de uma forma de comando"""
+
+    __slots__ = ("execucoes", "medicoes", "total_ms", "linhas", "amostras")
+
+    def __init__(self):
+        self.execucoes = 0
+        self.medicoes = 0
+        self.total_ms = 0.0
+        self.linhas = 0
+        self.amostras = deque(maxlen=AMOSTRAS)
+
+
+class RastreadorSQL:
+    """Agrega contagens, tempos e linhas por forma de comando"""
+
+    def __init__(self, limite_ms=LIMITE_LENTO_MS, arquivo=None):
+        self.limite_ms = limite_ms
+        self.arquivo = arquivo
+        self.formas = {}
+        self._lock = threading.Lock()
+        self._handler = None
+        if arquivo:
+            self._handler = logging.FileHandler(arquivo, encoding="utf-8")
+            self._handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            log_lento.addHandler(self._handler)
+
+    def _estatistica(self, forma):
+        estatistica = self.formas.get(forma)
+        if estatistica is None:
+            estatistica = self.formas[forma] = EstatisticaSQL()
+        return estatistica
+
+    def comando(self, sql):
+        """Trace callback: um comando executado pelo SQLite"""
+        forma = normalizar(sql)
+        with self._lock:
+            self._estatistica(forma).execucoes += 1
+
+    def medir(self, sql, segundos, linhas):
+        """Tempo e linhas de um execute() (CursorRastreado)"""
+        forma = normalizar(sql)
+        ms = segundos * 1000
+        with self._lock:
+            estatistica = self._estatistica(forma)
+            estatistica.medicoes += 1
+            estatistica.total_ms += ms
+            estatistica.linhas += linhas
+            estatistica.amostras.append(ms)
+        if ms >= self.limite_ms:
+            log_lento.warning("🐢 SQL lento: %.1f ms, %d linhas | %s", ms, linhas, forma)
+
+    def limpar(self):
+        with self._lock:
+            self.formas = {}
+
+    def fechar(self):
+        """Fecha o arquivo do log de SQL lento"""
+        if self._handler:
+            log_lento.removeHandler(self._handler)
+            self._handler.close()
+            self._handler = None
+
+    def estatisticas(self):
+        """Lista de dicionários por forma, do maior tempo total para o menor"""
+        with self._lock:
+            itens = [(forma, e.execucoes, e.medicoes, e.total_ms, e.linhas, list(e.amostras))
+                     for forma, e in self.formas.items()]
+        resultado = [{
+            "forma": forma,
+            "execucoes": execucoes,
+            "medicoes": medicoes,
+            "total_ms": total_ms,
+            "p50_ms": percentil(amostras, 50) if amostras else None,
+            "p99_ms": percentil(amostras, 99) if amostras else None,
+            "linhas": linhas,
+        } for forma, execucoes, medicoes, total_ms, linhas, amostras in itens]
+        return sorted(resultado, key=lambda item: (-item["total_ms"], -item["execucoes"]))
+
+    def resumo(self, limite=20, largura=60):
+        """Tabela em texto com as formas mais caras"""
+        linhas = [f"{'forma':<{largura}}{'execuções':>10}{'total ms':>10}{'p50 ms':>8}{'p99 ms':>8}{'linhas':>9}"]
+        for item in self.estatisticas()[:limite]:
+            forma = item["forma"] if len(item["forma"]) <= largura - 2 else item["forma"][:largura - 5] + "..."
+            p50 = f"{item['p50_ms']:.2f}" if item["p50_ms"] is not None else "-"
+            p99 = f"{item['p99_ms']:.2f}" if item["p99_ms"] is not None else "-"
+            linhas.append(f"{forma:<{largura}}{item['execucoes']:>10}{item['total_ms']:>10.1f}"
+                          f"{p50:>8}{p99:>8}{item['linhas']:>9}")
+        return "\n".join(linhas)
+
+
+# =============================================================================
+# CONEXÃO E CURSOR COM MEDIÇÃO DE TEMPO
+# =============================================================================
+
+class CursorRastreado(sqlite3.Cursor):
+    """Cursor que mede cada execute() até o resultado ser lido por inteiro"""
+
+    rastreador = None
+    _amostra = None  # [sql, segundos, linhas lidas]
+
+    def _medir(self, executar, sql, *args):
+        self._concluir()
+        inicio = time.perf_counter()
+        try:
+            return executar(sql, *args)
+        finally:
+            self._amostra = [sql, time.perf_counter() - inicio, 0]
+
+    def _concluir(self):
+        amostra, self._amostra = self._amostra, None
+        if amostra and self.rastreador:
+            sql, segundos, linhas = amostra
+            self.rastreador.medir(sql, segundos, linhas or max(self.rowcount, 0))
+
+    def _leitura(self, inicio, linhas, fim):
+        if self._amostra:
+            self._amostra[1] += time.perf_counter() - inicio
+            self._amostra[2] += linhas
+            if fim:
+                self._concluir()
+
+    def execute(self, sql, parametros=()):
+        return self._medir(super().execute, sql, parametros)
+
+    def executemany(self, sql, parametros):
+        return self._medir(super().executemany, sql, parametros)
+
+    def executescript(self, script):
+        return self._medir(super().executescript, script)
+
+    def fetchone(self):
+        inicio = time.perf_counter()
+        linha = super().fetchone()
+        self._leitura(inicio, linha is not None, linha is None)
+        return linha
+
+    def fetchmany(self, size=None):
+        inicio = time.perf_counter()
+        tamanho = self.arraysize if size is None else size
+        linhas = super().fetchmany(tamanho)
+        self._leitura(inicio, len(linhas), len(linhas) < tamanho)
+        return linhas
+
+    def fetchall(self):
+        inicio = time.perf_counter()
+        linhas = super().fetchall()
+        self._leitura(inicio, len(linhas), True)
+        return linhas
+
+    def __next__(self):
+        inicio = time.perf_counter()
+        try:
+            linha = super().__next__()
+        except StopIteration:
+            self._leitura(inicio, 0, True)
+            raise
+        self._leitura(inicio, 1, False)
+        return linha
+
+    def close(self):
+        self._concluir()
+        super().close()
+
+    def __del__(self):
+        self._concluir()
+
+
+class ConexaoRastreada(sqlite3.Connection):
+    """Conexão cujos cursores (inclusive os de conn.execute) são CursorRastreado"""
+
+    rastreador = None
+
+    def cursor(self, factory=CursorRastreado):
+        cursor = super().cursor(factory)
+        if isinstance(cursor, CursorRastreado):
+            cursor.rastreador = self.rastreador
+        return cursor
+
+    # Os atalhos do sqlite3.Connection não passam por cursor() (são em C)
+    def execute(self, sql, parametros=()):
+        return self.cursor().execute(sql, parametros)
+
+    def executemany(self, sql, parametros):
+        return self.cursor().executemany(sql, parametros)
+
+    def executescript(self, script):
+        return self.cursor().executescript(script)
+
+    def commit(self):
+        if not self.in_transaction:
+            return super().commit()
+        inicio = time.perf_counter()
+        super().commit()
+        if self.rastreador:
+            self.rastreador.medir("COMMIT", time.perf_counter() - inicio, 0)
@@ -0,0 +1,79 @@
+# registro.py
+"""
+Registro (logging) do NerdHub
+=============================
+Substitui os print() espalhados pelo app por loggers do módulo logging,
+um por módulo, todos abaixo do logger "nerdhub":
+
+    from registro import obter_logger
+    log = obter_logger(__name__)
+
+    log.debug("📦 %s produtos da categoria '%s'", len(produtos), categoria)
+    log.info("✅ Usuário cadastrado: %s", email)
+    log.error("❌ Erro ao adicionar ao carrinho: %s", e)
+
+Use sempre argumentos (%s) em vez de f-string: com o nível desligado a
+chamada retorna logo após comparar o nível, sem montar o texto.
+
+Níveis pela variável de ambiente NERDHUB_LOG (padrão: INFO), com ajuste
+opcional por módulo:
+
+    NERDHUB_LOG=WARNING                       # só avisos e erros
+    NERDHUB_LOG=INFO,database=DEBUG           # detalhes só do database.py
+    NERDHUB_LOG=DEBUG                         # tudo (equivale aos antigos prints)
+
+As mensagens saem no stdout (no Android, o logcat), só com o texto - o
+mesmo formato dos prints de antes.
+"""
+
+import logging
+import os
+import sys
+
+RAIZ = "nerdhub"
+NIVEL_PADRAO = "INFO"
+
+_configurado = False
+
+
+class _SaidaPadrao(logging.StreamHandler):
+    """Escreve no sys.stdout do momento (respeita contextlib.redirect_stdout)"""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, valor):
+        pass
+
+
+def _nivel(texto):
+    nivel = logging.getLevelName(texto.strip().upper())
+    return nivel if isinstance(nivel, int) else logging.getLevelName(NIVEL_PADRAO)
+
+
+def configurar(niveis=None):
+    """Aplica os níveis no formato de NERDHUB_LOG ("INFO,database=DEBUG")"""
+    global _configurado
+    niveis = niveis if niveis is not None else os.environ.get("NERDHUB_LOG", NIVEL_PADRAO)
+
+    raiz = logging.getLogger(RAIZ)
+    if not _configurado:
+        saida = _SaidaPadrao()
+        saida.setFormatter(logging.Formatter("%(message)s"))
+        raiz.addHandler(saida)
+        raiz.propagate = False  # não duplica nas saídas do Kivy
+        _configurado = True
+
+    raiz.setLevel(_nivel(NIVEL_PADRAO))
+    for parte in filter(None, (parte.strip() for parte in niveis.split(","))):
+        modulo, _, nivel = parte.rpartition("=")
+        logging.getLogger(f"{RAIZ}.{modulo}" if modulo else RAIZ).setLevel(_nivel(nivel))
+
+
+def obter_logger(modulo):
+    """Logger do módulo (ex.: obter_logger(__name__) -> 'nerdhub.database')"""
+    if not _configurado:
+        configurar()
+    return logging.getLogger(f"{RAIZ}.{modulo}")
@@ -0,0 +1,101 @@
+# senhas.py
+"""
+Serviço de Senhas
+=================
+Hash de senha com scrypt (KDF com custo de memória) e salt aleatório por
+usuário, no lugar do SHA-256 puro usado antes.
+
+Formato guardado na coluna usuarios.senha:
+    scrypt$<n>$<r>$<p>$<salt base64>$<hash base64>
+
+Hashes antigos (SHA-256 em hexadecimal, 64 caracteres) continuam aceitos;
+no primeiro login bem-sucedido o database.py troca o hash pelo scrypt com
+o custo atual (o mesmo acontece quando o custo é alterado em configurar()).
+
+O scrypt leva dezenas de milissegundos de propósito, então nunca deve rodar
+na thread do Kivy: as operações com senha (login, cadastro, troca de senha)
+vão para o executor de senhas (executor_banco.com_senha), com threads
+próprias - o hashlib libera o GIL durante o cálculo e o executor do banco
+continua livre para o catálogo.
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+
+# Custo padrão: n=2^14, r=8 (16 MB de memória por hash, ~50-100 ms)
+CUSTO = {"n": 2 ** 14, "r": 8, "p": 1}
+
+# Bytes do salt e do hash gerado
+TAMANHO_SALT = 16
+TAMANHO_HASH = 32
+
+PREFIXO = "scrypt"
+
+
+def configurar(n=None, r=None, p=None):
+    """Ajusta o custo do scrypt (ex.: aparelhos com pouca memória ou benchmarks)"""
+    if n is not None:
+        CUSTO["n"] = n
+    if r is not None:
+        CUSTO["r"] = r
+    if p is not None:
+        CUSTO["p"] = p
+
+
+def _scrypt(senha, salt, n, r, p):
+    # maxmem: o scrypt precisa de ~128 * r * (n + p) bytes; o padrão do OpenSSL é 32 MB
+    return hashlib.scrypt(senha.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * r * (n + p), dklen=TAMANHO_HASH)
+
+
+def _b64(dados):
+    return base64.b64encode(dados).decode("ascii")
+
+
+def gerar_hash(senha):
+    """Hash scrypt da senha com salt novo, no formato guardado no banco"""
+    n, r, p = CUSTO["n"], CUSTO["r"], CUSTO["p"]
+    salt = os.urandom(TAMANHO_SALT)
+    return f"{PREFIXO}${n}${r}${p}${_b64(salt)}${_b64(_scrypt(senha, salt, n, r, p))}"
+
+
+def hash_legado(senha):
+    """SHA-256 sem salt (formato antigo, só para conferir hashes já gravados)"""
+    return hashlib.sha256(senha.encode("utf-8")).hexdigest()
+
+
+def conferir(senha, guardado):
+    """True se a senha corresponde ao hash guardado (scrypt ou SHA-256 antigo)"""
+    if not guardado:
+        return False
+    if not guardado.startswith(PREFIXO + "$"):
+        return hmac.compare_digest(hash_legado(senha), guardado)
+    try:
+        _, n, r, p, salt, esperado = guardado.split("$")
+        calculado = _scrypt(senha, base64.b64decode(salt), int(n), int(r), int(p))
+    except ValueError:
+        return False
+    return hmac.compare_digest(calculado, base64.b64decode(esperado))
+
+
+def conferir_ficticio(senha):
+    """conferir() contra um hash scrypt com o custo atual que nunca confere
+
+    Usado quando o e-mail não está cadastrado: o login gasta o mesmo tempo
+    que com senha errada, e o tempo de resposta não revela quais e-mails
+    existem. Sempre False.
+    """
+    n, r, p = CUSTO["n"], CUSTO["r"], CUSTO["p"]
+    ficticio = f"{PREFIXO}${n}${r}${p}${_b64(bytes(TAMANHO_SALT))}${_b64(bytes(TAMANHO_HASH))}"
+    conferir(senha, ficticio)
+    return False
+
+
+def precisa_atualizar(guardado):
+    """True se o hash é do formato antigo ou de um custo diferente do atual"""
+    if not guardado or not guardado.startswith(PREFIXO + "$"):
+        return True
+    return guardado.split("$")[1:4] != [str(CUSTO["n"]), str(CUSTO["r"]), str(CUSTO["p"])]
+